@@ -13,20 +13,49 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+def env(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    return default if value is None else value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    return list(default) if value is None else [item.strip() for item in value.split(',') if item.strip()]
+
+
+# DJANGO_PROFILE selects the defaults below: "development" (the default) or
+# "production". Every setting read from the environment can still be
+# overridden one by one.
+PROFILE = env('DJANGO_PROFILE', 'development')
+if PROFILE not in ('development', 'production'):
+    raise ImproperlyConfigured(f"DJANGO_PROFILE must be 'development' or 'production', not {PROFILE!r}.")
+PRODUCTION = PROFILE == 'production'
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-_$al4)@%u8rv!r#n1_t+efu2a9^!^3(72!8a^5l)eq_!k9&_)h'
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured('DJANGO_SECRET_KEY is required in production.')
+    SECRET_KEY = 'django-insecure-_$al4)@%u8rv!r#n1_t+efu2a9^!^3(72!8a^5l)eq_!k9&_)h'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG also makes every connection keep a log of its queries.
+DEBUG = env_bool('DJANGO_DEBUG', not PRODUCTION)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS')
 
 
 # Application definition
@@ -39,21 +68,27 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'website',
-    'django_browser_reload',
     'bootstrap5',
 ]
 
 MIDDLEWARE = [
+    'website.assets.StaticFilesMiddleware',
+    'website.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'website.roles.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
 ]
 
+# Live reload rewrites every HTML response: development only.
+if DEBUG and not PRODUCTION:
+    INSTALLED_APPS.append('django_browser_reload')
+    MIDDLEWARE.append('django_browser_reload.middleware.BrowserReloadMiddleware')
+
 ROOT_URLCONF = 'project.urls'
 
 TEMPLATES = [
@@ -67,32 +102,80 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'website.context_processors.role',
+                'website.context_processors.unread_notifications',
             ],
         },
     },
 ]
 
+if PRODUCTION:
+    # Templates are compiled once per process instead of read and parsed on
+    # every render.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'project.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-# Only showing the DATABASES section for brevity
-DATABASES = {
-    'default': {
-        'ENGINE': 'mssql',
-        'NAME': 'task_manager_db',
-        'USER': 'db_user',
-        'PASSWORD': '1234',
-        'HOST': 'localhost',  # Docker service name
-        'PORT': '1433',
-        'OPTIONS': {
-            'driver': 'ODBC Driver 17 for SQL Server',
-            'extra_params': 'TrustServerCertificate=Yes;MARS_Connection=Yes',
-        },
+# DJANGO_DATABASE picks the engine: "mssql" (production, the default),
+# "postgresql", or "sqlite" for local runs and benchmarks on the bundled
+# db.sqlite3. Connections are kept for DB_CONN_MAX_AGE seconds (0 opens one
+# per request) and, with health checks, verified before being reused.
+DATABASE_ENGINE = env('DJANGO_DATABASE', 'mssql')
+if DATABASE_ENGINE == 'mssql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'mssql',
+            'NAME': env('DB_NAME', 'task_manager_db'),
+            'USER': env('DB_USER', 'db_user'),
+            'PASSWORD': env('DB_PASSWORD', '1234'),
+            'HOST': env('DB_HOST', 'localhost'),  # Docker service name
+            'PORT': env('DB_PORT', '1433'),
+            'OPTIONS': {
+                'driver': env('DB_DRIVER', 'ODBC Driver 17 for SQL Server'),
+                'extra_params': 'TrustServerCertificate=Yes;MARS_Connection=Yes',
+            },
+        }
     }
-}
+elif DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env('DB_NAME', 'gestion_equipement'),
+            'USER': env('DB_USER', 'postgres'),
+            'PASSWORD': env('DB_PASSWORD', ''),
+            'HOST': env('DB_HOST', 'localhost'),
+            'PORT': env('DB_PORT', '5432'),
+        }
+    }
+elif DATABASE_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': env('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            # A file, not the default in-memory database: benchmarks and
+            # threaded tests need every connection to see the same data.
+            'TEST': {'NAME': BASE_DIR / 'test.sqlite3'},
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f"DJANGO_DATABASE must be 'mssql', 'postgresql' or 'sqlite', not {DATABASE_ENGINE!r}."
+    )
+DATABASES['default']['CONN_MAX_AGE'] = int(env('DB_CONN_MAX_AGE', 600 if PRODUCTION else 0))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env_bool('DB_CONN_HEALTH_CHECKS', PRODUCTION)
+# Async read views run their independent queries concurrently on a pool of
+# this many threads per process, each holding one connection of its own.
+ASYNC_DB_THREADS = int(env('DJANGO_ASYNC_DB_THREADS', 8))
 
 
 # Password validation
@@ -133,8 +216,38 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+STATIC_ROOT = env('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles')
+
+# In production collectstatic builds the bundles of website.assets, names
+# every file after a hash of its content and writes gzip (and brotli, when
+# the brotli package is installed) copies next to them; templates then
+# include the bundles instead of their sources (ASSETS_BUNDLED).
+# SERVE_STATIC makes the application serve STATIC_ROOT itself, the hashed
+# files with a far-future Cache-Control; turn it off behind a web server
+# that serves them.
+if PRODUCTION:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'website.assets.AssetStorage'},
+    }
+ASSETS_BUNDLED = env_bool('DJANGO_ASSETS_BUNDLED', PRODUCTION)
+SERVE_STATIC = env_bool('DJANGO_SERVE_STATIC', PRODUCTION)
+STATIC_MAX_AGE = 365 * 86400
+# Files served under their plain name are revalidated after this many seconds.
+STATIC_REVALIDATE_AGE = 60
 LOGIN_URL = '/connexion/'
 
+# Users log in with their email (unique index on auth_user.email); the model
+# backend stays for the admin site, which asks for the username.
+AUTHENTICATION_BACKENDS = [
+    'website.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+if PRODUCTION:
+    SESSION_COOKIE_SECURE = env_bool('DJANGO_SECURE_COOKIES', True)
+    CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
+
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -143,3 +256,92 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Pub/sub backend for the notifications event stream; any class exposing
+# publish(channel, event) and subscribe(*channels) returning an object with
+# an awaitable get() and close().
+EVENT_BROKER = 'website.events.InProcessBroker'
+# Each event stream ends after this many seconds and the browser reconnects:
+# the streams of closed pages cannot be detected and would live forever.
+EVENT_STREAM_MAX_AGE = 300
+
+# Seconds after which each process rebuilds its equipment search index in the
+# background, picking up changes made by other processes. None disables it.
+SEARCH_INDEX_MAX_AGE = 300
+
+# Rendered fragments are cached per role ({% rolecache %}) and invalidated by
+# model signals. The file backend is shared by every worker of the host, so
+# an invalidation made by one is seen by all; LocMemCache is faster but only
+# suits a single process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'fragments',
+        'TIMEOUT': 600,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Login throttling counters (website.throttle), kept by each process.
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+FRAGMENT_CACHE_ENABLED = True
+
+# Request profiling (website.profiling.ProfilingMiddleware): the last
+# PROFILING_BUFFER_SIZE requests of each process are kept in memory and dumped
+# to PROFILING_DIR every PROFILING_DUMP_INTERVAL seconds for
+# `manage.py profiling_report` and the /profilage/ page. Dumps not rewritten
+# for PROFILING_DUMP_MAX_AGE seconds (processes gone since) are deleted.
+PROFILING_ENABLED = True
+PROFILING_SAMPLE_RATE = 1.0
+PROFILING_BUFFER_SIZE = 5000
+PROFILING_DIR = BASE_DIR / 'cache' / 'profiling'
+PROFILING_DUMP_INTERVAL = 30
+PROFILING_DUMP_MAX_AGE = 24 * 3600
+
+# Deferred work (notification fan-out, ...) is stored in the website.Job table
+# and JOBS_MODE picks who runs it: "eager" runs each job in the request thread
+# right after its transaction commits, "threads" wakes JOBS_THREADS worker
+# threads inside each web process, "external" leaves everything to
+# `manage.py run_jobs`. Failed jobs are retried after JOBS_RETRY_DELAY seconds,
+# doubled at each attempt up to JOBS_RETRY_MAX_DELAY, by any worker.
+JOBS_MODE = env('DJANGO_JOBS_MODE', 'threads' if PRODUCTION else 'eager')
+if JOBS_MODE not in ('eager', 'threads', 'external'):
+    raise ImproperlyConfigured(f"DJANGO_JOBS_MODE must be 'eager', 'threads' or 'external', not {JOBS_MODE!r}.")
+JOBS_THREADS = int(env('DJANGO_JOBS_THREADS', 2))
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 5
+JOBS_RETRY_MAX_DELAY = 600
+# Running jobs older than this are considered abandoned and requeued.
+JOBS_TIMEOUT = 300
+# Completed jobs are kept this long for the latency metrics of the dashboard.
+JOBS_KEEP = 86400
+
+# Affectations returned more than this many days ago are moved to the
+# AffectationArchive table by `manage.py archive_affectations` (run it daily).
+AFFECTATION_ARCHIVE_AFTER_DAYS = int(env('AFFECTATION_ARCHIVE_AFTER_DAYS', 365))
+
+# Scanner lookups by cab_number (website.lookup) keep this many recently
+# scanned items per process; 0 disables the cache.
+LOOKUP_CACHE_SIZE = int(env('DJANGO_LOOKUP_CACHE_SIZE', 5000))
+
+# A demande taken from the work queue (website.demandes) stays with its
+# gestionnaire this many seconds, then returns to the queue.
+DEMANDE_CLAIM_TIMEOUT = 900
+
+# Failed logins allowed per client address, per account from one address and
+# per account from every address within LOGIN_THROTTLE_WINDOW seconds
+# (website.throttle); further attempts are refused without checking the
+# password until the oldest failures expire.
+LOGIN_THROTTLE_WINDOW = int(env('DJANGO_LOGIN_THROTTLE_WINDOW', 900))
+LOGIN_THROTTLE_LIMITS = {
+    'ip': int(env('DJANGO_LOGIN_THROTTLE_IP', 50)),
+    'compte_ip': int(env('DJANGO_LOGIN_THROTTLE_ACCOUNT_IP', 5)),
+    'compte': int(env('DJANGO_LOGIN_THROTTLE_ACCOUNT', 200)),
+}
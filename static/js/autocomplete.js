@@ -0,0 +1,63 @@
+(function () {
+    var DELAY = 200;
+
+    function enhance(select) {
+        var input = document.createElement('input');
+        input.type = 'search';
+        input.className = 'form-control mb-1';
+        input.placeholder = 'Rechercher…';
+        input.autocomplete = 'off';
+        select.parentNode.insertBefore(input, select);
+        if (select.multiple) {
+            select.size = 8;
+        }
+
+        var timer = null;
+        var pending = null;
+
+        function load() {
+            if (pending) {
+                pending.abort();
+            }
+            pending = new AbortController();
+            var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(input.value.trim());
+            fetch(url, {credentials: 'same-origin', signal: pending.signal})
+                .then(function (response) { return response.json(); })
+                .then(function (data) { render(data.results); })
+                .catch(function () {});
+        }
+
+        function render(results) {
+            // Selected options (and the empty one) stay; everything else is
+            // replaced by the latest matches.
+            Array.prototype.slice.call(select.options).forEach(function (option) {
+                if (!option.selected && option.value !== '') {
+                    option.remove();
+                }
+            });
+            var present = {};
+            Array.prototype.forEach.call(select.options, function (option) {
+                present[option.value] = true;
+            });
+            results.forEach(function (result) {
+                if (!present[String(result.id)]) {
+                    select.add(new Option(result.text, result.id));
+                }
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(load, DELAY);
+        });
+        input.addEventListener('focus', function () {
+            if (select.options.length <= 1) {
+                load();
+            }
+        }, {once: true});
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(enhance);
+    });
+})();
@@ -0,0 +1,17 @@
+(function () {
+    var badge = document.getElementById('unread-notifications');
+    if (!badge || !window.EventSource) {
+        return;
+    }
+    var source = new EventSource(badge.dataset.stream);
+    source.addEventListener('notification', function () {
+        badge.textContent = (parseInt(badge.textContent, 10) || 0) + 1;
+        badge.classList.remove('d-none');
+    });
+    source.addEventListener('demande', function () {
+        var banner = document.getElementById('demandes-updated');
+        if (banner) {
+            banner.classList.remove('d-none');
+        }
+    });
+})();
@@ -0,0 +1,124 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import caching, events, summary
+from .ledger import InsufficientStock
+from .models import Affectation, DemandeEquipement, Equipment, StockMovement
+from .notifications import notify
+
+
+@dataclass
+class UnsatisfiedLine:
+    demande: DemandeEquipement
+    equipement: Equipment
+    requested: int
+    available: int
+
+
+@dataclass
+class ApprovalReport:
+    approved: list = field(default_factory=list)
+    affectations: list = field(default_factory=list)
+    unsatisfied: list = field(default_factory=list)
+    # Ids of pending demandes skipped because another gestionnaire holds them.
+    held: list = field(default_factory=list)
+
+
+def approve_demandes(demande_ids, auteur=None):
+    # Set-based approval: a fixed number of statements per batch plus one
+    # conditional decrement per distinct equipment, whatever the batch size.
+    report = ApprovalReport()
+    with transaction.atomic():
+        demandes = list(
+            DemandeEquipement.objects.select_for_update()
+            .filter(pk__in=demande_ids, etat='En attente')
+            .order_by('date_creation', 'pk')
+        )
+        if auteur is not None:
+            # Demandes claimed from the queue by someone else are theirs to decide.
+            expired = timezone.now() - timedelta(seconds=settings.DEMANDE_CLAIM_TIMEOUT)
+            report.held = [
+                demande.pk for demande in demandes
+                if demande.traite_par_id not in (None, auteur.pk) and demande.date_prise >= expired
+            ]
+            demandes = [demande for demande in demandes if demande.pk not in report.held]
+        if not demandes:
+            return report
+        lines = defaultdict(list)
+        for line in DemandeEquipement.equipements.through.objects.filter(demandeequipement__in=demandes):
+            lines[line.demandeequipement_id].append(line.equipment_id)
+        # Lock in primary-key order so concurrent batches cannot deadlock.
+        stock = {
+            equipment.pk: equipment
+            for equipment in Equipment.objects.select_for_update()
+            .filter(pk__in={pk for pks in lines.values() for pk in pks})
+            .order_by('pk')
+        }
+        remaining = {pk: equipment.quantity for pk, equipment in stock.items()}
+        withdrawn = defaultdict(int)
+
+        # Oldest demandes are served first.
+        for demande in demandes:
+            for equipment_pk in lines[demande.pk]:
+                if remaining[equipment_pk] < demande.quantity:
+                    report.unsatisfied.append(UnsatisfiedLine(
+                        demande, stock[equipment_pk], demande.quantity, remaining[equipment_pk],
+                    ))
+                    continue
+                remaining[equipment_pk] -= demande.quantity
+                withdrawn[equipment_pk] += demande.quantity
+                report.affectations.append(Affectation(
+                    equipement=stock[equipment_pk],
+                    fonctionnaire_id=demande.demandeur_id,
+                    service=demande.service,
+                    quantity=demande.quantity,
+                ))
+            report.approved.append(demande)
+
+        groups = defaultdict(lambda: [0, 0])
+        for equipment_pk, quantity in withdrawn.items():
+            updated = Equipment.objects.filter(pk=equipment_pk, quantity__gte=quantity).update(
+                quantity=F('quantity') - quantity, affecte=True,
+            )
+            if not updated:
+                raise InsufficientStock(stock[equipment_pk], quantity)
+        for affectation in report.affectations:
+            group = groups[summary.group_of(stock[affectation.equipement_id])]
+            group[0] += affectation.quantity
+            group[1] += 1
+        for key, (quantity, opened) in groups.items():
+            summary.apply_delta(key, available=-quantity, assigned=quantity, opened=opened)
+
+        Affectation.objects.bulk_create(report.affectations)
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                equipement_id=affectation.equipement_id,
+                delta=-affectation.quantity,
+                motif='demande',
+                affectation=affectation if affectation.pk else None,
+                auteur=auteur,
+            )
+            for affectation in report.affectations
+        ])
+        decided = {'etat': 'Validée'}
+        if auteur is not None:
+            decided['traite_par'] = auteur
+        DemandeEquipement.objects.filter(pk__in=[demande.pk for demande in demandes]).update(**decided)
+        caching.invalidate(caching.EQUIPMENT, caching.AFFECTATION, caching.DEMANDE)
+        demandeurs = User.objects.in_bulk({demande.demandeur_id for demande in demandes})
+        notify([
+            (demande.demandeur_id, f"Demande d'équipement {demande.id} Validée pour {demandeurs[demande.demandeur_id]}")
+            for demande in demandes
+        ])
+    for demande in demandes:
+        demande.etat = 'Validée'
+        demande.demandeur = demandeurs[demande.demandeur_id]
+        events.notify_demande(demande)
+    return report
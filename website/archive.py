@@ -0,0 +1,94 @@
+import heapq
+from datetime import timedelta
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import caching
+from .models import Affectation, AffectationArchive
+
+BATCH_SIZE = 1000
+HISTORY_ORDER = ('-date_affectation', '-id')
+HISTORY_PAGE_SIZE = 50
+FIELDS = ['id', 'date_affectation', 'equipement_id', 'fonctionnaire_id', 'service', 'quantity', 'date_retour']
+
+
+def archive_affectations(days=None, batch_size=BATCH_SIZE, now=None):
+    """Move affectations returned more than ``days`` ago to the archive table.
+
+    Each batch is copied and deleted in its own transaction, so the live
+    table is never locked for long; returns the number of rows moved.
+    """
+    days = settings.AFFECTATION_ARCHIVE_AFTER_DAYS if days is None else days
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    closed = Affectation.objects.filter(date_retour__lt=cutoff).order_by('pk')
+    archived = last = 0
+    while True:
+        with transaction.atomic():
+            rows = list(closed.select_for_update().filter(pk__gt=last).values(*FIELDS)[:batch_size])
+            if not rows:
+                break
+            AffectationArchive.objects.bulk_create([AffectationArchive(**row) for row in rows])
+            # QuerySet._raw_delete is private, but it is the only way to
+            # delete without collecting the rows again and sending
+            # post_delete for each of them. Those signals have nothing to do
+            # here: closed affectations weigh on no stock summary, and the
+            # fragment cache is invalidated once below. QuerySet.delete() makes
+            # archiving about 5x slower (bench_archive). Pinned by
+            # AffectationArchiveTests.test_archiving_sends_no_delete_signal.
+            Affectation.objects.filter(pk__in=[row['id'] for row in rows])._raw_delete(Affectation.objects.db)
+        archived += len(rows)
+        last = rows[-1]['id']
+    if archived:
+        caching.invalidate(caching.AFFECTATION)
+    return archived
+
+
+def merge(live, archived):
+    """Merge live and archived affectations already sorted by HISTORY_ORDER."""
+    return heapq.merge(live, archived, key=attrgetter('date_affectation', 'id'), reverse=True)
+
+
+def _seek(queryset, cursor, forward=True):
+    date, pk = cursor
+    # Newest first: the next page holds older rows.
+    op = 'lt' if forward else 'gt'
+    # The redundant leading range keeps the (date_affectation, id) indexes usable.
+    return queryset.filter(**{f'date_affectation__{op}e': date}).filter(
+        Q(**{f'date_affectation__{op}': date}) | Q(date_affectation=date, **{f'id__{op}': pk})
+    )
+
+
+def seek_history(live, archived, after=None, before=None, page_size=HISTORY_PAGE_SIZE):
+    """One page of the history of live and archived affectations, newest first.
+
+    ``live`` and ``archived`` are querysets of Affectation and
+    AffectationArchive filtered alike; each is cut to the ``page_size + 1``
+    rows past the (date_affectation, id) cursor, all paginate_history needs
+    to fill the page. Archived rows keep their id, so the cursor is unique
+    across both tables.
+    """
+    cursor, forward = (before, False) if before is not None else (after, True)
+    order = HISTORY_ORDER if forward else tuple(field.lstrip('-') for field in HISTORY_ORDER)
+
+    def page(queryset):
+        if cursor is not None:
+            queryset = _seek(queryset, cursor, forward)
+        return queryset.order_by(*order)[:page_size + 1]
+    return page(live), page(archived)
+
+
+def paginate_history(live, archived, after=None, before=None, page_size=HISTORY_PAGE_SIZE):
+    """Merge the rows of seek_history into one page, newest first.
+
+    Returns the page and whether there are older and newer rows.
+    """
+    if before is not None:
+        rows = list(heapq.merge(live, archived, key=attrgetter('date_affectation', 'id')))[:page_size + 1]
+        has_previous = len(rows) > page_size
+        return rows[:page_size][::-1], True, has_previous
+    rows = list(merge(live, archived))[:page_size + 1]
+    return rows[:page_size], len(rows) > page_size, after is not None
@@ -0,0 +1,155 @@
+import gzip
+import mimetypes
+import os
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import HttpResponse, HttpResponseNotFound
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import caching
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bundles built by AssetStorage at collectstatic time, from the source files
+# they list, in order. Each bundle sits in the directory of its sources so
+# their relative url()s stay valid. Templates include them with
+# {% bundle %}, which falls back to the sources while ASSETS_BUNDLED is off.
+BUNDLES = {
+    'css/site.bundle.css': ['css/home.css'],
+    'css/login.bundle.css': ['css/login.css'],
+    'js/site.bundle.js': ['js/notifications.js'],
+}
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+# Under this size a compressed copy saves less than the headers it costs.
+COMPRESS_MIN_SIZE = 256
+# (suffix, Content-Encoding) of the precompressed copies, preferred first.
+ENCODINGS = [('.br', 'br'), ('.gz', 'gzip')]
+
+
+def sources(name):
+    return BUNDLES[name] if not settings.ASSETS_BUNDLED else [name]
+
+
+def compress(data):
+    """The precompressed copies of ``data`` worth keeping, by suffix."""
+    copies = {'.gz': gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        copies['.br'] = brotli.compress(data)
+    return {suffix: copy for suffix, copy in copies.items() if len(copy) < len(data)}
+
+
+class AssetStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also builds BUNDLES and precompresses its output.
+
+    Bundles are written before the files are hashed, so they get a content
+    hash like any other file; every hashed text file then gets .gz (and .br
+    when the brotli package is installed) copies next to it.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name, bundle_sources in BUNDLES.items():
+                parts = []
+                for source in bundle_sources:
+                    if source not in paths:
+                        raise ValueError(f"Bundle {name!r}: {source!r} is not a collected static file.")
+                    storage, path = paths[source]
+                    with storage.open(path) as file:
+                        parts.append(file.read().rstrip(b'\n'))
+                if self.exists(name):
+                    self.delete(name)
+                self._save(name, ContentFile(b'\n'.join(parts) + b'\n'))
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            for hashed_name in set(self.hashed_files.values()):
+                if not hashed_name.endswith(COMPRESSIBLE):
+                    continue
+                with self.open(hashed_name) as file:
+                    data = file.read()
+                if len(data) < COMPRESS_MIN_SIZE:
+                    continue
+                for suffix, copy in compress(data).items():
+                    if self.exists(hashed_name + suffix):
+                        self.delete(hashed_name + suffix)
+                    self._save(hashed_name + suffix, ContentFile(copy))
+            caching.invalidate(caching.STATIC)
+
+
+def serve(request, name, immutable):
+    try:
+        path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        return HttpResponseNotFound()
+    if not os.path.isfile(path):
+        return HttpResponseNotFound()
+    stat = os.stat(path)
+    if not immutable and not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponse(status=304)
+    else:
+        accepted = request.headers.get('Accept-Encoding', '')
+        chosen, encoding = path, None
+        for suffix, candidate in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                chosen, encoding = path + suffix, candidate
+                break
+        with open(chosen, 'rb') as file:
+            response = HttpResponse(file.read(), content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    # Hashed names change with their content: browsers never need to ask again.
+    response['Cache-Control'] = (
+        f'public, max-age={settings.STATIC_MAX_AGE}, immutable' if immutable
+        else f'public, max-age={settings.STATIC_REVALIDATE_AGE}'
+    )
+    return response
+
+
+class StaticFilesMiddleware:
+    """Serve STATIC_ROOT under STATIC_URL, before any other middleware runs.
+
+    Picks the precompressed copy the client accepts and marks the hashed
+    files of the manifest as cacheable for STATIC_MAX_AGE. Only for
+    deployments without a front web server for the static files
+    (SERVE_STATIC).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SERVE_STATIC:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        self.immutable = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.path.startswith(self.prefix):
+            name = request.path[len(self.prefix):]
+            return serve(request, name, name in self.immutable)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.prefix):
+            name = request.path[len(self.prefix):]
+            return await sync_to_async(serve)(request, name, name in self.immutable)
+        return await self.get_response(request)
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+# Django's async ORM runs every query of a request in that request's one sync
+# thread, so awaiting several querysets with asyncio.gather still runs them
+# one after another. gather() hands them to this pool instead: each of its
+# threads has its own connection, recycled like a request's.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(settings.ASYNC_DB_THREADS, thread_name_prefix='asyncdb')
+        return _executor
+
+
+def _call(wrappers, func):
+    close_old_connections()
+    try:
+        with ExitStack() as stack:
+            # Keep the request's execute wrappers (profiling) on this connection too.
+            for wrapper in wrappers:
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return func()
+    finally:
+        close_old_connections()
+
+
+def _request_connection():
+    return connection.in_atomic_block, list(connection.execute_wrappers)
+
+
+async def gather(*calls):
+    """Run independent blocking calls concurrently and return their results.
+
+    Each call gets its own connection from the pool. Inside a transaction
+    (ATOMIC_REQUESTS, TestCase) other connections would not see its writes,
+    so the calls then run one by one on the request's connection.
+    """
+    # Read in the request's sync thread: that is where its connection lives.
+    in_transaction, wrappers = await sync_to_async(_request_connection)()
+    if in_transaction:
+        return [await sync_to_async(call)() for call in calls]
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(get_executor(), _call, wrappers, call) for call in calls))
+
@@ -0,0 +1,149 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from . import summary
+from .models import Affectation, DemandeEquipement, DemandeIntervention, Equipment, Notification
+from .stats import percentile
+
+TYPES = {
+    'Informatique': ['Ordinateur portable', 'Ordinateur fixe', 'Écran', 'Imprimante', 'Scanner'],
+    'Mobilier': ['Bureau', 'Chaise', 'Armoire', 'Caisson'],
+    'Réseau': ['Switch', 'Routeur', 'Point d\'accès', 'Câble'],
+    'Téléphonie': ['Téléphone fixe', 'Smartphone', 'Casque'],
+}
+EMPLACEMENTS = ['Rabat', 'Casablanca', 'Tanger', 'Fès', 'Marrakech', 'Agadir', 'Oujda']
+
+
+@contextmanager
+def isolated_database():
+    # Benchmarks seed hundreds of thousands of rows: run them against a
+    # throw-away test database, never the configured one.
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def synthetic_equipment(count, seed=0):
+    rng = random.Random(seed)
+    types = list(TYPES)
+    for i in range(count):
+        type_ = rng.choice(types)
+        yield {
+            'cab_number': f'CAB{i:08d}',
+            'designation': f'{rng.choice(TYPES[type_])} {i}',
+            'type': type_,
+            'sous_type': rng.choice(TYPES[type_]),
+            'year': rng.randint(2005, 2025),
+            'emplacement': rng.choice(EMPLACEMENTS),
+            'quantity': rng.randint(0, 20),
+        }
+
+
+def seed_equipment(count, batch_size=5000, seed=0):
+    rows = synthetic_equipment(count, seed)
+    for start in range(0, count, batch_size):
+        Equipment.objects.bulk_create([Equipment(**next(rows)) for _ in range(min(batch_size, count - start))])
+
+
+def seed_dataset(users=200, equipment=5000, affectations=2000, demandes=500, notifications=2000,
+                 batch_size=5000, seed=0):
+    """Seed a deterministic dataset and return one user per role.
+
+    ``users`` fonctionnaires are created next to one admin and a handful of
+    gestionnaires; the same counts and seed always give the same rows.
+    """
+    rng = random.Random(seed)
+    admin = User.objects.create(username='bench-admin', email='admin@bench.local', is_staff=True, is_superuser=True)
+    User.objects.bulk_create([
+        User(username=f'bench-gestionnaire{i}', email=f'gestionnaire{i}@bench.local', is_staff=True) for i in range(5)
+    ])
+    User.objects.bulk_create([
+        User(username=f'bench-fonctionnaire{i}', email=f'fonctionnaire{i}@bench.local') for i in range(users)
+    ], batch_size=batch_size)
+    fonctionnaires = list(User.objects.filter(is_staff=False).values_list('pk', flat=True))
+    seed_equipment(equipment, batch_size=batch_size, seed=seed)
+    equipment_ids = list(Equipment.objects.values_list('pk', flat=True))
+
+    now = timezone.now()
+    Affectation.objects.bulk_create([
+        Affectation(
+            equipement_id=rng.choice(equipment_ids), fonctionnaire_id=rng.choice(fonctionnaires),
+            service=rng.choice(['DSI', 'RH', 'Finances', 'Logistique']), quantity=rng.randint(1, 3),
+            date_affectation=now - timezone.timedelta(days=age),
+            date_retour=now - timezone.timedelta(days=rng.randint(0, age)) if rng.random() < 0.4 else None,
+        )
+        for age in (rng.randint(0, 900) for _ in range(affectations))
+    ], batch_size=batch_size)
+    Equipment.objects.filter(affectation__date_retour__isnull=True).update(affecte=True)
+
+    DemandeEquipement.objects.bulk_create([
+        DemandeEquipement(
+            objet=f'Demande {i}', quantity=rng.randint(1, 3), motif='Besoin du service',
+            service=rng.choice(['DSI', 'RH', 'Finances']), demandeur_id=rng.choice(fonctionnaires),
+            etat=rng.choice(['En attente', 'En attente', 'Validée', 'Refusée']),
+        )
+        for i in range(demandes)
+    ], batch_size=batch_size)
+    Through = DemandeEquipement.equipements.through
+    Through.objects.bulk_create([
+        Through(demandeequipement_id=demande_pk, equipment_id=equipment_pk)
+        for demande_pk in DemandeEquipement.objects.order_by('pk').values_list('pk', flat=True)
+        for equipment_pk in rng.sample(equipment_ids, min(2, len(equipment_ids)))
+    ], batch_size=batch_size)
+    DemandeIntervention.objects.bulk_create([
+        DemandeIntervention(
+            service='DSI', poste=f'P{i}', description='Panne', demandeur_id=rng.choice(fonctionnaires),
+        )
+        for i in range(demandes)
+    ], batch_size=batch_size)
+
+    recipients = list(User.objects.filter(is_staff=True).values_list('pk', flat=True)) + fonctionnaires[:20]
+    Notification.objects.bulk_create([
+        Notification(message=f'Notification {i}', personne_id=rng.choice(recipients), read=rng.random() < 0.7)
+        for i in range(notifications)
+    ], batch_size=batch_size)
+    summary.rebuild()
+    return {
+        'admin': admin,
+        'gestionnaire': User.objects.get(username='bench-gestionnaire0'),
+        'fonctionnaire': User.objects.get(username='bench-fonctionnaire0'),
+    }
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'n': len(ordered),
+        'mean': statistics.fmean(ordered),
+        'p50': percentile(ordered, 50),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+    }
+
+
+def format_summary(label, summary):
+    return (
+        f"{label:<45} n={summary['n']:<5} "
+        f"moy={summary['mean'] * 1000:9.2f} ms  "
+        f"p50={summary['p50'] * 1000:9.2f} ms  "
+        f"p95={summary['p95'] * 1000:9.2f} ms  "
+        f"p99={summary['p99'] * 1000:9.2f} ms"
+    )
@@ -0,0 +1,86 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Rendered fragments are keyed by the current version of every model they
+# show. Signals bump a version when its model changes, which orphans all the
+# entries built from it at once: no key enumeration is needed.
+CACHE_ALIAS = 'fragments'
+VERSION_KEY = 'fragments:version:{}'
+EQUIPMENT, AFFECTATION, DEMANDE, NOTIFICATION = 'equipment', 'affectation', 'demande', 'notification'
+# Every fragment also depends on the static files it links to: collectstatic
+# bumps this one when their hashed names may have changed.
+STATIC = 'static'
+
+# Hit/miss counters of this process, by fragment name.
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS if CACHE_ALIAS in settings.CACHES else 'default']
+
+
+def enabled():
+    return getattr(settings, 'FRAGMENT_CACHE_ENABLED', True)
+
+
+def versions(namespaces):
+    cache = get_cache()
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        # A fresh, never-reused value: an evicted counter must not bring back
+        # entries rendered under an older one.
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def fragment_key(name, role, namespaces=(), vary_on=()):
+    version = '.'.join(str(value) for value in versions((STATIC, *namespaces)))
+    digest = hashlib.md5(':'.join(str(value) for value in vary_on).encode()).hexdigest()
+    return f'fragments:{name}:{role}:{version}:{digest}'
+
+
+def fragment(name, role, namespaces, vary_on, render):
+    cache = get_cache()
+    key = fragment_key(name, role, namespaces, vary_on)
+    content = cache.get(key)
+    with _stats_lock:
+        _stats[name, 'hits' if content is not None else 'misses'] += 1
+    if content is None:
+        content = render()
+        cache.set(key, content)
+    return content
+
+
+def stats():
+    with _stats_lock:
+        names = sorted({name for name, _ in _stats})
+        return {name: {'hits': _stats[name, 'hits'], 'misses': _stats[name, 'misses']} for name in names}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def invalidate(*namespaces):
+    # Bumped once the transaction commits: bumping earlier would let a
+    # concurrent request cache pre-commit data under the new version.
+    def bump():
+        cache = get_cache()
+        for namespace in namespaces:
+            key = VERSION_KEY.format(namespace)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+    transaction.on_commit(bump)
@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+from django.utils.functional import SimpleLazyObject
+
+from . import notifications, roles
+
+
+def role(request):
+    # Set by RoleMiddleware; the templates test it instead of loading the user.
+    if not hasattr(request, 'role'):
+        request.user_pk, request.role = roles.resolve(request)
+    return {'role': request.role}
+
+
+def unread_notifications(request):
+    if getattr(request, 'role', None) not in roles.STAFF:
+        return {}
+    # Lazy, so pages that never show the badge never touch the counter; an
+    # unsaved User carrying the id is all the counter needs.
+    user = User(pk=request.user_pk)
+    return {'unread_notifications': SimpleLazyObject(lambda: notifications.unread_count(user))}
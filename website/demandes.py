@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import caching, events
+from .approvals import approve_demandes
+from .models import DemandeEquipement
+from .notifications import notify
+
+EN_ATTENTE, VALIDEE, REFUSEE = 'En attente', 'Validée', 'Refusée'
+# Allowed changes of DemandeEquipement.etat: a decision is final.
+TRANSITIONS = {
+    EN_ATTENTE: {VALIDEE, REFUSEE},
+    VALIDEE: set(),
+    REFUSEE: set(),
+}
+CLAIM_BATCH = 10
+
+
+class InvalidTransition(Exception):
+    pass
+
+
+def check_transition(current, target):
+    if target not in TRANSITIONS:
+        raise InvalidTransition(f"État inconnu : {target!r}.")
+    if target not in TRANSITIONS[current]:
+        raise InvalidTransition(f"Une demande « {current} » ne peut pas passer à « {target} ».")
+
+
+def _free(now):
+    # Unclaimed, or claimed so long ago that the claim has lapsed.
+    expired = now - timedelta(seconds=settings.DEMANDE_CLAIM_TIMEOUT)
+    return Q(traite_par__isnull=True) | Q(date_prise__lt=expired)
+
+
+def held_by_other(demande, user, now=None):
+    """Whether ``demande`` is currently claimed by someone else than ``user``."""
+    now = now or timezone.now()
+    return (
+        demande.traite_par_id is not None and demande.traite_par_id != user.pk
+        and demande.date_prise >= now - timedelta(seconds=settings.DEMANDE_CLAIM_TIMEOUT)
+    )
+
+
+def claim_next(user, limit=CLAIM_BATCH, now=None):
+    """Give ``user`` the ``limit`` oldest pending demandes nobody holds.
+
+    Reads the (etat, date_creation) index; concurrent gestionnaires skip
+    each other's locked rows where the database supports SKIP LOCKED, and
+    the conditional UPDATE guarantees a demande is claimed by one of them.
+    Returns the demandes now held by ``user``, oldest first.
+    """
+    now = now or timezone.now()
+    pending = DemandeEquipement.objects.filter(_free(now), etat=EN_ATTENTE).order_by('date_creation', 'pk')
+
+    def take(pks):
+        DemandeEquipement.objects.filter(_free(now), pk__in=pks, etat=EN_ATTENTE).update(
+            traite_par=user, date_prise=now,
+        )
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(pending.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            take(pks)
+    else:
+        # Without SKIP LOCKED, reading in the same transaction would only make
+        # concurrent claims fail to upgrade their lock (SQLite).
+        pks = list(pending.values_list('pk', flat=True)[:limit])
+        take(pks)
+    caching.invalidate(caching.DEMANDE)
+    return list(queue(user, now).filter(pk__in=pks))
+
+
+def claim(user, pk, now=None):
+    """Claim (or renew the claim on) one pending demande; False if someone else holds it."""
+    now = now or timezone.now()
+    claimed = DemandeEquipement.objects.filter(
+        _free(now) | Q(traite_par=user), pk=pk, etat=EN_ATTENTE,
+    ).update(traite_par=user, date_prise=now)
+    caching.invalidate(caching.DEMANDE)
+    return bool(claimed)
+
+
+def release(user, pks=None):
+    """Send the pending demandes held by ``user`` (or only ``pks``) back to the queue."""
+    held = DemandeEquipement.objects.filter(traite_par=user, etat=EN_ATTENTE)
+    if pks is not None:
+        held = held.filter(pk__in=pks)
+    released = held.update(traite_par=None, date_prise=None)
+    caching.invalidate(caching.DEMANDE)
+    return released
+
+
+def queue(user, now=None):
+    """Pending demandes currently held by ``user``, oldest first."""
+    now = now or timezone.now()
+    expired = now - timedelta(seconds=settings.DEMANDE_CLAIM_TIMEOUT)
+    return (
+        DemandeEquipement.objects.filter(traite_par=user, date_prise__gte=expired, etat=EN_ATTENTE)
+        .select_related('demandeur').prefetch_related('equipements').order_by('date_creation', 'pk')
+    )
+
+
+def decide(pk, etat, auteur):
+    """Move demande ``pk`` to ``etat``, enforcing TRANSITIONS and claims.
+
+    Validation goes through approve_demandes, which also withdraws the
+    stock; a refusal releases the requested equipment. Raises
+    InvalidTransition when the change is not allowed.
+    """
+    with transaction.atomic():
+        demande = DemandeEquipement.objects.select_for_update().select_related('demandeur', 'traite_par').get(pk=pk)
+        check_transition(demande.etat, etat)
+        if held_by_other(demande, auteur):
+            raise InvalidTransition(f"Cette demande est prise en charge par {demande.traite_par}.")
+        if etat == VALIDEE:
+            return approve_demandes([demande.pk], auteur=auteur)
+        demande.etat = etat
+        demande.traite_par = auteur
+        demande.equipements.clear()
+        demande.save()
+        events.notify_demande(demande)
+        notify([
+            (demande.demandeur_id, f"Demande d'équipement {demande.id} {etat} pour {demande.demandeur}"),
+        ])
+    return None
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+GESTIONNAIRES_CHANNEL = 'gestionnaires'
+USER_CHANNEL = 'user:{}'
+HEARTBEAT_SECONDS = 15
+
+
+class Subscription:
+    def __init__(self, broker, channels, queue_size):
+        self.broker = broker
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client loses events rather than growing without bound.
+            pass
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    # Fan-out to asyncio queues living in this process. Publishers may run in
+    # any thread (sync views); each subscriber is woken on its own event loop.
+    queue_size = 100
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's event loop is gone.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, *channels):
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel, set())
+                subscribers.discard(subscription)
+                if not subscribers:
+                    self._subscribers.pop(channel, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({subscription for subscribers in self._subscribers.values() for subscription in subscribers})
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(getattr(settings, 'EVENT_BROKER', 'website.events.InProcessBroker'))()
+
+
+def publish_on_commit(events):
+    # ``events`` is a list of (channel, event) pairs delivered together once
+    # the surrounding transaction commits, so clients never see rolled-back work.
+    broker = get_broker()
+
+    def publish():
+        for channel, event in events:
+            broker.publish(channel, event)
+    transaction.on_commit(publish)
+
+
+def notify_demande(demande):
+    publish_on_commit([(GESTIONNAIRES_CHANNEL, {
+        'type': 'demande', 'id': demande.pk, 'etat': demande.etat, 'objet': demande.objet,
+    })])
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def event_stream(*channels, heartbeat=HEARTBEAT_SECONDS, max_age=None):
+    """Server-sent events of ``channels``, for at most ``max_age`` seconds.
+
+    Django 4.2 does not tell a streaming response that its client went
+    away, and ASGI servers drop writes to closed connections silently, so
+    the stream ends by itself after EVENT_STREAM_MAX_AGE seconds: an open
+    page reconnects after ``retry``, a closed one frees its subscription.
+    """
+    if max_age is None:
+        max_age = settings.EVENT_STREAM_MAX_AGE
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    subscription = get_broker().subscribe(*channels)
+    try:
+        yield 'retry: 5000\n\n'
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(subscription.get(), min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing idle connections.
+                yield ': ping\n\n'
+                continue
+            yield format_sse(event)
+    finally:
+        subscription.close()
@@ -2,8 +2,65 @@ from typing import Required
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from . import roles
 from .models import Equipment, Affectation, DemandeEquipement, DemandeIntervention
 
+def available_equipment():
+    return Equipment.objects.filter(affecte=False, quantity__gt=0)
+
+def fonctionnaires():
+    return User.objects.filter(is_staff=False, is_superuser=False)
+
+class AutocompleteMixin:
+    """Render only the selected options of a model choice field.
+
+    The other choices are fetched from ``url`` as the user types (see
+    ``js/autocomplete.js``), so the page no longer embeds the whole table;
+    on submission the field itself only looks up the posted primary keys.
+    """
+
+    class Media:
+        js = ['js/autocomplete.js']
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [str(v) for v in value if str(v) not in field.empty_values]
+        options = []
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            options.append(self.create_option(name, '', field.empty_label, not selected, 0))
+        # Posted values are untrusted: drop those the primary key cannot
+        # hold, which would break the lookup; the field reports them itself.
+        keys = []
+        pk = self.choices.queryset.model._meta.pk
+        for v in selected:
+            try:
+                keys.append(pk.to_python(v))
+            except (ValidationError, ValueError):
+                pass
+        if keys:
+            for obj in self.choices.queryset.filter(pk__in=keys):
+                options.append(self.create_option(
+                    name, field.prepare_value(obj), field.label_from_instance(obj), True, len(options),
+                ))
+        return [(None, [option], option['index']) for option in options]
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
+
 class LoginForm(forms.Form):
     email = forms.EmailField(
         label='Email',
@@ -16,15 +73,21 @@ class LoginForm(forms.Form):
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True)
-    role = forms.ChoiceField(choices=[('admin', 'Admin'), ('gestionnaire', 'Gestionnaire'), ('fonctionnaire', 'Fonctionnaire')])
+    role = forms.ChoiceField(choices=roles.CHOICES)
 
     class Meta:
         model = User
         fields = ['username', 'email', 'password1', 'password2', 'role']
 
+    def clean_email(self):
+        email = self.cleaned_data.get('email')
+        if User.objects.filter(email=email).exists():
+            raise forms.ValidationError("Cet email est déjà utilisé par un autre utilisateur.")
+        return email
+
 class UserUpdateForm(forms.ModelForm):
     email = forms.EmailField(required=True)
-    role = forms.ChoiceField(choices=[('admin', 'Admin'), ('gestionnaire', 'Gestionnaire'), ('fonctionnaire', 'Fonctionnaire')])
+    role = forms.ChoiceField(choices=roles.CHOICES)
     password = forms.CharField(
         label='Mot de passe (optionnel)',
         widget=forms.PasswordInput(attrs={'class': 'form-control'}),
@@ -61,6 +124,30 @@ class EquipmentForm(forms.ModelForm):
         model = Equipment
         fields = ['cab_number', 'designation', 'type', 'sous_type', 'year', 'emplacement', 'quantity']
 
+class EquipmentImportUploadForm(forms.Form):
+    fichier = forms.FileField(
+        label='Fichier CSV',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv'})
+    )
+    mettre_a_jour = forms.BooleanField(label='Mettre à jour les numéros CAB existants', required=False, initial=True)
+
+class BulkReturnForm(forms.Form):
+    cab_numbers = forms.CharField(
+        label='Numéros CAB scannés',
+        required=False,
+        widget=forms.Textarea(attrs={'class': 'form-control', 'rows': 10, 'autofocus': True}),
+        help_text='Un numéro par ligne, comme les envoie le lecteur de codes-barres.',
+    )
+    service = forms.CharField(
+        label='Service (facultatif)',
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control'}),
+        help_text="Limite les numéros scannés aux affectations de ce service.",
+    )
+
+    def clean_cab_numbers(self):
+        return [value for value in self.cleaned_data['cab_numbers'].replace(',', '\n').split() if value]
+
 class AffectationForm(forms.ModelForm):
     quantity = forms.IntegerField(
         label='Quantité',
@@ -72,15 +159,15 @@ class AffectationForm(forms.ModelForm):
         model = Affectation
         fields = ['equipement', 'fonctionnaire', 'service', 'quantity']
         widgets = {
-            'equipement': forms.Select(attrs={'class': 'form-control'}),
-            'fonctionnaire': forms.Select(attrs={'class': 'form-control'}),
+            'equipement': AutocompleteSelect('equipment_autocomplete', attrs={'class': 'form-control'}),
+            'fonctionnaire': AutocompleteSelect('fonctionnaire_autocomplete', attrs={'class': 'form-control'}),
             'service': forms.TextInput(attrs={'class': 'form-control'}),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['equipement'].queryset = Equipment.objects.filter(affecte=False, quantity__gt=0)
-        self.fields['fonctionnaire'].queryset = User.objects.filter(is_staff=False, is_superuser=False)
+        self.fields['equipement'].queryset = available_equipment()
+        self.fields['fonctionnaire'].queryset = fonctionnaires()
 
     def clean(self):
         cleaned_data = super().clean()
@@ -94,8 +181,8 @@ class AffectationForm(forms.ModelForm):
 
 class DemandeEquipementForm(forms.ModelForm):
     equipements = forms.ModelMultipleChoiceField(
-        queryset=Equipment.objects.filter(affecte=False, quantity__gt=0),
-        widget=forms.SelectMultiple(attrs={'class': 'form-control', 'data-live-search': 'true'})
+        queryset=available_equipment(),
+        widget=AutocompleteSelectMultiple('equipment_autocomplete', attrs={'class': 'form-control'})
     )
 
     class Meta:
@@ -0,0 +1,143 @@
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+
+from . import caching, search, summary
+from .exports import EQUIPMENT_HEADER
+from .forms import EquipmentForm
+from .models import Equipment, StockMovement
+
+CHUNK_SIZE = 1000
+FIELDS = EquipmentForm.Meta.fields
+UPDATE_FIELDS = [name for name in FIELDS if name != 'cab_number']
+# Files produced by the stock export can be imported back as they are.
+HEADER_ALIASES = dict(zip(EQUIPMENT_HEADER, FIELDS))
+
+
+class EquipmentImportForm(EquipmentForm):
+    def validate_unique(self):
+        # Uniqueness of cab_number is resolved per chunk with a single lookup.
+        pass
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    updated: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def imported(self):
+        return self.created + self.updated
+
+
+def _normalize(row):
+    return {HEADER_ALIASES.get(key.strip(), key.strip()): (value or '').strip() for key, value in row.items() if key}
+
+
+class EquipmentImporter:
+    def __init__(self, chunk_size=CHUNK_SIZE, update_existing=True):
+        self.chunk_size = chunk_size
+        self.update_existing = update_existing
+        self.report = ImportReport()
+        self.seen = {}
+        self.touched = set()
+
+    def run(self, lines):
+        # Line 1 is the header.
+        numbered = enumerate(csv.DictReader(lines), start=2)
+        try:
+            while chunk := list(islice(numbered, self.chunk_size)):
+                self._save_chunk(self._validate(chunk))
+        finally:
+            # bulk writes send no signals: the summary of every touched group
+            # is refreshed once, rather than rescanned after each chunk.
+            summary.refresh_groups(self.touched)
+            caching.invalidate(caching.EQUIPMENT)
+        return self.report
+
+    def _validate(self, chunk):
+        valid = []
+        for line, row in chunk:
+            form = EquipmentImportForm(_normalize(row))
+            if not form.is_valid():
+                self.report.errors.append((line, '; '.join(
+                    f"{name}: {' '.join(messages)}" for name, messages in form.errors.items()
+                )))
+                continue
+            cab_number = form.cleaned_data['cab_number']
+            if cab_number in self.seen:
+                self.report.errors.append((line, f"cab_number: en double avec la ligne {self.seen[cab_number]}."))
+                continue
+            self.seen[cab_number] = line
+            valid.append((line, form.cleaned_data))
+        return valid
+
+    def _save_chunk(self, valid):
+        try:
+            self._write_chunk(valid)
+        except IntegrityError:
+            # Another import created some of these cab_numbers after they
+            # were looked up: written again, they are existing rows, updated
+            # or reported like any other.
+            self._write_chunk(valid)
+
+    def _write_chunk(self, valid):
+        with transaction.atomic():
+            # Locked until the chunk is written: their quantity is the base of
+            # the logged adjustment.
+            existing = {
+                cab_number: (pk, group, quantity)
+                for cab_number, pk, quantity, *group in Equipment.objects.select_for_update().filter(
+                    cab_number__in=[data['cab_number'] for _, data in valid]
+                ).values_list('cab_number', 'pk', 'quantity', *summary.GROUP)
+            }
+            new = [Equipment(**data) for _, data in valid if data['cab_number'] not in existing]
+            old = [(line, Equipment(**data)) for line, data in valid if data['cab_number'] in existing]
+            rejected = []
+            if not self.update_existing:
+                rejected, old = [line for line, _ in old], []
+
+            # A plain insert for the new rows: one created meanwhile by
+            # another import makes it fail instead of being upserted as new.
+            Equipment.objects.bulk_create(new)
+            for _, equipment in old:
+                equipment.pk = existing[equipment.cab_number][0]
+            if old and connection.features.supports_update_conflicts_with_target:
+                Equipment.objects.bulk_create(
+                    [equipment for _, equipment in old],
+                    update_conflicts=True, unique_fields=['cab_number'], update_fields=UPDATE_FIELDS,
+                )
+            else:
+                Equipment.objects.bulk_update([equipment for _, equipment in old], UPDATE_FIELDS)
+            missing = [equipment for equipment in new if equipment.pk is None]
+            if missing:
+                # Not every backend returns the primary keys of a bulk insert.
+                pks = dict(Equipment.objects.filter(
+                    cab_number__in=[equipment.cab_number for equipment in missing]
+                ).values_list('cab_number', 'pk'))
+                for equipment in missing:
+                    equipment.pk = pks[equipment.cab_number]
+            # bulk writes send no signals: quantity changes are logged here.
+            adjustments = [(equipment, equipment.quantity) for equipment in new]
+            adjustments += [
+                (equipment, equipment.quantity - existing[equipment.cab_number][2]) for _, equipment in old
+            ]
+            StockMovement.objects.bulk_create([
+                StockMovement(equipement_id=equipment.pk, delta=delta, motif='ajustement')
+                for equipment, delta in adjustments if delta
+            ])
+        self.report.errors.extend((line, "cab_number: cet équipement existe déjà.") for line in rejected)
+        self.touched.update(summary.group_of(equipment) for equipment in new)
+        self.touched.update(summary.group_of(equipment) for _, equipment in old)
+        self.touched.update(tuple(existing[equipment.cab_number][1]) for _, equipment in old)
+        if search.is_built():
+            search.index_equipment(new + [equipment for _, equipment in old])
+        self.report.created += len(new)
+        self.report.updated += len(old)
+
+
+def import_equipment(lines, chunk_size=CHUNK_SIZE, update_existing=True):
+    return EquipmentImporter(chunk_size, update_existing).run(lines)
@@ -0,0 +1,245 @@
+import logging
+import random
+import threading
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+from .stats import percentile
+
+BATCH_SIZE = 10
+ERROR_PREVIEW = 2000
+METRICS_WINDOW = 3600
+METRICS_SAMPLE = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def task(func=None, *, max_attempts=None):
+    # Marks a function as runnable from the queue; it is looked up by dotted
+    # path when the job runs, so its payload must be JSON keyword arguments.
+    def decorator(func):
+        func.job_name = f'{func.__module__}.{func.__qualname__}'
+        func.max_attempts = max_attempts
+        return func
+    return decorator(func) if func else decorator
+
+
+def enqueue(func, *, delay=0, **payload):
+    # The row is written in the caller's transaction: the job exists exactly
+    # when the work that produced it commits, and is never run before that.
+    job = Job.objects.create(
+        name=func.job_name,
+        payload=payload,
+        max_attempts=func.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if settings.JOBS_MODE == 'eager' and not delay:
+        transaction.on_commit(lambda: run_job(job.pk))
+    elif settings.JOBS_MODE == 'threads':
+        transaction.on_commit(lambda: get_pool().wake())
+    return job
+
+
+def resolve(name):
+    func = import_string(name)
+    if getattr(func, 'job_name', None) != name:
+        raise ImportError(f"{name} n'est pas une tâche.")
+    return func
+
+
+def claim(limit=BATCH_SIZE, pks=None):
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    ready = Job.objects.filter(status='pending', run_after__lte=now).order_by('run_after', 'pk')
+    if pks is not None:
+        ready = ready.filter(pk__in=pks)
+    with transaction.atomic():
+        # SKIP LOCKED lets concurrent workers pass over each other's rows where
+        # the database has it; the conditional UPDATE is what guarantees that
+        # a job is claimed by one worker only.
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        pks = list(ready.values_list('pk', flat=True)[:limit])
+        Job.objects.filter(pk__in=pks, status='pending').update(
+            status='running', locked_by=token, started_at=now, attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(pk__in=pks, locked_by=token).order_by('run_after', 'pk'))
+
+
+def retry_delay(attempts):
+    # Exponential backoff, with jitter so that jobs failing together (the
+    # database was down) do not all come back at the same instant.
+    delay = min(settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1)
+
+
+def execute(job):
+    # Claimed jobs of a batch run one after the other: the run time starts now.
+    started = timezone.now()
+    try:
+        func = resolve(job.name)
+        with transaction.atomic():
+            func(**job.payload)
+    except Exception:
+        now = timezone.now()
+        fields = {'locked_by': '', 'last_error': traceback.format_exc()[-ERROR_PREVIEW:]}
+        if job.attempts >= job.max_attempts:
+            fields.update(status='failed', finished_at=now)
+        else:
+            fields.update(status='pending', run_after=now + timedelta(seconds=retry_delay(job.attempts)))
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(**fields)
+        return False
+    # Only while still claimed: a run that outlived JOBS_TIMEOUT has been
+    # requeued and may belong to another worker by now.
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status='done', locked_by='', started_at=started, finished_at=timezone.now(),
+    )
+    return True
+
+
+def run_job(pk):
+    for job in claim(pks=[pk]):
+        execute(job)
+
+
+def requeue_stale():
+    # Jobs left running by a worker that died go back to the queue; the
+    # interrupted run counts as an attempt, so those that used their last
+    # one fail instead.
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', started_at__lt=now - timedelta(seconds=settings.JOBS_TIMEOUT))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', locked_by='', finished_at=now,
+        last_error=f"Interrompue : non terminée après {settings.JOBS_TIMEOUT} s, dernière tentative.",
+    )
+    if failed:
+        logger.warning("Job queue: %d interrupted job(s) failed after their last attempt.", failed)
+    return stale.update(status='pending', locked_by='', run_after=now)
+
+
+def purge():
+    cutoff = timezone.now() - timedelta(seconds=settings.JOBS_KEEP)
+    return Job.objects.filter(status='done', finished_at__lt=cutoff).delete()[0]
+
+
+_maintenance_lock = threading.Lock()
+_maintained = 0.0
+
+
+def maintain(interval=60):
+    global _maintained
+    with _maintenance_lock:
+        if time.monotonic() - _maintained < interval:
+            return
+        _maintained = time.monotonic()
+    requeue_stale()
+    purge()
+
+
+class Worker:
+    def __init__(self, batch=BATCH_SIZE):
+        self.batch = batch
+
+    def run_once(self):
+        jobs = claim(self.batch)
+        for job in jobs:
+            execute(job)
+        return len(jobs)
+
+    def drain(self):
+        done = 0
+        while ran := self.run_once():
+            done += ran
+        return done
+
+    def run(self, stop, wakeup):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                try:
+                    if self.run_once():
+                        continue
+                    maintain()
+                except DatabaseError:
+                    # The database being unreachable for a while must not
+                    # kill the worker; claimed jobs are requeued if need be.
+                    logger.exception("Job worker: database error, retrying.")
+                wakeup.wait(settings.JOBS_POLL_INTERVAL)
+                wakeup.clear()
+        finally:
+            connection.close()
+
+
+class WorkerPool:
+    def __init__(self, threads, batch=BATCH_SIZE):
+        self.stop = threading.Event()
+        self.wakeup = threading.Event()
+        self.threads = [
+            threading.Thread(target=Worker(batch).run, args=(self.stop, self.wakeup), name=f'jobs-{i}', daemon=True)
+            for i in range(threads)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def wake(self):
+        self.wakeup.set()
+
+    def shutdown(self, timeout=None):
+        self.stop.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # In "threads" mode each web process runs its own pool, started by the
+    # first job it enqueues; pools of every process share the same table.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(settings.JOBS_THREADS).start()
+    return _pool
+
+
+def metrics(window=METRICS_WINDOW):
+    now = timezone.now()
+    counts = dict(Job.objects.order_by().values_list('status').annotate(count=Count('pk')))
+    oldest = Job.objects.filter(status='pending', run_after__lte=now).aggregate(oldest=Min('run_after'))['oldest']
+    since = now - timedelta(seconds=window)
+    recent = list(
+        Job.objects.filter(status='done', finished_at__gte=since)
+        .order_by('-finished_at').values_list('run_after', 'started_at', 'finished_at')[:METRICS_SAMPLE]
+    )
+    # Waiting time counts from when a job became runnable, so retry backoff
+    # is not mistaken for a slow queue.
+    waits = sorted(max((started - run_after).total_seconds(), 0) for run_after, started, _ in recent)
+    runs = sorted((finished - started).total_seconds() for _, started, finished in recent)
+    return {
+        'pending': counts.get('pending', 0),
+        'running': counts.get('running', 0),
+        'failed': counts.get('failed', 0),
+        'done': len(recent),
+        'failed_recently': Job.objects.filter(status='failed', finished_at__gte=since).count(),
+        'oldest_wait': (now - oldest).total_seconds() if oldest else 0.0,
+        'wait_p50': percentile(waits, 50) if waits else 0.0,
+        'wait_p95': percentile(waits, 95) if waits else 0.0,
+        'run_p50': percentile(runs, 50) if runs else 0.0,
+        'run_p95': percentile(runs, 95) if runs else 0.0,
+        'window': window,
+    }
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models import F
+
+from . import caching, summary
+from .models import Equipment, StockMovement
+
+
+class InsufficientStock(Exception):
+    def __init__(self, equipement, quantite):
+        self.equipement = equipement
+        self.quantite = quantite
+        super().__init__(
+            f"La quantité demandée ({quantite}) dépasse la quantité disponible pour {equipement}."
+        )
+
+
+def move_stock(equipement, delta, motif, auteur=None, affectation=None, affecte=None, open_delta=0):
+    # Every quantity change goes through a single conditional UPDATE so that
+    # concurrent gestionnaires can neither lose updates nor drive stock negative.
+    updates = {'quantity': F('quantity') + delta}
+    if affecte is not None:
+        updates['affecte'] = affecte
+    with transaction.atomic():
+        rows = Equipment.objects.filter(pk=equipement.pk)
+        if delta < 0:
+            rows = rows.filter(quantity__gte=-delta)
+        if not rows.update(**updates):
+            raise InsufficientStock(equipement, -delta)
+        movement = StockMovement.objects.create(
+            equipement_id=equipement.pk, delta=delta, motif=motif, auteur=auteur, affectation=affectation,
+        )
+        equipement.refresh_from_db(fields=['quantity', 'affecte', *summary.GROUP])
+        # Stock only moves between available and assigned.
+        summary.apply_delta(summary.group_of(equipement), available=delta, assigned=-delta, opened=open_delta)
+        caching.invalidate(caching.EQUIPMENT)
+    return movement
+
+
+def withdraw(equipement, quantite, motif, auteur=None, affectation=None):
+    return move_stock(equipement, -quantite, motif, auteur=auteur, affectation=affectation, affecte=True, open_delta=1)
+
+
+def restock(equipement, quantite, motif, auteur=None, affectation=None):
+    return move_stock(equipement, quantite, motif, auteur=auteur, affectation=affectation, affecte=False, open_delta=-1)
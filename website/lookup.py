@@ -0,0 +1,105 @@
+import threading
+from collections import Counter, OrderedDict
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import FilteredRelation, Q
+
+from . import caching
+from .models import Equipment
+
+# Bounds IN (...) lists, which SQL Server caps at 2100 parameters.
+LOOKUP_CHUNK = 2000
+# Fragment-cache namespaces an entry depends on: every write path of the
+# equipment and affectation tables bumps one of them, in any process.
+NAMESPACES = (caching.EQUIPMENT, caching.AFFECTATION)
+EQUIPMENT_FIELDS = ['id', 'cab_number', 'designation', 'type', 'sous_type', 'emplacement', 'quantity', 'affecte']
+HOLDER_FIELDS = ['id', 'username', 'first_name', 'last_name', 'email']
+
+# cab_number -> (versions, item or None), least recently used first.
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = Counter()
+
+
+def _fetch(cab_numbers):
+    # Equipment and their open affectations in one LEFT JOIN per chunk, on
+    # the unique cab_number index.
+    columns = (
+        EQUIPMENT_FIELDS
+        + ['ouverte__id', 'ouverte__service', 'ouverte__quantity', 'ouverte__date_affectation']
+        + [f'ouverte__fonctionnaire__{name}' for name in HOLDER_FIELDS]
+    )
+    items = {}
+    iterator = iter(cab_numbers)
+    while chunk := list(islice(iterator, LOOKUP_CHUNK)):
+        rows = (
+            Equipment.objects.filter(cab_number__in=chunk)
+            .annotate(ouverte=FilteredRelation('affectation', condition=Q(affectation__date_retour__isnull=True)))
+            .order_by('id', 'ouverte__id').values_list(*columns)
+        )
+        for row in rows:
+            equipment = dict(zip(EQUIPMENT_FIELDS, row))
+            item = items.setdefault(equipment['cab_number'], {**equipment, 'affectations': []})
+            pk, service, quantity, date_affectation, *holder = row[len(EQUIPMENT_FIELDS):]
+            if pk is not None:
+                item['affectations'].append({
+                    'id': pk,
+                    'service': service,
+                    'quantity': quantity,
+                    'date_affectation': date_affectation.isoformat(),
+                    'fonctionnaire': dict(zip(HOLDER_FIELDS, holder)),
+                })
+    return items
+
+
+def lookup_many(cab_numbers):
+    """Resolve scanned cab_numbers to their equipment, open affectations and holders.
+
+    Returns a dict in the order of ``cab_numbers``, mapping each distinct code
+    to a JSON-ready item, or to None for an unknown code. Recently resolved
+    codes are answered from a per-process LRU cache of LOOKUP_CACHE_SIZE
+    entries, which drops them as soon as the equipment or affectation tables
+    change; the others are read in a single query.
+    """
+    codes = list(dict.fromkeys(code.strip() for code in cab_numbers if code and code.strip()))
+    size = settings.LOOKUP_CACHE_SIZE
+    current = tuple(caching.versions(NAMESPACES)) if size else None
+    found, missing = {}, []
+    with _lock:
+        for code in codes:
+            entry = _cache.get(code)
+            if entry is not None and entry[0] == current:
+                _cache.move_to_end(code)
+                found[code] = entry[1]
+            else:
+                missing.append(code)
+        _stats['hits'] += len(found)
+        _stats['misses'] += len(missing)
+    if missing:
+        fetched = _fetch(missing)
+        if size:
+            with _lock:
+                for code in missing:
+                    _cache[code] = (current, fetched.get(code))
+                    _cache.move_to_end(code)
+                while len(_cache) > size:
+                    _cache.popitem(last=False)
+        found.update((code, fetched.get(code)) for code in missing)
+    return {code: found[code] for code in codes}
+
+
+def lookup(cab_number):
+    """The item of one scanned cab_number, or None if it is unknown."""
+    return lookup_many([cab_number]).get(cab_number.strip())
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _stats.clear()
+
+
+def stats():
+    with _lock:
+        return {'size': len(_cache), 'hits': _stats['hits'], 'misses': _stats['misses']}
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from website import archive
+
+
+class Command(BaseCommand):
+    help = "Déplace les affectations retournées depuis longtemps vers la table d'archives (à lancer chaque jour)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.AFFECTATION_ARCHIVE_AFTER_DAYS,
+                            help='Âge minimal du retour, en jours.')
+        parser.add_argument('--batch-size', type=int, default=archive.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        archived = archive.archive_affectations(options['days'], options['batch_size'])
+        self.stdout.write(f'{archived} affectation(s) archivée(s).')
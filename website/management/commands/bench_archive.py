@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from website import archive
+from website.bench import format_summary, isolated_database, measure, seed_dataset, summarize
+from website.models import Affectation, AffectationArchive
+
+
+class Command(BaseCommand):
+    help = ("Mesure la liste des affectations et les affectations en cours d'un fonctionnaire "
+            "avant et après archivage des affectations retournées.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--affectations', type=int, default=200000)
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            users = seed_dataset(users=500, equipment=5000, affectations=options['affectations'], demandes=0,
+                                 notifications=0)
+            fonctionnaire = users['fonctionnaire']
+
+            def listing():
+                # gestion_affectation: every live row, newest first.
+                list(Affectation.objects.order_by(*archive.HISTORY_ORDER).values_list('pk', flat=True))
+
+            def mes_equipements():
+                list(Affectation.objects.filter(fonctionnaire=fonctionnaire, date_retour__isnull=True))
+
+            before = [summarize(measure(func, options['repeat'])) for func in (listing, mes_equipements)]
+            start = time.perf_counter()
+            archived = archive.archive_affectations(options['days'])
+            elapsed = time.perf_counter() - start
+            after = [summarize(measure(func, options['repeat'])) for func in (listing, mes_equipements)]
+
+            self.stdout.write(
+                f'{archived} affectations archivées en {elapsed:.2f} s ({archived / elapsed:.0f}/s), '
+                f'{Affectation.objects.count()} restent dans la table vivante '
+                f'({AffectationArchive.objects.count()} archivées).'
+            )
+            for label, summary in (('liste complète, avant', before[0]), ('liste complète, après', after[0]),
+                                   ('mes_equipements, avant', before[1]), ('mes_equipements, après', after[1])):
+                self.stdout.write(format_summary(label, summary))
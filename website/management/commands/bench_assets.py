@@ -0,0 +1,101 @@
+import tempfile
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from website.bench import isolated_database, seed_dataset
+
+PAGES = [
+    # (route, role)
+    ('home', None),
+    ('login', None),
+    ('dashboard', 'admin'),
+    ('stock', 'gestionnaire'),
+    ('gestion_equipement', 'gestionnaire'),
+    ('affectation_create', 'gestionnaire'),
+    ('mes_equipements', 'fonctionnaire'),
+    ('demande_equipement_create', 'fonctionnaire'),
+]
+SCENARIOS = [
+    # (label, static files storage, bundles)
+    ('avant', 'django.contrib.staticfiles.storage.StaticFilesStorage', False),
+    ('après', 'website.assets.AssetStorage', True),
+]
+ACCEPT_ENCODING = 'gzip, deflate, br'
+
+
+def asset_urls(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    urls = [link['href'] for link in soup.find_all('link', rel='stylesheet', href=True)]
+    urls += [script['src'] for script in soup.find_all('script', src=True)]
+    urls += [image['src'] for image in soup.find_all('img', src=True)]
+    return urls
+
+
+class Command(BaseCommand):
+    help = ("Compare, page par page, les feuilles de style, scripts et images téléchargés avant et après la chaîne "
+            "d'assets (bundles, noms hachés, gzip/brotli, cache longue durée) : octets et requêtes à la première "
+            "visite, requêtes de revalidation aux visites suivantes.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with isolated_database():
+            users = seed_dataset(users=20, equipment=200, affectations=50, demandes=10, notifications=10)
+            results = {}
+            for label, backend, bundled in SCENARIOS:
+                storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': backend}}
+                # DEBUG makes the manifest storage hand out unhashed names.
+                with tempfile.TemporaryDirectory() as root, override_settings(
+                    DEBUG=False, STATIC_ROOT=root, STORAGES=storages, ASSETS_BUNDLED=bundled, SERVE_STATIC=True,
+                ):
+                    call_command('collectstatic', interactive=False, verbosity=0)
+                    results[label] = self.measure(users)
+            self.report(results)
+
+    def measure(self, users):
+        static_prefix = urlsplit(settings.STATIC_URL).path
+        pages = {}
+        for name, role in PAGES:
+            client = Client()
+            if role:
+                client.force_login(users[role])
+            response = client.get(reverse(name))
+            assert response.status_code == 200, (name, response.status_code)
+            first_bytes = local = external = revalidated = 0
+            for url in asset_urls(response.content.decode()):
+                if not url.startswith(static_prefix):
+                    # CDN files (Bootstrap): same in both scenarios, not fetched here.
+                    external += 1
+                    continue
+                local += 1
+                asset = client.get(url, HTTP_ACCEPT_ENCODING=ACCEPT_ENCODING)
+                assert asset.status_code == 200, (url, asset.status_code)
+                first_bytes += len(asset.content)
+                if 'immutable' not in asset.get('Cache-Control', ''):
+                    revalidated += 1
+            pages[name] = (local, first_bytes, revalidated, external)
+        return pages
+
+    def report(self, results):
+        before, after = results['avant'], results['après']
+        self.stdout.write(
+            f"{'page':<28}{'requêtes':>10}{'octets avant':>14}{'octets après':>14}{'gain':>7}"
+            f"{'revalidations':>16}{'CDN':>5}"
+        )
+        totals = [0, 0]
+        for name, _ in PAGES:
+            local_before, bytes_before, revalidated_before, external = before[name]
+            local_after, bytes_after, revalidated_after, _ = after[name]
+            totals[0] += bytes_before
+            totals[1] += bytes_after
+            self.stdout.write(
+                f"{name:<28}{f'{local_before} → {local_after}':>10}{bytes_before:>14}{bytes_after:>14}"
+                f"{1 - bytes_after / bytes_before:>7.0%}{f'{revalidated_before} → {revalidated_after}':>16}{external:>5}"
+            )
+        self.stdout.write(f"{'total':<38}{totals[0]:>14}{totals[1]:>14}{1 - totals[1] / totals[0]:>7.0%}")
@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import defaultdict
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.backends.signals import connection_created
+from django.shortcuts import render
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import path, reverse
+
+from project import urls as project_urls
+from website import roles, views
+from website.roles import role_required
+from website.bench import format_summary, isolated_database, seed_dataset, summarize
+
+PAGES = [
+    # (route, role)
+    ('stock', 'gestionnaire'),
+    ('notifications', 'gestionnaire'),
+    ('gestion_affectation', 'gestionnaire'),
+    ('mes_equipements', 'fonctionnaire'),
+]
+
+
+# The read pages served synchronously, as before, from the same querysets and
+# context as the async views.
+@role_required(*roles.STAFF)
+def stock(request):
+    return render(request, 'stock.html', views._stock_context(request))
+
+
+@role_required(*roles.STAFF)
+def notifications(request):
+    return render(request, 'notifications.html', views._notifications_context(request))
+
+
+@role_required(*roles.STAFF)
+def gestion_affectation(request):
+    live, archived = views._affectation_history(request.GET)
+    if archived is not None:
+        context = views._history_context(request.GET, live, archived)
+    else:
+        context = {'affectations': live, 'archives': False}
+    return render(request, 'gestion_affectation.html', context)
+
+
+@role_required(roles.FONCTIONNAIRE)
+def mes_equipements(request):
+    return render(request, 'mes_equipements.html', {'affectations': views._mes_equipements(request.user_pk)})
+
+
+class SyncViews:
+    # The same site with the sync read views above.
+    urlpatterns = [
+        path('stock/', stock, name='stock'),
+        path('notifications/', notifications, name='notifications'),
+        path('affectation/', gestion_affectation, name='gestion_affectation'),
+        path('mes_equipements/', mes_equipements, name='mes_equipements'),
+    ] + project_urls.urlpatterns
+
+
+async def get(application, url, cookie):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': url, 'raw_path': url.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie)],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    body_sent = False
+    disconnected = asyncio.Event()
+    status = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    start = time.perf_counter()
+    await application(scope, receive, send)
+    duration = time.perf_counter() - start
+    disconnected.set()
+    return status[0], duration
+
+
+class Command(BaseCommand):
+    help = ("Compare les vues de lecture synchrones et asynchrones (stock, notifications, affectations, "
+            "mes équipements) sous ASGI, avec N clients simultanés : débit, latence de queue et threads.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=2, help='Requêtes par client et par scénario.')
+        parser.add_argument('--affectations', type=int, default=300)
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help="Aller-retour réseau simulé par requête SQL, en ms (SQLite n'en a pas).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with isolated_database():
+            users = seed_dataset(users=200, equipment=2000, affectations=options['affectations'],
+                                 demandes=100, notifications=500)
+            cookies = {}
+            for role in ('gestionnaire', 'fonctionnaire'):
+                client = Client()
+                client.force_login(users[role])
+                cookies[role] = f"sessionid={client.cookies['sessionid'].value}".encode()
+            application = get_asgi_application()
+            if options['latency']:
+                delay = options['latency'] / 1000
+
+                def round_trip(execute, sql, params, many, context):
+                    time.sleep(delay)
+                    return execute(sql, params, many, context)
+
+                def add_latency(sender, connection, **kwargs):
+                    connection.execute_wrappers.append(round_trip)
+
+                connection_created.connect(add_latency, weak=False)
+                close_old_connections()
+            # Rendered fragments would hide the database work being compared.
+            with override_settings(FRAGMENT_CACHE_ENABLED=False):
+                for label, urlconf in (('vues synchrones', SyncViews), ('vues asynchrones', None)):
+                    with override_settings(**({'ROOT_URLCONF': urlconf} if urlconf else {})):
+                        results = asyncio.run(self.run(application, cookies, options))
+                    self.report(label, *results)
+
+    async def run(self, application, cookies, options):
+        pages = itertools.cycle([(name, reverse(name), cookies[role]) for name, role in PAGES])
+        plan = [[next(pages) for _ in range(options['requests'])] for _ in range(options['clients'])]
+        samples, statuses, threads = defaultdict(list), set(), [threading.active_count()]
+        done = asyncio.Event()
+
+        async def watch_threads():
+            while not done.is_set():
+                threads.append(threading.active_count())
+                await asyncio.sleep(0.005)
+
+        async def client(requests):
+            for name, url, cookie in requests:
+                status, duration = await get(application, url, cookie)
+                statuses.add(status)
+                samples[name].append(duration)
+
+        watcher = asyncio.create_task(watch_threads())
+        start = time.perf_counter()
+        await asyncio.gather(*(client(requests) for requests in plan))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await watcher
+        return samples, statuses, elapsed, max(threads)
+
+    def report(self, label, samples, statuses, elapsed, threads):
+        every = [duration for durations in samples.values() for duration in durations]
+        self.stdout.write(format_summary(label, summarize(every)))
+        for name, durations in samples.items():
+            self.stdout.write(format_summary(f'  {name}', summarize(durations)))
+        self.stdout.write(
+            f'  {len(every) / elapsed:.1f} req/s, {threads} threads au plus, statuts {sorted(statuses)}'
+        )
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import path
+
+from website import roles
+from website.bench import format_summary, isolated_database, measure, seed_dataset, summarize
+
+
+@login_required
+@user_passes_test(lambda user: user.is_staff)
+def legacy_view(request):
+    return HttpResponse('ok')
+
+
+@roles.role_required(*roles.STAFF)
+def role_view(request):
+    return HttpResponse('ok')
+
+
+class Views:
+    # Views that do nothing: only the middleware stack and the access check are timed.
+    urlpatterns = [
+        path('legacy/', legacy_view),
+        path('role/', role_view),
+    ]
+
+
+class Command(BaseCommand):
+    help = ("Mesure le coût par requête de l'authentification (pile complète des middlewares) : "
+            "login_required et user_passes_test contre role_required avec le rôle gardé en session.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        legacy_stack = [name for name in settings.MIDDLEWARE if name != 'website.roles.RoleMiddleware']
+        scenarios = [
+            ('login_required + user_passes_test', '/legacy/', legacy_stack),
+            ('role_required + RoleMiddleware', '/role/', settings.MIDDLEWARE),
+        ]
+        with isolated_database(), override_settings(ROOT_URLCONF=Views):
+            users = seed_dataset(users=20, equipment=0, affectations=0, demandes=0, notifications=0)
+            client = Client()
+            client.force_login(users['gestionnaire'])
+            for label, url, middleware in scenarios:
+                with override_settings(MIDDLEWARE=middleware):
+                    client.get(url)
+                    with CaptureQueriesContext(connection) as queries:
+                        samples = measure(lambda: client.get(url), options['repeat'])
+                per_request = len(queries.captured_queries) / options['repeat']
+                users_read = sum('auth_user' in query['sql'] for query in queries.captured_queries) / options['repeat']
+                self.stdout.write(
+                    f"{format_summary(label, summarize(samples))}  "
+                    f"{per_request:.1f} requêtes SQL/req dont {users_read:.1f} sur auth_user"
+                )
@@ -0,0 +1,50 @@
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from website.bench import format_summary, measure, summarize
+
+MODES = [
+    ('CONN_MAX_AGE=0, connexion par requête', 0, False),
+    ('connexion persistante', None, False),
+    ('connexion persistante + health checks', None, True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le coût par requête de l'ouverture d'une connexion à la base configurée, "
+        "avec et sans connexions persistantes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        # Replays the request lifecycle Django runs around each view:
+        # request_started/request_finished call close_old_connections(), which
+        # closes the connection when CONN_MAX_AGE is 0.
+        settings_dict = connection.settings_dict
+        saved = settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS']
+
+        def request():
+            request_started.send(sender=WSGIHandler, environ={})
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+            finally:
+                request_finished.send(sender=WSGIHandler)
+
+        self.stdout.write(f'Base : {connection.vendor} ({settings_dict["NAME"]})')
+        try:
+            for label, max_age, health_checks in MODES:
+                settings_dict['CONN_MAX_AGE'] = 600 if max_age is None else max_age
+                settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+                connection.close()
+                request()
+                self.stdout.write(format_summary(label, summarize(measure(request, options['repeat']))))
+        finally:
+            settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = saved
+            connection.close()
@@ -0,0 +1,45 @@
+import csv
+import random
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from website.bench import EMPLACEMENTS, TYPES, isolated_database
+from website.imports import CHUNK_SIZE, FIELDS, import_equipment
+
+
+def write_inventory(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for i in range(rows):
+            type_ = rng.choice(list(TYPES))
+            sous_type = rng.choice(TYPES[type_])
+            writer.writerow([
+                f'CAB{i:08d}', f'{sous_type} {i}', type_, sous_type,
+                rng.randint(2005, 2025), rng.choice(EMPLACEMENTS), rng.randint(1, 20),
+            ])
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit (lignes/s) de l'import CSV d'équipements."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as inventory, isolated_database():
+            write_inventory(inventory.name, options['rows'])
+            # First pass inserts every row, second pass upserts the same codes.
+            for label in ('insertion', 'mise à jour'):
+                with open(inventory.name, encoding='utf-8', newline='') as lines:
+                    start = time.perf_counter()
+                    report = import_equipment(lines, chunk_size=options['chunk_size'])
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"{label:<12} {report.imported} lignes en {elapsed:.2f} s "
+                    f"({report.imported / elapsed:,.0f} lignes/s, {len(report.errors)} erreur(s))"
+                )
@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from website import jobs, notifications
+from website.bench import format_summary, isolated_database, measure, summarize
+from website.models import Job
+
+
+class Command(BaseCommand):
+    help = ("Compare le coût d'une notification envoyée dans la requête et mise en file, "
+            "puis mesure le débit des workers.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+
+    @override_settings(JOBS_MODE='external')
+    def handle(self, *args, **options):
+        with isolated_database():
+            User.objects.bulk_create([
+                User(username=f'gestionnaire{i}', email=f'g{i}@example.com', is_staff=True)
+                for i in range(options['recipients'])
+            ])
+            cache.clear()
+            notifications.gestionnaire_ids()
+
+            def inline():
+                with transaction.atomic():
+                    notifications.notify_gestionnaires("Nouvelle affectation")
+
+            def deferred():
+                with transaction.atomic():
+                    jobs.enqueue(notifications.notify_gestionnaires, message="Nouvelle affectation")
+
+            label = f"{options['recipients']} dest."
+            self.stdout.write(format_summary(f'notification dans la requête, {label}',
+                                             summarize(measure(inline, options['repeat']))))
+            self.stdout.write(format_summary(f'notification mise en file, {label}',
+                                             summarize(measure(deferred, options['repeat']))))
+
+            for threads in options['threads']:
+                Job.objects.all().delete()
+                for _ in range(options['repeat']):
+                    deferred()
+                start = time.perf_counter()
+                pool = jobs.WorkerPool(threads).start()
+                while Job.objects.filter(status__in=('pending', 'running')).exists():
+                    time.sleep(0.01)
+                elapsed = time.perf_counter() - start
+                pool.shutdown()
+                metrics = jobs.metrics()
+                self.stdout.write(
+                    f"vidage de {options['repeat']} tâches, {threads} worker(s): {options['repeat'] / elapsed:8.1f} tâches/s  "
+                    f"attente p50={metrics['wait_p50'] * 1000:.1f} ms p95={metrics['wait_p95'] * 1000:.1f} ms  "
+                    f"exécution p50={metrics['run_p50'] * 1000:.1f} ms  échecs={metrics['failed']}"
+                )
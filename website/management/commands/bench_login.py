@@ -0,0 +1,75 @@
+import logging
+import random
+import secrets
+import time
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from website import throttle
+from website.bench import format_summary, isolated_database, summarize
+
+# Large enough never to trigger: the login page without throttling.
+UNLIMITED = {'ip': 10 ** 9, 'compte_ip': 10 ** 9, 'compte': 10 ** 9}
+
+
+class Command(BaseCommand):
+    help = ("Simule du bourrage d'identifiants sur la page de connexion (emails existants ou non, mots de passe "
+            "faux, depuis quelques adresses) sans puis avec la limitation : latence, temps CPU par tentative, "
+            "et écart de temps entre comptes existants et inconnus.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=300)
+        parser.add_argument('--accounts', type=int, default=20)
+        parser.add_argument('--addresses', type=int, default=2, help="Adresses IP de l'attaquant.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        # Every refused attempt would log a "Too Many Requests" warning.
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        rng = random.Random(0)
+        with isolated_database():
+            password = secrets.token_urlsafe()
+            emails = [f'agent{i}@bench.local' for i in range(options['accounts'])]
+            user = User.objects.create_user('bench-agent0', emails[0], password)
+            User.objects.bulk_create([
+                User(username=f'bench-agent{i}', email=email, password=user.password)
+                for i, email in enumerate(emails[1:], start=1)
+            ])
+            attempts = [
+                (rng.choice(emails) if rng.random() < 0.5 else f'inconnu{n}@bench.local',
+                 f'10.0.0.{rng.randrange(options["addresses"])}')
+                for n in range(options['attempts'])
+            ]
+            for label, limits in (('sans limitation', UNLIMITED), ('avec limitation', None)):
+                throttle.get_cache().clear()
+                with override_settings(**({'LOGIN_THROTTLE_LIMITS': limits} if limits else {})):
+                    self.run(label, attempts)
+                    # A legitimate user from elsewhere after the attack.
+                    start = time.perf_counter()
+                    status = Client().post(reverse('login'), {'email': emails[-1], 'password': password},
+                                           REMOTE_ADDR='192.168.1.1').status_code
+                    self.stdout.write(f'  connexion légitime après l\'attaque : statut {status}, '
+                                      f'{(time.perf_counter() - start) * 1000:.0f} ms')
+
+    def run(self, label, attempts):
+        client = Client()
+        url = reverse('login')
+        samples, statuses = {'existant': [], 'inconnu': []}, Counter()
+        cpu = time.process_time()
+        for email, address in attempts:
+            start = time.perf_counter()
+            response = client.post(url, {'email': email, 'password': 'mauvais'}, REMOTE_ADDR=address)
+            samples['inconnu' if email.startswith('inconnu') else 'existant'].append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+        cpu = time.process_time() - cpu
+        every = samples['existant'] + samples['inconnu']
+        self.stdout.write(format_summary(label, summarize(every)))
+        for kind, durations in samples.items():
+            if durations:
+                self.stdout.write(format_summary(f'  email {kind}', summarize(durations)))
+        self.stdout.write(f'  CPU {cpu / len(every) * 1000:.1f} ms/tentative, statuts {dict(sorted(statuses.items()))}')
@@ -0,0 +1,57 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from website import lookup
+from website.bench import format_summary, isolated_database, measure, seed_dataset, summarize
+from website.models import Equipment
+
+
+class Command(BaseCommand):
+    help = ("Mesure la recherche d'équipements par numéro CAB (API des douchettes), "
+            "code par code et par lots, avec et sans le cache LRU du processus.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--equipment', type=int, default=20000)
+        parser.add_argument('--affectations', type=int, default=20000)
+        parser.add_argument('--batch', type=int, nargs='+', default=[10, 100, 500])
+        parser.add_argument('--repeat', type=int, default=500)
+        parser.add_argument('--hot', type=int, default=200, help='Codes scannés le plus souvent.')
+
+    def report(self, label, samples, codes_per_call):
+        stats = summarize(samples)
+        self.stdout.write(f"{format_summary(label, stats)}  {codes_per_call / stats['mean']:>10.0f} codes/s")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with isolated_database():
+            seed_dataset(equipment=options['equipment'], affectations=options['affectations'],
+                         demandes=0, notifications=0)
+            codes = list(Equipment.objects.values_list('cab_number', flat=True))
+            hot = rng.sample(codes, min(options['hot'], len(codes)))
+            repeat = options['repeat']
+
+            def scans(pool):
+                picks = iter([rng.choice(pool) for _ in range(repeat)])
+                return lambda: lookup.lookup(next(picks))
+
+            with override_settings(LOOKUP_CACHE_SIZE=0):
+                self.report('1 code, sans cache', measure(scans(codes), repeat), 1)
+            lookup.clear()
+            for code in hot:
+                lookup.lookup(code)
+            self.report(f'1 code parmi {len(hot)} fréquents, cache chaud', measure(scans(hot), repeat), 1)
+
+            for size in options['batch']:
+                rounds = max(1, repeat // size)
+                batches = iter([rng.sample(codes, size) for _ in range(rounds)])
+                with override_settings(LOOKUP_CACHE_SIZE=0):
+                    self.report(f'lot de {size} codes, sans cache',
+                                measure(lambda: lookup.lookup_many(next(batches)), rounds), size)
+                batches = [rng.sample(codes, size) for _ in range(rounds)]
+                with override_settings(LOOKUP_CACHE_SIZE=0):
+                    one_by_one = iter(batches)
+                    self.report(f'lot de {size} codes, un par un',
+                                measure(lambda: [lookup.lookup(code) for code in next(one_by_one)], rounds), size)
+            self.stdout.write(f"Cache : {lookup.stats()}")
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from website import notifications
+from website.bench import format_summary, isolated_database, measure, summarize
+from website.models import Notification
+
+
+class Command(BaseCommand):
+    help = "Mesure le coût d'envoi d'une notification à 1, 10 et 100 gestionnaires."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, nargs='+', default=[1, 10, 100])
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            for count in options['recipients']:
+                User.objects.filter(is_staff=True).delete()
+                User.objects.bulk_create([
+                    User(username=f'gestionnaire{i}', email=f'g{i}@example.com', is_staff=True) for i in range(count)
+                ])
+                cache.clear()
+                recipients = list(User.objects.filter(is_staff=True))
+
+                def legacy():
+                    # One INSERT per recipient, as the views used to do for a single one.
+                    for user in recipients:
+                        Notification.objects.create(message="Nouvelle affectation", personne=user)
+
+                def fan_out():
+                    notifications.notify_gestionnaires("Nouvelle affectation")
+
+                self.stdout.write(format_summary(
+                    f'create() par destinataire, {count} dest.', summarize(measure(legacy, options['repeat'])),
+                ))
+                self.stdout.write(format_summary(
+                    f'dispatch bulk_create, {count} dest.', summarize(measure(fan_out, options['repeat'])),
+                ))
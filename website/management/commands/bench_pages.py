@@ -0,0 +1,50 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+from website import caching
+from website.bench import isolated_database, seed_equipment
+
+
+class Command(BaseCommand):
+    help = "Mesure les requêtes par seconde de stock et gestion_equipement, sans puis avec le cache des fragments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--duration', type=float, default=5.0, help='Secondes de mesure par scénario.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with isolated_database():
+            seed_equipment(options['rows'])
+            client = Client()
+            client.force_login(User.objects.create_user('bench', 'bench@example.com', 'bench', is_staff=True))
+            pages = [
+                ('stock', reverse('stock')),
+                ('stock, type préfixe', f"{reverse('stock')}?type=Info"),
+                ('gestion_equipement', reverse('gestion_equipement')),
+            ]
+            for label, url in pages:
+                results = []
+                for enabled in (False, True):
+                    caching.get_cache().clear()
+                    with override_settings(FRAGMENT_CACHE_ENABLED=enabled):
+                        results.append(self.requests_per_second(client, url, options['duration']))
+                before, after = results
+                self.stdout.write(
+                    f'{label:<28} sans cache {before:8.1f} req/s   avec cache {after:8.1f} req/s   x{after / before:.1f}'
+                )
+            self.stdout.write(f'Compteurs : {caching.stats()}')
+
+    def requests_per_second(self, client, url, duration):
+        count = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < duration:
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+            count += 1
+        return count / elapsed
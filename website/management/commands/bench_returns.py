@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from website import jobs, ledger
+from website.bench import isolated_database, seed_dataset
+from website.models import Affectation
+from website.notifications import notify_gestionnaires
+from website.returns import return_affectations
+
+
+class Command(BaseCommand):
+    help = "Compare le retour d'affectations une par une (ancienne vue) et le retour groupé."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, nargs='+', default=[10, 100, 500])
+
+    @override_settings(JOBS_MODE='external')
+    def handle(self, *args, **options):
+        with isolated_database():
+            users = seed_dataset(users=200, equipment=2000, affectations=3 * sum(options['batch']) * 2,
+                                 demandes=0, notifications=0)
+            open_affectations = Affectation.objects.filter(date_retour__isnull=True).order_by('pk')
+            for size in options['batch']:
+                one_by_one = list(open_affectations.select_related('equipement', 'fonctionnaire')[:size])
+                start = time.perf_counter()
+                for affectation in one_by_one:
+                    # What affectation_return used to do for each submitted form.
+                    with transaction.atomic():
+                        if Affectation.objects.filter(pk=affectation.pk, date_retour__isnull=True).update(
+                            date_retour=timezone.now(),
+                        ):
+                            ledger.restock(affectation.equipement, affectation.quantity, 'retour',
+                                           auteur=users['gestionnaire'], affectation=affectation)
+                            jobs.enqueue(notify_gestionnaires, message=f"Retour d'affectation: {affectation}")
+                legacy = time.perf_counter() - start
+
+                ids = list(open_affectations.values_list('pk', flat=True)[:size])
+                start = time.perf_counter()
+                report = return_affectations(ids, auteur=users['gestionnaire'])
+                bulk = time.perf_counter() - start
+                assert len(report.returned) == size
+                self.stdout.write(
+                    f'{size:>5} retours : un par un {legacy * 1000:9.1f} ms   groupé {bulk * 1000:8.1f} ms   '
+                    f'x{legacy / bulk:.1f}'
+                )
@@ -0,0 +1,185 @@
+import json
+import time
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from website import urls
+from website.bench import isolated_database, seed_dataset, summarize
+from website.models import Affectation, DemandeEquipement, Equipment
+from website.profiling import QueryRecorder
+
+ROLES = ('admin', 'gestionnaire', 'fonctionnaire', 'anonyme')
+# The event stream never ends and logging out would end the benchmark session.
+SKIPPED = {'logout', 'notifications_stream'}
+# Bumped when results stop being comparable with older baselines: version 2
+# counts the queries that website.asyncdb.gather runs on its pool threads.
+VERSION = 2
+
+
+def route_args(users):
+    equipment = Equipment.objects.order_by('pk').first()
+    # Open affectations and pending demandes first: they render the full forms.
+    affectation = Affectation.objects.order_by(F('date_retour').asc(nulls_first=True), 'pk').first()
+    demande = DemandeEquipement.objects.order_by('etat', 'pk').first()
+    return {
+        'modify_user': [users['fonctionnaire'].pk],
+        'user_delete': [users['fonctionnaire'].pk],
+        'equipment_update': [equipment.pk],
+        'equipment_delete': [equipment.pk],
+        'equipment_scan': [equipment.cab_number],
+        'affectation_update': [affectation.pk],
+        'affectation_return': [affectation.pk],
+        'demande_equipement_approve': [demande.pk],
+    }
+
+
+def routes(args):
+    for pattern in urls.urlpatterns:
+        if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in SKIPPED:
+            yield pattern.name, reverse(pattern.name, args=args.get(pattern.name, []))
+
+
+async def drain(response):
+    # CSV exports stream asynchronously (website.exports).
+    async for _ in response.streaming_content:
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Rejoue chaque route GET de website.urls pour chaque rôle sur un jeu de données généré, "
+        "et compare le débit, la latence et le nombre de requêtes SQL à une référence JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--equipment', type=int, default=5000)
+        parser.add_argument('--affectations', type=int, default=2000)
+        parser.add_argument('--demandes', type=int, default=500)
+        parser.add_argument('--notifications', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--roles', nargs='+', choices=ROLES, default=list(ROLES))
+        parser.add_argument('--routes', nargs='+', help='Noms de routes à mesurer (toutes par défaut).')
+        parser.add_argument('--save', help='Écrit les résultats dans ce fichier JSON (référence).')
+        parser.add_argument('--compare', help='Compare aux résultats de ce fichier JSON de référence.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Hausse relative du p95 tolérée avant de signaler une régression.',
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        baseline = json.loads(Path(options['compare']).read_text()) if options['compare'] else None
+        dataset = {key: options[key] for key in ('users', 'equipment', 'affectations', 'demandes', 'notifications')}
+        with isolated_database():
+            self.stdout.write(f'Jeu de données : {dataset}')
+            users = seed_dataset(seed=options['seed'], **dataset)
+            for cache in caches.all():
+                cache.clear()
+            clients = {}
+            for role in options['roles']:
+                clients[role] = Client()
+                if role in users:
+                    clients[role].force_login(users[role])
+            selected = [
+                (name, url) for name, url in routes(route_args(users))
+                if not options['routes'] or name in options['routes']
+            ]
+            results = {}
+            for name, url in selected:
+                for role in options['roles']:
+                    result = self.measure(clients[role], url, options['repeat'])
+                    results[f'{name}:{role}'] = result
+                    self.stdout.write(self.format(f'{name} [{role}]', result))
+            vendor = connection.vendor
+
+        report = {
+            'version': VERSION,
+            'date': timezone.now().isoformat(),
+            'database': vendor,
+            'dataset': dataset,
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        if options['save']:
+            Path(options['save']).write_text(json.dumps(report, indent=2, sort_keys=True))
+            self.stdout.write(f"Référence écrite dans {options['save']}")
+        if baseline:
+            regressions = self.compare(baseline, report, options['tolerance'])
+            if regressions:
+                raise CommandError(f'{len(regressions)} régression(s) par rapport à {options["compare"]}.')
+            self.stdout.write('Aucune régression.')
+
+    def measure(self, client, url, repeat):
+        def get():
+            response = client.get(url)
+            if response.streaming and response.is_async:
+                async_to_sync(drain)(response)
+            elif response.streaming:
+                b''.join(response.streaming_content)
+            return response
+
+        get()  # Warm-up: caches, lazy indexes, first connection.
+        durations, queries = [], []
+        for _ in range(repeat):
+            # Like ProfilingMiddleware: asyncdb.gather copies this wrapper onto
+            # the connections of its pool threads, which a CaptureQueriesContext
+            # on this thread's connection would miss.
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                start = time.perf_counter()
+                response = get()
+                durations.append(time.perf_counter() - start)
+            queries.append(len(recorder.statements))
+        summary = summarize(durations)
+        return {
+            'status': response.status_code,
+            'rps': len(durations) / sum(durations),
+            'p50': summary['p50'],
+            'p95': summary['p95'],
+            'p99': summary['p99'],
+            'queries': sum(queries) / len(queries),
+        }
+
+    def format(self, label, result):
+        return (
+            f"{label:<48} {result['status']} {result['rps']:8.1f} req/s  "
+            f"p50={result['p50'] * 1000:8.2f} ms  p95={result['p95'] * 1000:8.2f} ms  "
+            f"p99={result['p99'] * 1000:8.2f} ms  sql={result['queries']:5.1f}"
+        )
+
+    def compare(self, baseline, report, tolerance):
+        if baseline.get('dataset') != report['dataset']:
+            self.stdout.write(self.style.WARNING('Jeux de données différents : comparaison indicative.'))
+        same_counting = baseline.get('version', 1) == VERSION
+        if not same_counting:
+            self.stdout.write(self.style.WARNING(
+                'Référence produite par une version antérieure : requêtes SQL non comparées, régénérez-la avec --save.'
+            ))
+        regressions = []
+        for key, result in report['results'].items():
+            before = baseline['results'].get(key)
+            if before is None:
+                continue
+            reasons = []
+            # Below a millisecond, timer noise dominates.
+            if result['p95'] > before['p95'] * (1 + tolerance) and result['p95'] - before['p95'] > 0.001:
+                reasons.append(f"p95 {before['p95'] * 1000:.2f} -> {result['p95'] * 1000:.2f} ms")
+            if same_counting and result['queries'] > before['queries']:
+                reasons.append(f"sql {before['queries']:.1f} -> {result['queries']:.1f}")
+            if result['status'] != before['status']:
+                reasons.append(f"statut {before['status']} -> {result['status']}")
+            if reasons:
+                regressions.append(key)
+                self.stdout.write(self.style.ERROR(f"Régression {key} : {', '.join(reasons)}"))
+        return regressions
@@ -0,0 +1,50 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from website.bench import EMPLACEMENTS, TYPES, format_summary, measure, summarize, synthetic_equipment
+from website.search import InvertedIndex
+
+
+class Command(BaseCommand):
+    help = "Construit l'index de recherche sur des équipements synthétiques et mesure les requêtes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=500_000)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument(
+            '--memory', action='store_true', help="Mesure la mémoire de l'index (construction bien plus lente).",
+        )
+
+    def handle(self, *args, **options):
+        count = options['items']
+        if options['memory']:
+            tracemalloc.start()
+        start = time.perf_counter()
+        index = InvertedIndex()
+        index.bulk_load(enumerate(synthetic_equipment(count), start=1))
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'Index de {len(index)} équipements, {len(index.postings)} termes : {elapsed:.1f} s')
+        if options['memory']:
+            self.stdout.write(f'Mémoire : {tracemalloc.get_traced_memory()[0] / 2**20:.0f} Mio')
+            tracemalloc.stop()
+
+        rng = random.Random(1)
+        sous_types = [sous_type for values in TYPES.values() for sous_type in values]
+        queries = {
+            'terme unique': lambda: rng.choice(sous_types).split()[0],
+            'plusieurs termes': lambda: f'{rng.choice(sous_types)} {rng.choice(EMPLACEMENTS)}',
+            'préfixe': lambda: rng.choice(sous_types)[:4],
+            'faute de frappe': lambda: _typo(rng, rng.choice(EMPLACEMENTS)),
+            'code-barres': lambda: f'CAB{rng.randrange(count):08d}',
+        }
+        for label, make_query in queries.items():
+            samples = measure(lambda: index.search(make_query()), options['repeat'])
+            self.stdout.write(format_summary(label, summarize(samples)))
+
+
+def _typo(rng, word):
+    position = rng.randrange(1, len(word))
+    return word[:position] + word[position + 1:]
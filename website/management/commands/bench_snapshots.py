@@ -0,0 +1,85 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+
+from website import snapshots
+from website.bench import format_summary, isolated_database, measure, seed_equipment, summarize
+from website.models import Equipment, StockMovement, StockSnapshot
+
+
+class Command(BaseCommand):
+    help = ("Mesure la reconstitution du stock à une date depuis l'instantané le plus proche, "
+            "contre le rejeu de tout l'historique des mouvements.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--equipment', type=int, default=20000)
+        parser.add_argument('--movements', type=int, default=500000)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--snapshot-every', type=int, default=7, help='Jours entre deux instantanés.')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        now = timezone.now()
+        start = now - timedelta(days=options['days'])
+        with isolated_database():
+            seed_equipment(options['equipment'])
+            stock = dict(Equipment.objects.values_list('pk', 'quantity'))
+            # Initial stock is one adjustment at the start; movements then
+            # alternate withdrawals and returns that never go negative.
+            movements = [StockMovement(equipement_id=pk, delta=quantity, motif='ajustement', date=start)
+                         for pk, quantity in stock.items() if quantity]
+            dates = sorted(start + timedelta(seconds=rng.uniform(1, options['days'] * 86400))
+                           for _ in range(options['movements']))
+            pks = list(stock)
+            for date in dates:
+                pk = rng.choice(pks)
+                delta = rng.choice([-1, 1]) if stock[pk] else 1
+                stock[pk] += delta
+                movements.append(StockMovement(equipement_id=pk, delta=delta, motif='affectation', date=date))
+            StockMovement.objects.bulk_create(movements, batch_size=5000)
+            Equipment.objects.bulk_update(
+                [Equipment(pk=pk, quantity=quantity) for pk, quantity in stock.items()], ['quantity'], batch_size=5000,
+            )
+            for day in range(0, options['days'] + 1, options['snapshot_every']):
+                snapshots.take_snapshot(start + timedelta(days=day))
+
+            raw = sum(snapshot.equipment_count * 20 for snapshot in StockSnapshot.objects.all())
+            stored = sum(len(s.ids) + len(s.quantities) + len(s.emplacements) for s in StockSnapshot.objects.all())
+            self.stdout.write(
+                f'{StockSnapshot.objects.count()} instantanés, {stored / 1024:.0f} Ko compressés '
+                f'pour {raw / 1024:.0f} Ko en colonnes brutes (x{raw / stored:.1f}).'
+            )
+            targets = [start + timedelta(seconds=rng.uniform(0, options['days'] * 86400))
+                       for _ in range(options['repeat'])]
+            moments = iter(targets)
+
+            def replay():
+                at = next(moments)
+                dict(StockMovement.objects.filter(date__lte=at).values('equipement_id')
+                     .annotate(total=Sum('delta')).order_by().values_list('equipement_id', 'total'))
+
+            def as_of():
+                snapshots.stock_as_of(next(moments))
+
+            self.stdout.write(format_summary('rejeu de tout l\'historique', summarize(measure(replay, len(targets)))))
+            moments = iter(targets)
+            # Decoded snapshots are cached per process, as they would be in a server.
+            snapshots.stock_as_of(targets[0])
+            self.stdout.write(format_summary('instantané le plus proche + deltas',
+                                             summarize(measure(as_of, len(targets)))))
+            emplacement = Equipment.objects.values_list('emplacement', flat=True).first()
+            moments = iter(targets)
+            self.stdout.write(format_summary(f'idem, emplacement {emplacement}', summarize(measure(
+                lambda: snapshots.stock_as_of(next(moments), emplacement), len(targets),
+            ))))
+            # Correctness: both methods agree.
+            at = targets[0]
+            expected = {pk: total for pk, total in StockMovement.objects.filter(date__lte=at)
+                        .values('equipement_id').annotate(total=Sum('delta')).order_by()
+                        .values_list('equipement_id', 'total') if total > 0}
+            got = {pk: quantity for pk, (quantity, _) in snapshots.stock_as_of(at).stock.items()}
+            self.stdout.write(f"Résultats identiques au rejeu : {'oui' if got == expected else 'NON'}")
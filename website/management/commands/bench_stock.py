@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.shortcuts import render
+from django.test import RequestFactory, override_settings
+
+from website import roles, views
+from website.bench import format_summary, isolated_database, measure, seed_equipment, summarize
+from website.models import Equipment
+
+
+def legacy_stock(request):
+    # The unpaginated icontains implementation the keyset browser replaced.
+    equipements = Equipment.objects.all()
+    for field in ('type', 'sous_type', 'emplacement'):
+        value = request.GET.get(field, '')
+        if value:
+            equipements = equipements.filter(**{f'{field}__icontains': value})
+    return render(request, 'stock.html', {'page': {'equipements': equipements}})
+
+
+def keyset_stock(request):
+    # The stock view rendered synchronously, like legacy_stock.
+    return render(request, 'stock.html', views._stock_context(request))
+
+
+class Command(BaseCommand):
+    help = "Compare la latence de la vue stock paginée (keyset) à l'ancienne implémentation."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=30)
+        parser.add_argument('--legacy-repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        # Measures the queries, not the fragment cache (see bench_pages).
+        with isolated_database(), override_settings(FRAGMENT_CACHE_ENABLED=False):
+            self.stdout.write(f"Insertion de {options['rows']} équipements...")
+            seed_equipment(options['rows'])
+            user = User.objects.create_user('bench', 'bench@example.com', 'bench', is_staff=True)
+            factory = RequestFactory()
+
+            def call(view, params):
+                request = factory.get('/stock/', params)
+                request.user = user
+                request.user_pk, request.role = user.pk, roles.GESTIONNAIRE
+                return lambda: view(request)
+
+            deep = Equipment.objects.order_by(*views.STOCK_ORDERING)[options['rows'] - views.STOCK_PAGE_SIZE * 2]
+            middle = Equipment.objects.order_by(*views.STOCK_ORDERING)[options['rows'] // 2]
+            scenarios = [
+                ('stock keyset, page 1', keyset_stock, {}),
+                ('stock keyset, page du milieu', keyset_stock, {'apres': views._encode_cursor(middle)}),
+                ('stock keyset, avant-dernière page', keyset_stock, {'apres': views._encode_cursor(deep)}),
+                ('stock keyset, type exact', keyset_stock, {'mode': 'exact', 'type': 'Réseau'}),
+                ('stock keyset, type préfixe', keyset_stock, {'type': 'Info'}),
+                ('stock keyset, emplacement exact', keyset_stock, {'mode': 'exact', 'emplacement': 'Fès'}),
+            ]
+            legacy = [
+                ('ancien stock, sans filtre', legacy_stock, {}),
+                ('ancien stock, type icontains', legacy_stock, {'type': 'Info'}),
+            ]
+            for label, view, params in scenarios:
+                self.stdout.write(format_summary(label, summarize(measure(call(view, params), options['repeat']))))
+            for label, view, params in legacy if options['legacy_repeat'] else []:
+                self.stdout.write(format_summary(label, summarize(measure(call(view, params), options['legacy_repeat']))))
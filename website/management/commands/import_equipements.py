@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from website.imports import CHUNK_SIZE, import_equipment
+
+
+class Command(BaseCommand):
+    help = "Importe (ou met à jour) des équipements depuis un fichier CSV, par lots."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--no-update', action='store_true', help="Signaler les numéros CAB existants au lieu de les mettre à jour.")
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as lines:
+            report = import_equipment(lines, chunk_size=options['chunk_size'], update_existing=not options['no_update'])
+        for line, message in report.errors:
+            self.stderr.write(f"Ligne {line}: {message}")
+        self.stdout.write(
+            f"{report.created} créé(s), {report.updated} mis à jour, {len(report.errors)} ligne(s) en erreur."
+        )
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from website import profiling
+
+
+class Command(BaseCommand):
+    help = "Résume les profils enregistrés par ProfilingMiddleware (latence, requêtes SQL, doublons)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help='Ne garder que les requêtes récentes.')
+        parser.add_argument('--view', help="Limiter le rapport à un nom de vue (ex. 'stock').")
+        parser.add_argument('--limit', type=int, default=20, help='Nombre de vues affichées.')
+
+    def handle(self, *args, **options):
+        profiles = profiling.collect(since=time.time() - options['minutes'] * 60)
+        report = profiling.summarize(profiles)
+        if options['view']:
+            report = [row for row in report if row['view'] == options['view']]
+        if not report:
+            self.stdout.write('Aucune requête enregistrée sur la période.')
+            return
+        self.stdout.write(
+            f"{'vue':<32} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'sql':>6} {'max':>5} {'répét.':>7} {'doubl.':>7} {'err':>4}"
+        )
+        for row in report[:options['limit']]:
+            self.stdout.write(
+                f"{row['view']:<32} {row['count']:>6} {row['p50'] * 1000:>9.1f} {row['p95'] * 1000:>9.1f} "
+                f"{row['p99'] * 1000:>9.1f} {row['queries']:>6.1f} {row['max_queries']:>5} "
+                f"{row['repeated']:>7.1f} {row['duplicates']:>7.1f} {row['errors']:>4}"
+            )
+        self.stdout.write('\nRequêtes SQL les plus lentes :')
+        for row in report[:options['limit']]:
+            for duration, sql in row['slowest']:
+                self.stdout.write(f"  {row['view']:<30} {duration * 1000:8.1f} ms  {' '.join(sql.split())[:160]}")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from website import summary
+
+
+class Command(BaseCommand):
+    help = "Reconstruit la synthèse du stock depuis Equipment et Affectation et signale les écarts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Signaler les écarts sans reconstruire.")
+
+    def handle(self, *args, **options):
+        drift = summary.rebuild(dry_run=options['dry_run'])
+        for key, differences in sorted(drift.items()):
+            details = ', '.join(
+                f"{counter}: {stored} → {actual}" for counter, (stored, actual) in differences.items()
+            ) or "ligne obsolète"
+            self.stdout.write(f"{' / '.join(key)}: {details}")
+        verb = "détecté(s)" if options['dry_run'] else "corrigé(s)"
+        self.stdout.write(f"{len(drift)} groupe(s) en écart {verb}.")
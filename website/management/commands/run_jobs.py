@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from website import jobs
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches différées (notifications, ...) de la file website.Job."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.JOBS_THREADS, help='Nombre de workers.')
+        parser.add_argument('--batch', type=int, default=jobs.BATCH_SIZE, help='Tâches réservées à la fois par worker.')
+        parser.add_argument('--once', action='store_true', help='Vider la file des tâches prêtes puis quitter.')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            jobs.requeue_stale()
+            done = jobs.Worker(options['batch']).drain()
+            self.stdout.write(f'{done} tâche(s) exécutée(s).')
+            return
+        pool = jobs.WorkerPool(options['threads'], options['batch']).start()
+        self.stdout.write(f"{options['threads']} worker(s) démarré(s), Ctrl-C pour arrêter.")
+        try:
+            while not pool.stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            self.stdout.write('Arrêt des workers...')
+        finally:
+            pool.shutdown()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from website import snapshots
+
+
+class Command(BaseCommand):
+    help = "Enregistre un instantané compressé du stock (à lancer chaque jour, ou pour une date passée avec --at)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--at', help="Date de l'instantané (ISO 8601), par défaut maintenant.")
+
+    def handle(self, *args, **options):
+        at = None
+        if options['at']:
+            at = parse_datetime(options['at'])
+            if at is None:
+                raise CommandError(f"Date invalide : {options['at']}")
+            if timezone.is_naive(at):
+                at = timezone.make_aware(at)
+        snapshot = snapshots.take_snapshot(at)
+        size = len(snapshot.ids) + len(snapshot.quantities) + len(snapshot.emplacements)
+        self.stdout.write(
+            f'{snapshot}: {snapshot.equipment_count} équipements, {snapshot.total_quantity} unités, '
+            f'{size / 1024:.1f} Ko compressés.'
+        )
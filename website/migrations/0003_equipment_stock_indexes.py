@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0002_affectation_quantity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['type', 'sous_type', 'id'], name='equipment_stock_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['sous_type', 'type', 'id'], name='equipment_sous_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['emplacement', 'type', 'sous_type', 'id'], name='equipment_emplacement_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('website', '0003_equipment_stock_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('motif', models.CharField(choices=[('affectation', 'Affectation'), ('modification', "Modification d'affectation"), ('retour', 'Retour'), ('demande', "Demande d'équipement")], max_length=20)),
+                ('date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('affectation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='website.affectation')),
+                ('auteur', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('equipement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mouvements', to='website.equipment')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['equipement', 'date'], name='stockmovement_equipement_idx')],
+            },
+        ),
+    ]
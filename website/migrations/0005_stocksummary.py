@@ -0,0 +1,52 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:15
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_summary(apps, schema_editor):
+    Equipment = apps.get_model('website', 'Equipment')
+    Affectation = apps.get_model('website', 'Affectation')
+    StockSummary = apps.get_model('website', 'StockSummary')
+    group = ('type', 'sous_type', 'emplacement')
+    totals = {}
+    for row in Equipment.objects.values(*group).annotate(count=Count('pk'), quantity=Sum('quantity')).order_by():
+        totals[tuple(row[field] for field in group)] = StockSummary(
+            **{field: row[field] for field in group},
+            equipment_count=row['count'], available_quantity=row['quantity'] or 0,
+        )
+    prefixed = [f'equipement__{field}' for field in group]
+    open_affectations = Affectation.objects.filter(date_retour__isnull=True)
+    for row in open_affectations.values(*prefixed).annotate(count=Count('pk'), quantity=Sum('quantity')).order_by():
+        summary = totals[tuple(row[field] for field in prefixed)]
+        summary.assigned_quantity = row['quantity'] or 0
+        summary.open_affectations = row['count']
+    StockSummary.objects.bulk_create(totals.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0004_stockmovement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=100)),
+                ('sous_type', models.CharField(max_length=100)),
+                ('emplacement', models.CharField(max_length=200)),
+                ('equipment_count', models.PositiveIntegerField(default=0)),
+                ('available_quantity', models.IntegerField(default=0)),
+                ('assigned_quantity', models.IntegerField(default=0)),
+                ('open_affectations', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='stocksummary',
+            constraint=models.UniqueConstraint(fields=('type', 'sous_type', 'emplacement'), name='stocksummary_group_unique'),
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('website', '0006_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AffectationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_affectation', models.DateTimeField()),
+                ('service', models.CharField(max_length=100)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('date_retour', models.DateTimeField()),
+                ('date_archivage', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='affectation',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='website.affectation'),
+        ),
+        migrations.AddIndex(
+            model_name='affectation',
+            index=models.Index(fields=['fonctionnaire', 'date_retour'], name='affectation_fonctionnaire_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='affectation',
+            index=models.Index(fields=['-date_affectation', '-id'], name='affectation_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='affectationarchive',
+            name='equipement',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='affectations_archivees', to='website.equipment'),
+        ),
+        migrations.AddField(
+            model_name='affectationarchive',
+            name='fonctionnaire',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='affectations_archivees', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='affectationarchive',
+            index=models.Index(fields=['-date_affectation', '-id'], name='affectationarchive_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='affectationarchive',
+            index=models.Index(fields=['fonctionnaire', 'date_affectation'], name='affectationarchive_user_idx'),
+        ),
+    ]
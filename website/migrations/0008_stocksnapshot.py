@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0007_affectation_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(unique=True)),
+                ('equipment_count', models.PositiveIntegerField()),
+                ('total_quantity', models.BigIntegerField()),
+                ('ids', models.BinaryField()),
+                ('quantities', models.BinaryField()),
+                ('emplacements', models.BinaryField()),
+                ('emplacement_names', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='motif',
+            field=models.CharField(choices=[('affectation', 'Affectation'), ('modification', "Modification d'affectation"), ('retour', 'Retour'), ('demande', "Demande d'équipement"), ('ajustement', "Ajustement d'inventaire")], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['date'], name='stockmovement_date_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('website', '0008_stocksnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='demandeequipement',
+            name='date_prise',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='demandeequipement',
+            name='traite_par',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='demandes_traitees', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='demandeequipement',
+            index=models.Index(fields=['etat', 'date_creation'], name='demande_etat_date_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def create_index(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='').values('email').annotate(n=Count('pk')).filter(n__gt=1).values_list('email', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(f"Emails used by several users, fix them before migrating: {', '.join(duplicates)}")
+    # Accounts without an email are left out of the index (partial/filtered index).
+    schema_editor.execute("CREATE UNIQUE INDEX auth_user_email_uniq ON auth_user (email) WHERE email <> ''")
+
+
+def drop_index(apps, schema_editor):
+    on_table = ' ON auth_user' if schema_editor.connection.vendor == 'microsoft' else ''
+    schema_editor.execute(f"DROP INDEX auth_user_email_uniq{on_table}")
+
+
+class Migration(migrations.Migration):
+    """Unique index on auth_user.email, which logins look users up by.
+
+    auth.User belongs to Django, so the index is created in SQL.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('website', '0009_demande_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
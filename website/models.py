@@ -12,10 +12,20 @@ class Equipment(models.Model):
     affecte = models.BooleanField(default=False)
     quantity = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the stock browser walks (type, sous_type, id)
+            models.Index(fields=['type', 'sous_type', 'id'], name='equipment_stock_order_idx'),
+            models.Index(fields=['sous_type', 'type', 'id'], name='equipment_sous_type_idx'),
+            models.Index(fields=['emplacement', 'type', 'sous_type', 'id'], name='equipment_emplacement_idx'),
+        ]
+
     def __str__(self):
         return f"{self.designation} ({self.cab_number})"
 
 class Affectation(models.Model):
+    archived = False
+
     date_affectation = models.DateTimeField(default=timezone.now)
     equipement = models.ForeignKey(Equipment, on_delete=models.CASCADE)
     fonctionnaire = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -23,9 +33,39 @@ class Affectation(models.Model):
     quantity = models.PositiveIntegerField(default=1)  # New field for quantity
     date_retour = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # mes_equipements: the open affectations of one fonctionnaire.
+            models.Index(fields=['fonctionnaire', 'date_retour'], name='affectation_fonctionnaire_idx'),
+            models.Index(fields=['-date_affectation', '-id'], name='affectation_date_idx'),
+        ]
+
     def __str__(self):
         return f"Affectation {self.equipement} à {self.fonctionnaire}"
 
+class AffectationArchive(models.Model):
+    # Closed affectations moved out of the live table by website.archive;
+    # they keep the id they had there.
+    archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    date_affectation = models.DateTimeField()
+    equipement = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='affectations_archivees')
+    fonctionnaire = models.ForeignKey(User, on_delete=models.CASCADE, related_name='affectations_archivees')
+    service = models.CharField(max_length=100)
+    quantity = models.PositiveIntegerField(default=1)
+    date_retour = models.DateTimeField()
+    date_archivage = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date_affectation', '-id'], name='affectationarchive_date_idx'),
+            models.Index(fields=['fonctionnaire', 'date_affectation'], name='affectationarchive_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Affectation archivée {self.equipement} à {self.fonctionnaire}"
+
 class DemandeEquipement(models.Model):
     ETAT_CHOICES = [
         ('En attente', 'En attente'),
@@ -40,6 +80,18 @@ class DemandeEquipement(models.Model):
     etat = models.CharField(max_length=20, choices=ETAT_CHOICES, default='En attente')
     demandeur = models.ForeignKey(User, on_delete=models.CASCADE)
     date_creation = models.DateTimeField(auto_now_add=True)
+    # Gestionnaire who took the demande from the queue (website.demandes),
+    # and when: a pending demande is theirs until DEMANDE_CLAIM_TIMEOUT.
+    traite_par = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='demandes_traitees',
+    )
+    date_prise = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The work queue: pending demandes, oldest first.
+            models.Index(fields=['etat', 'date_creation'], name='demande_etat_date_idx'),
+        ]
 
     def __str__(self):
         return f"Demande {self.id} par {self.demandeur}"
@@ -62,3 +114,99 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"Notification: {self.message}"
+
+class StockMovement(models.Model):
+    MOTIF_CHOICES = [
+        ('affectation', 'Affectation'),
+        ('modification', "Modification d'affectation"),
+        ('retour', 'Retour'),
+        ('demande', "Demande d'équipement"),
+        ('ajustement', "Ajustement d'inventaire"),
+    ]
+    equipement = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='mouvements')
+    delta = models.IntegerField()
+    motif = models.CharField(max_length=20, choices=MOTIF_CHOICES)
+    # Not a database constraint: archived affectations leave the table but
+    # keep their id, which still identifies them in AffectationArchive.
+    affectation = models.ForeignKey(
+        Affectation, null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False,
+    )
+    auteur = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['equipement', 'date'], name='stockmovement_equipement_idx'),
+            # Deltas between a stock snapshot and a point in time.
+            models.Index(fields=['date'], name='stockmovement_date_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The ledger is append-only: corrections are new movements.
+        if not self._state.adding:
+            raise ValueError("Un mouvement de stock ne peut pas être modifié.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Mouvement {self.delta:+d} sur {self.equipement_id} ({self.motif})"
+
+class StockSummary(models.Model):
+    type = models.CharField(max_length=100)
+    sous_type = models.CharField(max_length=100)
+    emplacement = models.CharField(max_length=200)
+    equipment_count = models.PositiveIntegerField(default=0)
+    available_quantity = models.IntegerField(default=0)
+    assigned_quantity = models.IntegerField(default=0)
+    open_affectations = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['type', 'sous_type', 'emplacement'], name='stocksummary_group_unique'),
+        ]
+
+    def __str__(self):
+        return f"Stock {self.type} / {self.sous_type} à {self.emplacement}"
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminée'),
+        ('failed', 'Échouée'),
+    ]
+    # Dotted path of a function decorated with website.jobs.task.
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tâche {self.id} {self.name} ({self.status})"
+
+class StockSnapshot(models.Model):
+    # Stock of every equipment at ``taken_at``, stored column by column:
+    # zlib-compressed little-endian arrays of the delta-encoded equipment ids,
+    # their quantities and their emplacement codes (indexes into
+    # ``emplacement_names``). Built and read by website.snapshots.
+    taken_at = models.DateTimeField(unique=True)
+    equipment_count = models.PositiveIntegerField()
+    total_quantity = models.BigIntegerField()
+    ids = models.BinaryField()
+    quantities = models.BinaryField()
+    emplacements = models.BinaryField()
+    emplacement_names = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"Instantané du stock au {self.taken_at:%d/%m/%Y %H:%M}"
@@ -0,0 +1,102 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+
+from . import caching, events, jobs
+from .models import Notification
+
+RECIPIENTS_KEY = 'notifications:gestionnaires'
+UNREAD_KEY = 'notifications:unread:{}'
+# Bounds the drift of counters kept in a per-process cache backend.
+UNREAD_TIMEOUT = 300
+# forget_gestionnaires only clears the list of the process that saved the
+# user: other web processes and run_jobs reload it within this delay.
+RECIPIENTS_TIMEOUT = 60
+
+
+def gestionnaire_ids():
+    ids = cache.get(RECIPIENTS_KEY)
+    if ids is None:
+        ids = list(
+            User.objects.filter(is_staff=True, is_superuser=False, is_active=True)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        cache.set(RECIPIENTS_KEY, ids, RECIPIENTS_TIMEOUT)
+    return ids
+
+
+def forget_gestionnaires():
+    cache.delete(RECIPIENTS_KEY)
+
+
+@jobs.task
+def dispatch(messages):
+    # ``messages`` is a list of (personne_id, message) pairs, written with one
+    # bulk INSERT. Events and unread counters are handled by notify().
+    notifications = Notification.objects.bulk_create([
+        Notification(personne_id=personne_id, message=message) for personne_id, message in messages
+    ])
+    caching.invalidate(caching.NOTIFICATION)
+    return notifications
+
+
+def notify(messages):
+    """Queue ``messages``, (personne_id, message) pairs, for dispatch.
+
+    The event broker and the unread counters live in the process that
+    serves the request, not necessarily the one that runs the job (another
+    web process, run_jobs): events are published and counters bumped here,
+    once the caller's transaction commits.
+    """
+    messages = [(personne_id, message) for personne_id, message in messages]
+    job = jobs.enqueue(dispatch, messages=messages)
+    added = Counter(personne_id for personne_id, _ in messages)
+
+    def bump():
+        for personne_id, delta in added.items():
+            _adjust_unread(personne_id, delta)
+    transaction.on_commit(bump)
+    events.publish_on_commit([
+        (events.USER_CHANNEL.format(personne_id), {'type': 'notification', 'message': message})
+        for personne_id, message in messages
+    ])
+    return job
+
+
+def notify_gestionnaires(message):
+    return notify((personne_id, message) for personne_id in gestionnaire_ids())
+
+
+def notify_user(user, message):
+    return notify([(user.pk, message)])
+
+
+def _adjust_unread(personne_id, delta):
+    # incr/decr are atomic in the shared cache backends, unlike get then set.
+    # A missing counter is left missing: unread_count recounts it.
+    key = UNREAD_KEY.format(personne_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        return
+    if count < 0:
+        cache.delete(key)
+
+
+def unread_count(user):
+    key = UNREAD_KEY.format(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(personne=user, read=False).count()
+        cache.set(key, count, UNREAD_TIMEOUT)
+    return count
+
+
+def mark_read(user, notification_id):
+    updated = Notification.objects.filter(pk=notification_id, personne=user, read=False).update(read=True)
+    if updated:
+        caching.invalidate(caching.NOTIFICATION)
+        transaction.on_commit(lambda: _adjust_unread(user.pk, -updated))
+    return updated
@@ -0,0 +1,256 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .stats import percentile
+
+SLOW_QUERIES_PER_REQUEST = 3
+SQL_PREVIEW = 500
+
+
+@dataclass(slots=True)
+class RequestProfile:
+    view: str
+    method: str
+    status: int
+    duration: float
+    queries: int
+    query_time: float
+    # Statements run more than once with the same SQL (N+1 patterns), and
+    # those repeated with the very same parameters too.
+    repeated: int
+    duplicates: int
+    slowest: list = field(default_factory=list)
+    time: float = 0.0
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.statements.append((time.perf_counter() - start, sql, params))
+
+    def summary(self):
+        templates = Counter(sql for _, sql, _ in self.statements)
+        exact = Counter()
+        for _, sql, params in self.statements:
+            try:
+                exact[sql, tuple(params or ())] += 1
+            except TypeError:
+                # executemany() parameter lists are not hashable.
+                pass
+        slowest = sorted(self.statements, key=lambda statement: statement[0], reverse=True)[:SLOW_QUERIES_PER_REQUEST]
+        return {
+            'queries': len(self.statements),
+            'query_time': sum(duration for duration, _, _ in self.statements),
+            'repeated': sum(count - 1 for count in templates.values()),
+            'duplicates': sum(count - 1 for count in exact.values()),
+            'slowest': [(duration, sql[:SQL_PREVIEW]) for duration, sql, _ in slowest],
+        }
+
+
+_buffer = deque(maxlen=getattr(settings, 'PROFILING_BUFFER_SIZE', 5000))
+_dumper = None
+_dumper_lock = threading.Lock()
+
+
+def records():
+    return list(_buffer)
+
+
+def clear():
+    _buffer.clear()
+
+
+def dump_path(pid=None):
+    return Path(settings.PROFILING_DIR) / f'{pid or os.getpid()}.json'
+
+
+def dump():
+    # Each process writes its buffer to its own file, replaced atomically, so
+    # the report command and other workers can read it.
+    path = dump_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps([asdict(record) for record in records()]))
+    os.replace(temporary, path)
+
+
+def prune(max_age=None):
+    """Delete the dumps of processes that stopped writing them ``max_age`` ago.
+
+    Live processes rewrite theirs every PROFILING_DUMP_INTERVAL seconds; the
+    others (restarted workers) would otherwise pile up in PROFILING_DIR.
+    """
+    if max_age is None:
+        max_age = getattr(settings, 'PROFILING_DUMP_MAX_AGE', 24 * 3600)
+    cutoff = time.time() - max_age
+    own = dump_path()
+    removed = 0
+    for path in Path(settings.PROFILING_DIR).glob('*'):
+        if path.suffix not in ('.json', '.tmp') or path == own:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _dump_periodically(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            dump()
+            prune()
+        except OSError:
+            pass
+
+
+def _start_dumper():
+    global _dumper
+    interval = getattr(settings, 'PROFILING_DUMP_INTERVAL', 30)
+    if not getattr(settings, 'PROFILING_DIR', None) or not interval:
+        return
+    with _dumper_lock:
+        if _dumper is None:
+            _dumper = threading.Thread(target=_dump_periodically, args=(interval,), daemon=True)
+            _dumper.start()
+
+
+def collect(since=None):
+    """Records of this process and the last dump of every other one."""
+    collected = records()
+    directory = getattr(settings, 'PROFILING_DIR', None)
+    if directory and Path(directory).is_dir():
+        own = dump_path()
+        for path in Path(directory).glob('*.json'):
+            if path == own:
+                continue
+            try:
+                collected.extend(RequestProfile(**record) for record in json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                continue
+    if since is not None:
+        collected = [record for record in collected if record.time >= since]
+    return collected
+
+
+def summarize(profiles):
+    """Per view statistics, hottest (most total time spent) first."""
+    by_view = defaultdict(list)
+    for profile in profiles:
+        by_view[profile.view].append(profile)
+    report = []
+    for view, entries in by_view.items():
+        durations = sorted(entry.duration for entry in entries)
+        queries = [entry.queries for entry in entries]
+        slowest = sorted(
+            (statement for entry in entries for statement in entry.slowest),
+            key=lambda statement: statement[0], reverse=True,
+        )
+        report.append({
+            'view': view,
+            'count': len(entries),
+            'total': sum(durations),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'p99': percentile(durations, 99),
+            'queries': sum(queries) / len(entries),
+            'max_queries': max(queries),
+            'query_time': sum(entry.query_time for entry in entries) / len(entries),
+            'repeated': sum(entry.repeated for entry in entries) / len(entries),
+            'duplicates': sum(entry.duplicates for entry in entries) / len(entries),
+            'errors': sum(entry.status >= 500 for entry in entries),
+            'slowest': slowest[:SLOW_QUERIES_PER_REQUEST],
+        })
+    return sorted(report, key=lambda row: row['total'], reverse=True)
+
+
+class ProfilingMiddleware:
+    """Record latency and SQL activity of every (sampled) request.
+
+    Profiles go to a bounded in-memory ring buffer, dumped periodically to
+    ``PROFILING_DIR`` for ``manage.py profiling_report``. The cost per request
+    is a timer around each statement, cheap enough to stay on in production;
+    ``PROFILING_SAMPLE_RATE`` lowers it further.
+    """
+
+    sync_capable = True
+    # A sync-only middleware would make Django run every async view through
+    # async_to_sync, in a thread of its own.
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        _start_dumper()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.record(request, response, recorder, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        # The view's queries run on the connections of the request's sync
+        # thread, not on those seen from the event loop.
+        stack = await sync_to_async(self.watch)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.record(request, response, recorder, time.perf_counter() - start)
+        return response
+
+    def watch(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def record(self, request, response, recorder, duration):
+        match = request.resolver_match
+        _buffer.append(RequestProfile(
+            view=match.view_name if match else '(non résolue)',
+            method=request.method,
+            status=response.status_code,
+            duration=duration,
+            time=time.time(),
+            **recorder.summary(),
+        ))
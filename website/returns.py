@@ -0,0 +1,100 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from . import caching, summary
+from .models import Affectation, Equipment, StockMovement
+from .notifications import notify_gestionnaires
+
+
+@dataclass
+class ReturnReport:
+    returned: list = field(default_factory=list)
+    quantity: int = 0
+    # Requested affectation ids that are unknown or already returned.
+    not_open: list = field(default_factory=list)
+    unknown_cab_numbers: list = field(default_factory=list)
+    # Scanned equipment with no open affectation (in ``service``, if given).
+    not_assigned: list = field(default_factory=list)
+
+
+def return_affectations(ids=(), cab_numbers=(), service=None, auteur=None):
+    """Close the open affectations listed by id or by scanned cab_number.
+
+    Everything happens in one transaction and in a fixed number of
+    statements: one UPDATE closes the affectations, one UPDATE per distinct
+    returned quantity restocks the equipment, one INSERT logs the movements
+    and a single notification sums the batch up. A cab_number closes every open affectation of that
+    equipment, or only those of ``service``.
+    """
+    report = ReturnReport()
+    ids = {int(pk) for pk in ids}
+    cab_numbers = {cab_number.strip() for cab_number in cab_numbers if cab_number.strip()}
+    scanned = dict(Equipment.objects.filter(cab_number__in=cab_numbers).values_list('cab_number', 'pk'))
+    report.unknown_cab_numbers = sorted(cab_numbers - set(scanned))
+    by_equipment = Q(equipement_id__in=scanned.values())
+    if service:
+        by_equipment &= Q(service=service)
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            Affectation.objects.select_for_update()
+            .filter(Q(pk__in=ids) | by_equipment, date_retour__isnull=True)
+            .order_by('pk').values_list('pk', 'equipement_id', 'quantity')
+        )
+        report.not_open = sorted(ids - {pk for pk, _, _ in rows})
+        returned_equipment = {equipment_pk for _, equipment_pk, _ in rows}
+        report.not_assigned = sorted(
+            cab_number for cab_number, pk in scanned.items() if pk not in returned_equipment
+        )
+        if not rows:
+            return report
+        Affectation.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(date_retour=now)
+
+        restocked = Counter()
+        for _, equipment_pk, quantity in rows:
+            restocked[equipment_pk] += quantity
+        # Lock in primary-key order, like approvals, so batches cannot deadlock.
+        group_of = {
+            equipment_pk: tuple(group)
+            for equipment_pk, *group in Equipment.objects.select_for_update()
+            .filter(pk__in=restocked).order_by('pk').values_list('pk', *summary.GROUP)
+        }
+        increments = defaultdict(list)
+        for equipment_pk, quantity in restocked.items():
+            increments[quantity].append(equipment_pk)
+        for quantity, equipment_pks in increments.items():
+            Equipment.objects.filter(pk__in=equipment_pks).update(quantity=F('quantity') + quantity)
+        Equipment.objects.filter(pk__in=restocked).update(affecte=Exists(
+            Affectation.objects.filter(equipement=OuterRef('pk'), date_retour__isnull=True)
+        ))
+
+        StockMovement.objects.bulk_create([
+            StockMovement(equipement_id=equipment_pk, delta=quantity, motif='retour', affectation_id=pk,
+                          auteur=auteur, date=now)
+            for pk, equipment_pk, quantity in rows
+        ])
+        groups = defaultdict(lambda: [0, 0])
+        for _, equipment_pk, quantity in rows:
+            group = groups[group_of[equipment_pk]]
+            group[0] += quantity
+            group[1] += 1
+        for key, (quantity, closed) in groups.items():
+            summary.apply_delta(key, available=quantity, assigned=-quantity, opened=-closed)
+        caching.invalidate(caching.EQUIPMENT, caching.AFFECTATION)
+
+        report.returned = [pk for pk, _, _ in rows]
+        report.quantity = sum(restocked.values())
+        if len(rows) == 1:
+            affectation = Affectation.objects.select_related('equipement', 'fonctionnaire').get(pk=rows[0][0])
+            message = (f"Retour d'affectation: {affectation.equipement} ({affectation.quantity}) "
+                       f"par {affectation.fonctionnaire}")
+        else:
+            message = (f"Retour groupé: {len(rows)} affectations, {report.quantity} unité(s) "
+                       f"sur {len(restocked)} équipement(s), enregistré par {auteur}")
+        notify_gestionnaires(message)
+    return report
@@ -0,0 +1,109 @@
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import SESSION_KEY as USER_SESSION_KEY, get_user_model
+from django.contrib.auth.views import redirect_to_login
+from django.db import transaction
+from django.utils.deprecation import MiddlewareMixin
+
+from . import caching
+
+ADMIN, GESTIONNAIRE, FONCTIONNAIRE, ANONYME = 'admin', 'gestionnaire', 'fonctionnaire', 'anonyme'
+CHOICES = [(ADMIN, 'Admin'), (GESTIONNAIRE, 'Gestionnaire'), (FONCTIONNAIRE, 'Fonctionnaire')]
+STAFF = (ADMIN, GESTIONNAIRE)
+AUTHENTICATED = (ADMIN, GESTIONNAIRE, FONCTIONNAIRE)
+
+# The session keeps (user id, role, version); the version of each user lives
+# in the shared fragment cache and changes whenever the user is saved or
+# deleted, so every process drops the cached role at once.
+SESSION_KEY = '_role'
+VERSION_KEY = 'roles:version:{}'
+
+
+def role_of(user):
+    if user is None or not user.is_authenticated:
+        return ANONYME
+    if user.is_superuser:
+        return ADMIN
+    return GESTIONNAIRE if user.is_staff else FONCTIONNAIRE
+
+
+def assign(user, role):
+    """Set the flags that make ``user`` have ``role`` (not saved)."""
+    user.is_superuser = role == ADMIN
+    user.is_staff = role in STAFF
+
+
+def _version(user_pk):
+    cache = caching.get_cache()
+    key = VERSION_KEY.format(user_pk)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.set(key, version, None)
+    return version
+
+
+def invalidate(user_pk):
+    # After commit, like fragment versions: a request running meanwhile
+    # must not cache the old role under the new version.
+    transaction.on_commit(lambda: caching.get_cache().set(VERSION_KEY.format(user_pk), time.time_ns(), None))
+
+
+def resolve(request):
+    """The (user id, role) of the request, from the session when still valid.
+
+    Only a missing or outdated entry loads the user, through the usual
+    authentication checks; a valid one costs the session read Django does
+    anyway and one lookup in the fragment cache.
+    """
+    user_pk = request.session.get(USER_SESSION_KEY)
+    if user_pk is None:
+        return None, ANONYME
+    version = _version(user_pk)
+    cached = request.session.get(SESSION_KEY)
+    if cached and cached[0] == user_pk and cached[2] == version:
+        return get_user_model()._meta.pk.to_python(user_pk), cached[1]
+    role = role_of(request.user)
+    if role == ANONYME:
+        return None, ANONYME
+    request.session[SESSION_KEY] = [user_pk, role, version]
+    return request.user.pk, role
+
+
+class RoleMiddleware(MiddlewareMixin):
+    """Set ``request.role`` and ``request.user_pk`` for every request.
+
+    Must come after SessionMiddleware and AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.user_pk, request.role = resolve(request)
+
+
+def role_required(*roles):
+    """Let only users with one of ``roles`` in; send the others to the login page.
+
+    Replaces login_required and user_passes_test, for sync and async views.
+    Without RoleMiddleware the role is resolved here, on first use.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                if not hasattr(request, 'role'):
+                    request.user_pk, request.role = await sync_to_async(resolve)(request)
+                if request.role not in roles:
+                    return redirect_to_login(request.get_full_path())
+                return await view(request, *args, **kwargs)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                if not hasattr(request, 'role'):
+                    request.user_pk, request.role = resolve(request)
+                if request.role not in roles:
+                    return redirect_to_login(request.get_full_path())
+                return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,307 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+FIELD_WEIGHTS = {'cab_number': 4, 'designation': 3, 'sous_type': 2, 'type': 1, 'emplacement': 1}
+FIELDS = tuple(FIELD_WEIGHTS)
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+MAX_EXPANSIONS = 20
+MIN_TYPO_LENGTH = 4
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def document_terms(values):
+    terms = defaultdict(int)
+    for field, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(values[field])
+        for token in set(tokens):
+            terms[token] += weight
+        if field == 'cab_number' and len(tokens) > 1:
+            # "CAB-0042" is also findable as typed without separators.
+            terms[''.join(tokens)] += weight
+    return tuple(terms.items())
+
+
+def deletions(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def typo_eligible(term):
+    return len(term) >= MIN_TYPO_LENGTH and term.isalpha()
+
+
+class InvertedIndex:
+    # term -> {weight: set(pk)}: postings grouped by field weight let a query
+    # visit the highest-impact documents first and stop once the top-k is
+    # settled. Terms found in a single document (cab numbers, serials) map
+    # straight to its pk, which halves the memory of a large index. Typo
+    # tolerance uses a symmetric-deletion map over word terms.
+
+    def __init__(self):
+        self.postings = {}
+        self.df = {}
+        self.docs = {}
+        self.vocabulary = []
+        self.typos = defaultdict(set)
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, pk, values):
+        terms = document_terms(values)
+        with self.lock:
+            self._remove(pk)
+            self.docs[pk] = terms
+            for term, weight in terms:
+                if term not in self.postings:
+                    bisect.insort(self.vocabulary, term)
+                    if typo_eligible(term):
+                        for variant in deletions(term):
+                            self.typos[variant].add(term)
+                self._post(term, weight, pk)
+
+    def bulk_load(self, rows):
+        # Faster initial build: the vocabulary is sorted once at the end.
+        with self.lock:
+            for pk, values in rows:
+                terms = document_terms(values)
+                self.docs[pk] = terms
+                for term, weight in terms:
+                    self._post(term, weight, pk)
+            self.vocabulary = sorted(self.postings)
+            for term in self.vocabulary:
+                if typo_eligible(term):
+                    for variant in deletions(term):
+                        self.typos[variant].add(term)
+
+    def _post(self, term, weight, pk):
+        postings = self.postings.get(term)
+        if postings is None:
+            self.postings[term] = pk
+            self.df[term] = 1
+            return
+        if not isinstance(postings, dict):
+            postings = self.postings[term] = {self._weight(postings, term): {postings}}
+        postings.setdefault(weight, set()).add(pk)
+        self.df[term] += 1
+
+    def _weight(self, pk, term):
+        return next(weight for indexed, weight in self.docs[pk] if indexed == term)
+
+    def buckets(self, term):
+        postings = self.postings[term]
+        if isinstance(postings, dict):
+            return postings.items()
+        return ((self._weight(postings, term), (postings,)),)
+
+    def remove(self, pk):
+        with self.lock:
+            self._remove(pk)
+
+    def _remove(self, pk):
+        for term, weight in self.docs.pop(pk, ()):
+            self.df[term] -= 1
+            postings = self.postings[term]
+            if isinstance(postings, dict):
+                postings[weight].discard(pk)
+                if not postings[weight]:
+                    del postings[weight]
+            if not self.df[term]:
+                del self.postings[term], self.df[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+                if typo_eligible(term):
+                    for variant in deletions(term):
+                        self.typos[variant].discard(term)
+                        if not self.typos[variant]:
+                            del self.typos[variant]
+
+    def idf(self, term):
+        return math.log(1 + len(self.docs) / self.df[term])
+
+    def expand(self, token):
+        # term -> factor for every indexed term a query token may stand for.
+        group = {}
+        if token in self.postings:
+            group[token] = EXACT
+        start = bisect.bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            group.setdefault(term, PREFIX)
+        if not group and typo_eligible(token):
+            candidates = set(self.typos.get(token, ()))
+            for variant in deletions(token):
+                candidates |= self.typos.get(variant, set())
+                if variant in self.postings:
+                    candidates.add(variant)
+            for term in candidates:
+                group[term] = TYPO
+        return {term: factor * self.idf(term) for term, factor in group.items()}
+
+    def _score(self, pk, group):
+        return max((group[term] * weight for term, weight in self.docs[pk] if term in group), default=0)
+
+    def _head_size(self, group):
+        # Size of the highest-impact bucket (the largest one on a tie).
+        size = max(
+            (boost * weight, len(pks)) for term, boost in group.items() for weight, pks in self.buckets(term)
+        )[1]
+        return size, sum(self.df[term] for term in group)
+
+    def search(self, query, limit=20):
+        with self.lock:
+            groups = [self.expand(token) for token in dict.fromkeys(tokenize(query))]
+            if not groups or not all(groups):
+                return []
+            # Every token must match. The scan is driven by the token whose
+            # highest-impact postings are fewest, which is where the best
+            # matches are found soonest.
+            driver = min(groups, key=self._head_size)
+            others = [group for group in groups if group is not driver]
+            others_bound = sum(
+                max(boost * weight for term, boost in group.items() for weight, _ in self.buckets(term))
+                for group in others
+            )
+            buckets = sorted(
+                ((boost * weight, pks) for term, boost in driver.items() for weight, pks in self.buckets(term)),
+                key=lambda bucket: bucket[0], reverse=True,
+            )
+            best = []
+            seen = set()
+            for impact, pks in buckets:
+                if len(best) == limit and impact + others_bound <= best[0][0] + 1e-9:
+                    break
+                for pk in pks:
+                    if pk in seen:
+                        continue
+                    seen.add(pk)
+                    score = self._score(pk, driver)
+                    for group in others:
+                        partial = self._score(pk, group)
+                        if not partial:
+                            break
+                        score += partial
+                    else:
+                        if len(best) < limit:
+                            heapq.heappush(best, (score, -pk))
+                        elif score > best[0][0]:
+                            heapq.heapreplace(best, (score, -pk))
+                        if len(best) == limit and impact + others_bound <= best[0][0] + 1e-9:
+                            break
+            return [(-pk, score) for score, pk in sorted(best, reverse=True)]
+
+
+_index = None
+_built_at = 0
+_refreshing = False
+# Changes applied while a background rebuild runs, replayed onto the new
+# index: the rebuild may have read the rows before they were committed.
+_pending = None
+_state_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def _build():
+    from .models import Equipment
+
+    index = InvertedIndex()
+    rows = Equipment.objects.values_list('pk', *FIELDS).iterator(chunk_size=5000)
+    index.bulk_load((pk, dict(zip(FIELDS, values))) for pk, *values in rows)
+    return index
+
+
+def _install(index):
+    global _index, _built_at, _pending
+    with _state_lock:
+        for method, args in _pending or ():
+            getattr(index, method)(*args)
+        _index, _built_at, _pending = index, time.monotonic(), None
+
+
+def _refresh():
+    global _refreshing, _pending
+    try:
+        _install(_build())
+    finally:
+        with _state_lock:
+            _refreshing, _pending = False, None
+        connection.close()
+
+
+def get_index():
+    # Each process keeps its own index, built on first use and kept current
+    # by model signals. Changes made by other processes are picked up by a
+    # periodic rebuild in a background thread, queries using the old index.
+    global _refreshing, _pending
+    max_age = getattr(settings, 'SEARCH_INDEX_MAX_AGE', 300)
+    with _state_lock:
+        index = _index
+        stale = index is not None and max_age is not None and time.monotonic() - _built_at > max_age
+        if stale and not _refreshing:
+            _refreshing, _pending = True, []
+            threading.Thread(target=_refresh, daemon=True).start()
+    if index is None:
+        with _build_lock:
+            if _index is None:
+                _install(_build())
+            index = _index
+    return index
+
+
+def search(query, limit=20):
+    return get_index().search(query, limit)
+
+
+def is_built():
+    return _index is not None
+
+
+def _apply(method, *args):
+    with _state_lock:
+        if _pending is not None:
+            _pending.append((method, args))
+        index = _index
+    if index is not None:
+        getattr(index, method)(*args)
+
+
+def index_equipment(equipments):
+    # Applied once the surrounding transaction commits; search results are
+    # loaded from the database, so a short lag is harmless.
+    if _index is None:
+        return
+    documents = [(equipment.pk, {field: getattr(equipment, field) for field in FIELDS}) for equipment in equipments]
+
+    def apply():
+        for pk, values in documents:
+            _apply('add', pk, values)
+    transaction.on_commit(apply)
+
+
+def unindex_equipment(pk):
+    if _index is not None:
+        transaction.on_commit(lambda: _apply('remove', pk))
+
+
+def reset():
+    global _index, _pending
+    with _state_lock:
+        _index, _pending = None, None
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import caching, notifications, roles, search, summary
+from .models import Affectation, DemandeEquipement, Equipment, Notification, StockMovement
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    notifications.forget_gestionnaires()
+    # Logging in only stamps last_login: the role stays valid.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        roles.invalidate(instance.pk)
+
+
+@receiver(pre_save, sender=Equipment)
+def remember_equipment_group(sender, instance, **kwargs):
+    instance._previous_group = None
+    instance._previous_quantity = 0
+    if instance.pk:
+        previous = Equipment.objects.filter(pk=instance.pk).values_list(*summary.GROUP, 'quantity').first()
+        if previous:
+            *group, instance._previous_quantity = previous
+            instance._previous_group = tuple(group)
+
+
+@receiver(post_save, sender=Equipment)
+def equipment_saved(sender, instance, **kwargs):
+    groups = {summary.group_of(instance)}
+    if getattr(instance, '_previous_group', None):
+        groups.add(instance._previous_group)
+    summary.refresh_groups(groups)
+    search.index_equipment([instance])
+    # Quantities typed in the equipment form are logged like any other
+    # movement, so stock snapshots can be replayed up to any date.
+    delta = instance.quantity - getattr(instance, '_previous_quantity', 0)
+    if delta:
+        StockMovement.objects.create(equipement_id=instance.pk, delta=delta, motif='ajustement')
+
+
+@receiver(post_delete, sender=Equipment)
+def equipment_deleted(sender, instance, **kwargs):
+    summary.refresh_groups([summary.group_of(instance)])
+    search.unindex_equipment(instance.pk)
+
+
+@receiver(post_delete, sender=Affectation)
+def affectation_deleted(sender, instance, **kwargs):
+    if instance.date_retour is None:
+        group = Equipment.objects.filter(pk=instance.equipement_id).values_list(*summary.GROUP).first()
+        if group:
+            summary.refresh_groups([tuple(group)])
+
+
+FRAGMENT_SOURCES = {
+    Equipment: caching.EQUIPMENT,
+    Affectation: caching.AFFECTATION,
+    DemandeEquipement: caching.DEMANDE,
+    Notification: caching.NOTIFICATION,
+}
+
+
+def fragment_source_changed(sender, **kwargs):
+    caching.invalidate(FRAGMENT_SOURCES[sender])
+
+
+for model in FRAGMENT_SOURCES:
+    post_save.connect(fragment_source_changed, sender=model, dispatch_uid=f'fragments-{model.__name__}-save')
+    post_delete.connect(fragment_source_changed, sender=model, dispatch_uid=f'fragments-{model.__name__}-delete')
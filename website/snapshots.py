@@ -0,0 +1,167 @@
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, islice
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Equipment, StockMovement, StockSnapshot
+
+COMPRESSION_LEVEL = 6
+# Bounds IN (...) lists, which SQL Server caps at 2100 parameters.
+LOOKUP_CHUNK = 2000
+# Decoded snapshots kept per process; a snapshot never changes once written.
+CACHE_SIZE = 4
+
+
+class NoSnapshot(Exception):
+    pass
+
+
+def _pack(values, typecode):
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return zlib.compress(data.tobytes(), COMPRESSION_LEVEL)
+
+
+def _unpack(blob, typecode):
+    data = array(typecode)
+    data.frombytes(zlib.decompress(blob))
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+def take_snapshot(at=None):
+    """Store the stock of every equipment as it was at ``at`` (default: now).
+
+    The quantities are read from Equipment minus the movements logged after
+    ``at``, in one statement, so a snapshot of the past is as cheap as one of
+    the present and never races with concurrent movements.
+    """
+    at = at or timezone.now()
+    later = Coalesce(Sum('mouvements__delta', filter=Q(mouvements__date__gt=at)), 0)
+    rows = (
+        Equipment.objects.annotate(stock=F('quantity') - later)
+        .filter(stock__gt=0).order_by('pk').values_list('pk', 'stock', 'emplacement')
+    )
+    ids, quantities, codes, names = [], [], [], {}
+    for pk, quantity, emplacement in rows.iterator(chunk_size=LOOKUP_CHUNK):
+        ids.append(pk)
+        quantities.append(quantity)
+        codes.append(names.setdefault(emplacement, len(names)))
+    # Sorted ids become small gaps, which is what makes them compress.
+    gaps = [b - a for a, b in zip([0] + ids, ids)]
+    with transaction.atomic():
+        StockSnapshot.objects.filter(taken_at=at).delete()
+        return StockSnapshot.objects.create(
+            taken_at=at,
+            equipment_count=len(ids),
+            total_quantity=sum(quantities),
+            ids=_pack(gaps, 'q'),
+            quantities=_pack(quantities, 'q'),
+            emplacements=_pack(codes, 'i'),
+            emplacement_names=list(names),
+        )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _columns(snapshot_pk):
+    snapshot = StockSnapshot.objects.get(pk=snapshot_pk)
+    return (
+        array('q', accumulate(_unpack(snapshot.ids, 'q'))),
+        _unpack(snapshot.quantities, 'q'),
+        _unpack(snapshot.emplacements, 'i'),
+        snapshot.emplacement_names,
+    )
+
+
+def _contains(ids, pk):
+    index = bisect_left(ids, pk)
+    return index < len(ids) and ids[index] == pk
+
+
+def nearest_snapshot(at):
+    """The snapshot closest to ``at``, before or after it, without its columns."""
+    light = StockSnapshot.objects.only('pk', 'taken_at', 'equipment_count', 'total_quantity')
+    candidates = [
+        light.filter(taken_at__lte=at).order_by('-taken_at').first(),
+        light.filter(taken_at__gt=at).order_by('taken_at').first(),
+    ]
+    candidates = [snapshot for snapshot in candidates if snapshot is not None]
+    if not candidates:
+        raise NoSnapshot("Aucun instantané du stock n'a encore été pris.")
+    return min(candidates, key=lambda snapshot: abs(snapshot.taken_at - at))
+
+
+@dataclass
+class StockAsOf:
+    at: object
+    snapshot: StockSnapshot
+    # equipment id -> (quantity, emplacement)
+    stock: dict
+    deltas: int
+
+    def totals_by_emplacement(self):
+        totals = {}
+        for quantity, emplacement in self.stock.values():
+            totals[emplacement] = totals.get(emplacement, 0) + quantity
+        return dict(sorted(totals.items()))
+
+
+def stock_as_of(at, emplacement=None):
+    """Reconstruct the stock at ``at``, optionally for one emplacement only.
+
+    The nearest snapshot is loaded and the movements logged between its date
+    and ``at`` are added (or, for a later snapshot, subtracted), so the cost
+    follows the number of those movements, not the length of the history.
+    Emplacements are those of the snapshot; equipment it does not list takes
+    its current one.
+    """
+    snapshot = nearest_snapshot(at)
+    ids, quantities, codes, names = _columns(snapshot.pk)
+    wanted = None
+    if emplacement is not None:
+        wanted = names.index(emplacement) if emplacement in names else -1
+    stock = {
+        pk: (quantity, names[code])
+        for pk, quantity, code in zip(ids, quantities, codes)
+        if wanted is None or code == wanted
+    }
+    if snapshot.taken_at <= at:
+        window, sign = (snapshot.taken_at, at), 1
+    else:
+        window, sign = (at, snapshot.taken_at), -1
+    deltas = dict(
+        StockMovement.objects.filter(date__gt=window[0], date__lte=window[1])
+        .values('equipement_id').annotate(total=Sum('delta')).order_by()
+        .values_list('equipement_id', 'total')
+    )
+    missing = [pk for pk in deltas if pk not in stock]
+    if emplacement is not None:
+        # Equipment the snapshot places elsewhere stays out of the result.
+        missing = [pk for pk in missing if not _contains(ids, pk)]
+    current = {}
+    iterator = iter(missing)
+    while chunk := list(islice(iterator, LOOKUP_CHUNK)):
+        current.update(Equipment.objects.filter(pk__in=chunk).values_list('pk', 'emplacement'))
+    for pk, delta in deltas.items():
+        if pk in stock:
+            quantity, place = stock[pk]
+        elif pk in current and (emplacement is None or current[pk] == emplacement):
+            quantity, place = 0, current[pk]
+        else:
+            continue
+        quantity += sign * delta
+        if quantity > 0:
+            stock[pk] = (quantity, place)
+        else:
+            stock.pop(pk, None)
+    return StockAsOf(at=at, snapshot=snapshot, stock=stock, deltas=len(deltas))
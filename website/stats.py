@@ -0,0 +1,4 @@
+def percentile(ordered, pct):
+    """Nearest-rank percentile of a sorted, non-empty sequence."""
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import Affectation, Equipment, StockSummary
+
+GROUP = ('type', 'sous_type', 'emplacement')
+COUNTERS = ('equipment_count', 'available_quantity', 'assigned_quantity', 'open_affectations')
+
+
+def group_of(equipment):
+    return tuple(getattr(equipment, field) for field in GROUP)
+
+
+def _matching(keys):
+    match = Q(pk__in=[])
+    for key in keys:
+        match |= Q(**dict(zip(GROUP, key)))
+    return match
+
+
+def apply_delta(key, available=0, assigned=0, opened=0):
+    # Incremental maintenance from the stock movement paths: one UPDATE per
+    # group, in the caller's transaction.
+    updated = StockSummary.objects.filter(**dict(zip(GROUP, key))).update(
+        available_quantity=F('available_quantity') + available,
+        assigned_quantity=F('assigned_quantity') + assigned,
+        open_affectations=F('open_affectations') + opened,
+    )
+    if not updated:
+        refresh_groups([key])
+
+
+def compute(keys=None):
+    equipment = Equipment.objects.all()
+    affectations = Affectation.objects.filter(date_retour__isnull=True)
+    if keys is not None:
+        equipment = equipment.filter(_matching(keys))
+        affectations = affectations.filter(equipement__in=equipment)
+    totals = {}
+    for row in equipment.values(*GROUP).annotate(count=Count('pk'), quantity=Sum('quantity')).order_by():
+        totals[tuple(row[field] for field in GROUP)] = {
+            'equipment_count': row['count'], 'available_quantity': row['quantity'] or 0,
+            'assigned_quantity': 0, 'open_affectations': 0,
+        }
+    prefixed = [f'equipement__{field}' for field in GROUP]
+    for row in affectations.values(*prefixed).annotate(count=Count('pk'), quantity=Sum('quantity')).order_by():
+        group = totals[tuple(row[field] for field in prefixed)]
+        group['assigned_quantity'] = row['quantity'] or 0
+        group['open_affectations'] = row['count']
+    return totals
+
+
+def refresh_groups(keys):
+    keys = set(keys)
+    if not keys:
+        return
+    totals = compute(keys)
+    with transaction.atomic():
+        stored = {
+            group_of(summary): summary
+            for summary in StockSummary.objects.select_for_update().filter(_matching(keys))
+        }
+        for key, summary in stored.items():
+            for counter, value in totals.get(key, {}).items():
+                setattr(summary, counter, value)
+        StockSummary.objects.bulk_update([summary for key, summary in stored.items() if key in totals], COUNTERS)
+        StockSummary.objects.filter(pk__in=[summary.pk for key, summary in stored.items() if key not in totals]).delete()
+        StockSummary.objects.bulk_create(
+            [StockSummary(**dict(zip(GROUP, key)), **counters) for key, counters in totals.items() if key not in stored],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild(dry_run=False):
+    # Recomputes every group from Equipment and Affectation and returns the
+    # drift found in the materialized table as {group: {counter: (stored, actual)}}.
+    totals = compute()
+    with transaction.atomic():
+        stored = {
+            group_of(summary): summary
+            for summary in StockSummary.objects.select_for_update()
+        }
+        drift = {}
+        for key in stored.keys() | totals.keys():
+            summary = stored.get(key)
+            actual = totals.get(key, dict.fromkeys(COUNTERS, 0))
+            differences = {
+                counter: (getattr(summary, counter) if summary else 0, actual[counter])
+                for counter in COUNTERS
+                if (getattr(summary, counter) if summary else 0) != actual[counter]
+            }
+            if differences or (summary is None) != (key not in totals):
+                drift[key] = differences
+        if dry_run:
+            return drift
+        StockSummary.objects.all().delete()
+        StockSummary.objects.bulk_create([
+            StockSummary(**dict(zip(GROUP, key)), **counters) for key, counters in totals.items()
+        ])
+    return drift
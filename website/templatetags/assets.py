@@ -0,0 +1,19 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from .. import assets
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(name):
+    """Include a bundle of website.assets.BUNDLES, or its sources one by one.
+
+    Usage::
+
+        {% bundle 'css/site.bundle.css' %}
+    """
+    tag = '<link rel="stylesheet" href="{}">' if name.endswith('.css') else '<script src="{}" defer></script>'
+    return format_html_join('\n', tag, ((static(source),) for source in assets.sources(name)))
@@ -0,0 +1,48 @@
+from django import template
+
+from .. import caching, roles
+
+register = template.Library()
+
+
+class RoleCacheNode(template.Node):
+    def __init__(self, nodelist, name, namespaces, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.namespaces = namespaces
+        self.vary_on = vary_on
+
+    def render(self, context):
+        if not caching.enabled():
+            return self.nodelist.render(context)
+        vary_on = [expression.resolve(context) for expression in self.vary_on]
+        return caching.fragment(
+            self.name, context.get('role') or roles.role_of(context.get('user')), self.namespaces, vary_on,
+            lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag
+def rolecache(parser, token):
+    """Cache a fragment per role until one of the models it shows changes.
+
+    Usage::
+
+        {% rolecache "name" depends="equipment,affectation" request.GET.urlencode %}
+            ...
+        {% endrolecache %}
+
+    Extra arguments are resolved and become part of the key, like the
+    ``vary_on`` arguments of ``{% cache %}``.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' requires a fragment name.")
+    nodelist = parser.parse(('endrolecache',))
+    parser.delete_first_token()
+    name = bits[1].strip('"\'')
+    namespaces = ()
+    rest = bits[2:]
+    if rest and rest[0].startswith('depends='):
+        namespaces = tuple(filter(None, rest.pop(0)[len('depends='):].strip('"\'').split(',')))
+    return RoleCacheNode(nodelist, name, namespaces, [parser.compile_filter(bit) for bit in rest])
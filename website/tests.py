@@ -1,3 +1,1711 @@
-from django.test import TestCase
+import asyncio
+import dataclasses
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete
+from django.core.management import call_command
+from django.db import IntegrityError, close_old_connections, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import archive, asyncdb, caching, demandes, events, jobs, ledger, lookup, notifications, profiling, roles, search, snapshots, summary, throttle, views
+from .approvals import approve_demandes
+from .bench import seed_dataset
+from .imports import import_equipment
+from .returns import return_affectations
+from .models import (
+    Equipment, Affectation, AffectationArchive, DemandeEquipement, DemandeIntervention, Job, Notification, StockMovement, StockSummary,
+)
+
+
+@jobs.task(max_attempts=2)
+def failing_job(message):
+    raise RuntimeError(message)
+
+
+async def read_stream(response):
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+async def asgi_get(url, cookies, send, query_string=b''):
+    """Serve one GET through the ASGI handler, as an ASGI server would.
+
+    The client disconnects right after sending its request; unlike the
+    test clients, the response goes through Django's ASGI send path.
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': url, 'raw_path': url.encode(), 'query_string': query_string, 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookies.output(header='', sep=';').strip().encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}, {'type': 'http.disconnect'}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+
+    # As in the test clients: the request signals would close the test database connection.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        await ASGIHandler()(scope, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+
+class QueryBudgetMixin:
+    """Assert that a page costs the same number of queries whatever its size.
+
+    Subclasses call ``assertConstantQueries`` with a ``seed(n)`` callable that
+    adds ``n`` more rows shown by the page; the query count is compared across
+    ``sizes`` so a template that starts following relations per row fails.
+    """
+    sizes = (1, 5, 20)
+
+    def count_queries(self, url):
+        # Warm-up request: cached per-user state (unread counter, ...) is
+        # filled once and must not be mistaken for per-row queries.
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, seed):
+        counts = []
+        seeded = 0
+        for size in self.sizes:
+            seed(size - seeded)
+            seeded = size
+            counts.append(self.count_queries(url))
+        self.assertEqual(len(set(counts)), 1, f"{url}: query count grows with rows {dict(zip(self.sizes, counts))}")
+
+
+@override_settings(FRAGMENT_CACHE_ENABLED=False)
+class ListViewQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create_user('gestionnaire', 'gestionnaire@example.com', 'secret', is_staff=True)
+        cls.fonctionnaire = User.objects.create_user('fonctionnaire', 'fonctionnaire@example.com', 'secret')
+
+    def setUp(self):
+        cache.clear()
+        self.counter = 0
+
+    def make_equipment(self):
+        self.counter += 1
+        return Equipment.objects.create(
+            cab_number=f'CAB{self.counter}', designation=f'Poste {self.counter}', type='Informatique',
+            sous_type='Ordinateur', year=2020, emplacement='Rabat', quantity=5,
+        )
+
+    def make_user(self):
+        self.counter += 1
+        return User.objects.create(username=f'user{self.counter}', email=f'user{self.counter}@example.com')
+
+    def seed_affectations(self, n, fonctionnaire=None):
+        for _ in range(n):
+            Affectation.objects.create(
+                equipement=self.make_equipment(), fonctionnaire=fonctionnaire or self.make_user(), service='DSI',
+            )
+
+    def seed_demandes(self, n):
+        for _ in range(n):
+            demandeur = self.make_user()
+            demande = DemandeEquipement.objects.create(
+                objet='Poste', quantity=1, motif='Remplacement', service='DSI', demandeur=demandeur,
+            )
+            demande.equipements.add(self.make_equipment(), self.make_equipment())
+            DemandeIntervention.objects.create(service='DSI', poste='P1', description='Panne', demandeur=demandeur)
+            Notification.objects.create(message='Nouvelle demande', personne=self.gestionnaire)
+
+    def test_gestion_affectation(self):
+        self.client.force_login(self.gestionnaire)
+        self.assertConstantQueries(reverse('gestion_affectation'), self.seed_affectations)
+
+    def test_notifications(self):
+        self.client.force_login(self.gestionnaire)
+        self.assertConstantQueries(reverse('notifications'), self.seed_demandes)
+
+    def test_mes_equipements(self):
+        self.client.force_login(self.fonctionnaire)
+        self.assertConstantQueries(
+            reverse('mes_equipements'), lambda n: self.seed_affectations(n, fonctionnaire=self.fonctionnaire),
+        )
+
+    def test_stock(self):
+        self.client.force_login(self.gestionnaire)
+        self.assertConstantQueries(reverse('stock'), lambda n: [self.make_equipment() for _ in range(n)])
+
+    def test_form_pages_do_not_embed_every_choice(self):
+        self.client.force_login(self.gestionnaire)
+        self.assertConstantQueries(
+            reverse('affectation_create'), lambda n: [(self.make_equipment(), self.make_user()) for _ in range(n)],
+        )
+        self.client.force_login(self.fonctionnaire)
+        self.assertConstantQueries(
+            reverse('demande_equipement_create'), lambda n: [self.make_equipment() for _ in range(n)],
+        )
+
+
+@override_settings(FRAGMENT_CACHE_ENABLED=False)
+class StockPaginationTests(TestCase):
+    page_size = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create_user('gestionnaire', 'gestionnaire@example.com', 'secret', is_staff=True)
+        # Several rows share their (type, sous_type): only the id breaks the ties.
+        kinds = [('Informatique', 'Écran')] * 4 + [('Informatique', 'Clavier')] * 3 + [('Réseau', 'Switch')] * 4
+        Equipment.objects.bulk_create([
+            Equipment(cab_number=f'CAB-{i}', designation=f'Poste {i}', type=type_, sous_type=sous_type,
+                      year=2020, emplacement='Rabat' if i % 2 else 'Fès', quantity=1)
+            for i, (type_, sous_type) in enumerate(kinds)
+        ])
+
+    def ordered(self, equipements):
+        return list(equipements.order_by(*views.STOCK_ORDERING).values_list('pk', flat=True))
+
+    def paginate(self, equipements, after=None, before=None):
+        rows, next_cursor, previous_cursor = views.paginate_stock(
+            equipements, after=views._decode_cursor(after) if after else None,
+            before=views._decode_cursor(before) if before else None, page_size=self.page_size,
+        )
+        return [row.pk for row in rows], next_cursor, previous_cursor
+
+    def walk(self, equipements):
+        pages, next_cursor = [], None
+        while True:
+            rows, next_cursor, previous_cursor = self.paginate(equipements, after=next_cursor)
+            self.assertEqual(previous_cursor is None, not pages)
+            pages.append(rows)
+            if next_cursor is None:
+                return pages
+
+    def test_forward_and_backward_walks_cover_every_row_once(self):
+        equipements = Equipment.objects.all()
+        pages = self.walk(equipements)
+        self.assertEqual(sum(pages, []), self.ordered(equipements))
+        self.assertEqual([len(rows) for rows in pages], [3, 3, 3, 2])
+
+        # From the last page back to the first, through the previous cursors.
+        _, _, previous_cursor = self.paginate(equipements, after=views._encode_cursor(
+            Equipment.objects.get(pk=pages[-2][-1]),
+        ))
+        backward = [pages[-1]]
+        while previous_cursor:
+            rows, next_cursor, previous_cursor = self.paginate(equipements, before=previous_cursor)
+            self.assertIsNotNone(next_cursor)
+            backward.insert(0, rows)
+        self.assertEqual(backward, pages)
+
+    def test_filters_apply_to_every_page(self):
+        params = {'type': 'Informatique', 'mode': 'exact', 'emplacement': 'Rab'}
+        equipements, mode, filters, _ = views._filter_stock(params)
+        self.assertEqual((mode, filters['emplacement']), ('exact', 'Rab'))
+        self.assertEqual(self.ordered(equipements), [])
+
+        equipements, mode, _, _ = views._filter_stock({'type': 'Info', 'mode': 'inconnu'})
+        self.assertEqual(mode, 'prefixe')
+        pages = self.walk(equipements)
+        self.assertEqual(sum(pages, []), self.ordered(Equipment.objects.filter(type='Informatique')))
+        self.assertEqual(len(pages), 3)
+
+    def test_page_links_keep_the_filters(self):
+        Equipment.objects.bulk_create([
+            Equipment(cab_number=f'MOB-{i}', designation=f'Chaise {i}', type='Mobilier', sous_type='Chaise',
+                      year=2020, emplacement='Fès' if i % 3 else 'Rabat', quantity=1)
+            for i in range(views.STOCK_PAGE_SIZE * 2)
+        ])
+        expected = self.ordered(Equipment.objects.filter(type='Mobilier', emplacement='Fès'))
+        self.client.force_login(self.gestionnaire)
+        response = self.client.get(reverse('stock'), {'type': 'Mob', 'emplacement': 'Fès'})
+        first = [row.pk for row in response.context['page']['equipements']]
+        self.assertIsNone(response.context['page']['previous_url'])
+        self.assertEqual(first, expected[:views.STOCK_PAGE_SIZE])
+
+        page = self.client.get(reverse('stock') + response.context['page']['next_url']).context['page']
+        self.assertEqual([row.pk for row in page['equipements']], expected[views.STOCK_PAGE_SIZE:])
+        self.assertIsNone(page['next_url'])
+        self.assertIn('type=Mob', page['previous_url'])
+        page = self.client.get(reverse('stock') + page['previous_url']).context['page']
+        self.assertEqual([row.pk for row in page['equipements']], first)
+
+    def test_bad_cursors_fall_back_to_the_first_page(self):
+        self.client.force_login(self.gestionnaire)
+        first = self.client.get(reverse('stock')).context['page']['equipements']
+        cursor = views._encode_cursor(Equipment.objects.order_by('pk').first())
+        for value in [
+            'abc', cursor[:-1], cursor + 'x', cursor.replace(':', '.', 1),
+            signing.dumps(['Informatique', 'Écran', 1], salt='autre'),
+            signing.dumps(['Informatique', 'Écran'], salt='stock'),
+        ]:
+            for key in ('apres', 'avant'):
+                with self.subTest(key=key, value=value):
+                    response = self.client.get(reverse('stock'), {key: value})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.context['page']['equipements'], first)
+
+
+class StockLedgerConcurrencyTests(TransactionTestCase):
+    assigners = 50
+    stock = 30
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("shared-cache in-memory SQLite fails concurrent writers instead of making them wait")
+
+    def test_concurrent_withdrawals_lose_no_update(self):
+        equipment = Equipment.objects.create(
+            cab_number='CAB-STRESS', designation='Portable', type='Informatique', sous_type='Ordinateur',
+            year=2022, emplacement='Rabat', quantity=self.stock,
+        )
+        barrier = threading.Barrier(self.assigners)
+        outcomes = []
+
+        def assign():
+            try:
+                barrier.wait()
+                ledger.withdraw(Equipment(pk=equipment.pk), 1, 'affectation')
+                outcomes.append('ok')
+            except ledger.InsufficientStock:
+                outcomes.append('refused')
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=assign) for _ in range(self.assigners)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        equipment.refresh_from_db()
+        self.assertEqual(outcomes.count('ok'), self.stock)
+        self.assertEqual(outcomes.count('refused'), self.assigners - self.stock)
+        self.assertEqual(equipment.quantity, 0)
+        movements = StockMovement.objects.filter(equipement=equipment).exclude(motif='ajustement')
+        self.assertEqual(movements.count(), self.stock)
+        self.assertEqual(sum(movements.values_list('delta', flat=True)), -self.stock)
+
+
+class BulkApprovalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='gestionnaire@example.com', is_staff=True)
+        cls.demandeur = User.objects.create(username='demandeur', email='demandeur@example.com')
+
+    def make_demandes(self, equipment, count, quantity=1):
+        demandes = []
+        for i in range(count):
+            demande = DemandeEquipement.objects.create(
+                objet=f'Demande {i}', quantity=quantity, motif='Besoin', service='DSI', demandeur=self.demandeur,
+            )
+            demande.equipements.add(equipment)
+            demandes.append(demande)
+        return demandes
+
+    def make_equipment(self, cab_number, quantity):
+        return Equipment.objects.create(
+            cab_number=cab_number, designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=quantity,
+        )
+
+    def test_oldest_demandes_are_served_and_shortfalls_reported(self):
+        equipment = self.make_equipment('CAB-1', 5)
+        first, second, third = self.make_demandes(equipment, 3, quantity=2)
+
+        report = approve_demandes([first.pk, second.pk, third.pk], auteur=self.gestionnaire)
+
+        equipment.refresh_from_db()
+        self.assertEqual(equipment.quantity, 1)
+        self.assertEqual(len(report.affectations), 2)
+        self.assertEqual([(line.demande.pk, line.available) for line in report.unsatisfied], [(third.pk, 1)])
+        self.assertEqual(StockMovement.objects.filter(equipement=equipment, motif='demande').count(), 2)
+        self.assertFalse(DemandeEquipement.objects.filter(etat='En attente').exists())
+        self.assertEqual(approve_demandes([first.pk], auteur=self.gestionnaire).approved, [])
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        counts = []
+        for size in (1, 10, 40):
+            equipment = self.make_equipment(f'CAB-{size}', size)
+            demandes = self.make_demandes(equipment, size)
+            with CaptureQueriesContext(connection) as context:
+                approve_demandes([demande.pk for demande in demandes], auteur=self.gestionnaire)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(len(set(counts)), 1, counts)
+
+
+class DemandeQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = User.objects.create(username='gestionnaire1', email='g1@example.com', is_staff=True)
+        cls.second = User.objects.create(username='gestionnaire2', email='g2@example.com', is_staff=True)
+        cls.demandeur = User.objects.create(username='demandeur', email='demandeur@example.com')
+        cls.equipment = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=10,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.demandes = []
+        for i in range(5):
+            demande = DemandeEquipement.objects.create(
+                objet=f'Demande {i}', quantity=1, motif='Besoin', service='DSI', demandeur=self.demandeur,
+            )
+            demande.equipements.add(self.equipment)
+            self.demandes.append(demande)
+
+    def test_claims_are_disjoint_oldest_first_and_lapse(self):
+        mine = demandes.claim_next(self.first, 2)
+        theirs = demandes.claim_next(self.second, 10)
+        self.assertEqual([d.pk for d in mine], [d.pk for d in self.demandes[:2]])
+        self.assertEqual([d.pk for d in theirs], [d.pk for d in self.demandes[2:]])
+        self.assertEqual(demandes.claim_next(self.first, 10), [])
+        self.assertFalse(demandes.claim(self.first, self.demandes[2].pk))
+
+        later = timezone.now() + timedelta(seconds=settings.DEMANDE_CLAIM_TIMEOUT + 1)
+        self.assertEqual(len(demandes.claim_next(self.first, 10, now=later)), 5)
+        self.assertEqual(demandes.release(self.first, [self.demandes[0].pk]), 1)
+        self.assertEqual(list(demandes.queue(self.first, now=later)), self.demandes[1:])
+
+    def test_transitions_are_enforced_by_the_approve_view(self):
+        demande = self.demandes[0]
+        url = reverse('demande_equipement_approve', args=[demande.pk])
+        self.client.force_login(self.first)
+        self.assertEqual(self.client.post(url, {'etat': 'Annulée'}).status_code, 400)
+
+        demandes.claim(self.second, demande.pk)
+        response = self.client.post(url, {'etat': 'Refusée'})
+        self.assertContains(response, 'prise en charge par', status_code=400)
+        demande.refresh_from_db()
+        self.assertEqual(demande.etat, 'En attente')
+
+        demandes.release(self.second)
+        self.assertRedirects(self.client.post(url, {'etat': 'Validée'}), reverse('demande_queue'))
+        demande.refresh_from_db()
+        self.assertEqual((demande.etat, demande.traite_par), ('Validée', self.first))
+        # A decision is final: refusing now would release stock already assigned.
+        self.assertEqual(self.client.post(url, {'etat': 'Refusée'}).status_code, 400)
+        self.assertEqual(demande.equipements.count(), 1)
+
+        refused = self.demandes[1]
+        demandes.claim(self.first, refused.pk)
+        self.client.post(reverse('demande_equipement_approve', args=[refused.pk]), {'etat': 'Refusée'})
+        refused.refresh_from_db()
+        self.assertEqual((refused.etat, refused.equipements.count()), ('Refusée', 0))
+
+        other = self.demandes[2]
+        demandes.claim(self.first, other.pk)
+        self.client.post(reverse('demande_equipement_approve', args=[other.pk]), {'etat': 'En attente'})
+        other.refresh_from_db()
+        self.assertIsNone(other.traite_par)
+
+    def test_bulk_approval_skips_demandes_held_by_others(self):
+        demandes.claim_next(self.second, 1)
+        report = approve_demandes([d.pk for d in self.demandes[:2]], auteur=self.first)
+        self.assertEqual(report.held, [self.demandes[0].pk])
+        self.assertEqual([d.pk for d in report.approved], [self.demandes[1].pk])
+
+    def test_queue_page_claims_and_releases(self):
+        self.client.force_login(self.first)
+        self.client.post(reverse('demande_queue'), {'action': 'prendre', 'nombre': '3'})
+        response = self.client.get(reverse('demande_queue'))
+        self.assertEqual(list(response.context['demandes']), self.demandes[:3])
+        self.client.post(reverse('demande_queue'), {'action': 'liberer'})
+        self.assertFalse(DemandeEquipement.objects.filter(traite_par__isnull=False).exists())
+
+
+class DemandeClaimConcurrencyTests(TransactionTestCase):
+    gestionnaires = 8
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("shared-cache in-memory SQLite fails concurrent writers instead of making them wait")
+
+    def test_concurrent_claims_never_overlap(self):
+        users = [User.objects.create(username=f'g{i}', is_staff=True) for i in range(self.gestionnaires)]
+        demandeur = User.objects.create(username='demandeur')
+        DemandeEquipement.objects.bulk_create([
+            DemandeEquipement(objet=f'D{i}', quantity=1, motif='Besoin', service='DSI', demandeur=demandeur)
+            for i in range(30)
+        ])
+        barrier = threading.Barrier(self.gestionnaires)
+        claimed, errors = [], []
+
+        def work(user):
+            try:
+                barrier.wait()
+                claimed.extend(d.pk for d in demandes.claim_next(user, 5))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=work, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(claimed)
+        self.assertEqual(len(claimed), len(set(claimed)))
+        self.assertEqual(len(claimed), DemandeEquipement.objects.filter(traite_par__isnull=False).count())
+
+
+class NotificationDispatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaires = [
+            User.objects.create(username=f'gestionnaire{i}', email=f'g{i}@example.com', is_staff=True) for i in range(3)
+        ]
+        User.objects.create(username='admin', email='admin@example.com', is_staff=True, is_superuser=True)
+        User.objects.create(username='fonctionnaire', email='f@example.com')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fan_out_reaches_every_gestionnaire_in_one_insert(self):
+        notifications.gestionnaire_ids()
+        with self.assertNumQueries(1):
+            job = notifications.notify_gestionnaires("Nouvelle affectation")
+        with self.assertNumQueries(1):
+            notifications.dispatch(job.payload['messages'])
+        self.assertEqual(
+            sorted(Notification.objects.values_list('personne_id', flat=True)),
+            [user.pk for user in self.gestionnaires],
+        )
+
+    def test_recipient_list_of_other_processes_expires(self):
+        self.assertEqual(len(notifications.gestionnaire_ids()), 3)
+        # Saved in another process: this one's cached list is not forgotten.
+        with mock.patch.object(notifications, 'forget_gestionnaires'):
+            User.objects.create(username='nouveau', email='n@example.com', is_staff=True)
+        self.assertEqual(len(notifications.gestionnaire_ids()), 3)
+        with mock.patch('django.core.cache.backends.locmem.time.time',
+                        return_value=time.time() + notifications.RECIPIENTS_TIMEOUT + 1):
+            self.assertEqual(len(notifications.gestionnaire_ids()), 4)
+
+    def test_unread_counter_follows_inserts_and_mark_read(self):
+        user = self.gestionnaires[0]
+        self.assertEqual(notifications.unread_count(user), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.notify_gestionnaires("Retour d'affectation")
+            notifications.notify_user(user, "Demande validée")
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(user), 2)
+        notification = Notification.objects.filter(personne=user).first()
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notifications'), {'notification_id': notification.pk})
+            self.client.post(reverse('notifications'), {'notification_id': notification.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(user), 1)
+
+    def test_unread_counter_only_moves_once_committed(self):
+        user = self.gestionnaires[0]
+        self.assertEqual(notifications.unread_count(user), 0)
+        with self.captureOnCommitCallbacks() as callbacks:
+            notifications.notify_user(user, "Demande validée")
+        self.assertEqual(notifications.unread_count(user), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                notifications.notify_user(user, "Annulée")
+                transaction.set_rollback(True)
+        self.assertEqual(notifications.unread_count(user), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(notifications.unread_count(user), 1)
+
+        # A missing counter is recounted from the table, not bumped from zero.
+        cache.delete(notifications.UNREAD_KEY.format(user.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.notify_user(user, "Demande refusée")
+        self.assertIsNone(cache.get(notifications.UNREAD_KEY.format(user.pk)))
+        self.assertEqual(notifications.unread_count(user), 2)
+
+
+@override_settings(JOBS_MODE='external')
+class JobQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+        cls.equipment = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=3,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_views_enqueue_notifications_for_the_workers(self):
+        self.client.force_login(self.gestionnaire)
+        response = self.client.post(reverse('affectation_create'), {
+            'equipement': self.equipment.pk, 'fonctionnaire': self.fonctionnaire.pk, 'service': 'DSI', 'quantity': 1,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Notification.objects.exists())
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.status), ('website.notifications.dispatch', 'pending'))
+
+        self.assertEqual(jobs.Worker().drain(), 1)
+        self.assertEqual(list(Notification.objects.values_list('personne_id', flat=True)), [self.gestionnaire.pk])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('done', 1))
+        self.assertEqual(jobs.metrics()['done'], 1)
+
+    def test_eager_mode_runs_the_job_once_committed(self):
+        self.client.force_login(self.gestionnaire)
+        with self.settings(JOBS_MODE='eager'), self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('affectation_return', args=[Affectation.objects.create(
+                equipement=self.equipment, fonctionnaire=self.fonctionnaire, service='DSI', quantity=1,
+            ).pk]))
+        self.assertEqual(Job.objects.get().status, 'done')
+        self.assertTrue(Notification.objects.filter(personne=self.gestionnaire).exists())
+
+    def test_failures_back_off_then_give_up(self):
+        job = jobs.enqueue(failing_job, message='SMTP indisponible')
+        self.assertEqual(jobs.Worker().drain(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertGreater(job.run_after, job.started_at)
+        self.assertIn('SMTP indisponible', job.last_error)
+        # Not runnable again before its backoff delay.
+        self.assertEqual(jobs.claim(), [])
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.started_at)
+        jobs.Worker().drain()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertEqual(jobs.metrics()['failed_recently'], 1)
+
+    def test_a_job_is_claimed_once_and_stale_ones_are_requeued(self):
+        job = jobs.enqueue(failing_job, message='x')
+        self.assertEqual(jobs.claim(), [job])
+        self.assertEqual(jobs.claim(), [])
+        Job.objects.filter(pk=job.pk).update(started_at=job.created_at - timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(jobs.claim(), [job])
+
+        # That was its last attempt: interrupted again, it fails.
+        Job.objects.filter(pk=job.pk).update(started_at=job.created_at - timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ('failed', 2, ''))
+        self.assertEqual(jobs.claim(), [])
+
+    def test_a_late_worker_does_not_overwrite_the_new_claim(self):
+        jobs.enqueue(notifications.dispatch, messages=[[self.gestionnaire.pk, 'x']])
+        [late] = jobs.claim()
+        Job.objects.filter(pk=late.pk).update(started_at=late.created_at - timedelta(hours=1))
+        jobs.requeue_stale()
+        [current] = jobs.claim()
+        self.assertTrue(jobs.execute(late))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.locked_by), ('running', current.locked_by))
+        self.assertTrue(jobs.execute(current))
+        self.assertEqual(Job.objects.get().status, 'done')
+
+
+class NotificationStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+
+    async def test_stream_requires_gestionnaire(self):
+        response = await self.async_client.get(reverse('notifications_stream'))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_stream_pushes_published_notifications(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(reverse('notifications_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        try:
+            events.get_broker().publish(
+                events.USER_CHANNEL.format(self.user.pk), {'type': 'notification', 'id': 1, 'message': 'Retour'},
+            )
+            chunk = await asyncio.wait_for(anext(stream), timeout=1)
+        finally:
+            await stream.aclose()
+        self.assertTrue(chunk.startswith(b'event: notification\n'))
+
+    @override_settings(EVENT_STREAM_MAX_AGE=0.3)
+    async def test_stream_of_a_disconnected_client_ends_and_unsubscribes(self):
+        await sync_to_async(self.client.force_login)(self.user)
+        sent = []
+
+        async def send(message):
+            # Like an ASGI server writing to a closed socket: nothing happens.
+            sent.append(message['type'])
+
+        broker = events.get_broker()
+        task = asyncio.create_task(asgi_get(reverse('notifications_stream'), self.client.cookies, send))
+        for _ in range(100):
+            if broker.subscriber_count():
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(broker.subscriber_count(), 1)
+        await asyncio.wait_for(task, timeout=2)
+        self.assertEqual(broker.subscriber_count(), 0)
+        self.assertEqual(sent[0], 'http.response.start')
+
+    @override_settings(JOBS_MODE='external')
+    async def test_notifications_run_by_run_jobs_reach_the_requesting_process(self):
+        subscription = events.get_broker().subscribe(events.USER_CHANNEL.format(self.user.pk))
+        self.addCleanup(subscription.close)
+        # run_jobs is another process, with a broker of its own.
+        worker_broker = events.InProcessBroker()
+        spy = worker_broker.subscribe(events.USER_CHANNEL.format(self.user.pk))
+
+        def request_then_worker():
+            equipment = Equipment.objects.create(
+                cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+                year=2021, emplacement='Rabat', quantity=3,
+            )
+            fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+            self.client.force_login(self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('affectation_create'), {
+                    'equipement': equipment.pk, 'fonctionnaire': fonctionnaire.pk, 'service': 'DSI', 'quantity': 1,
+                })
+            with mock.patch.object(events, 'get_broker', return_value=worker_broker):
+                call_command('run_jobs', '--once', stdout=io.StringIO())
+
+        await sync_to_async(request_then_worker)()
+        event = await asyncio.wait_for(subscription.get(), timeout=1)
+        self.assertEqual(event['type'], 'notification')
+        self.assertTrue(event['message'].startswith('Nouvelle affectation'))
+        self.assertTrue(await Notification.objects.filter(personne=self.user).aexists())
+        self.assertTrue(spy.queue.empty())
+        self.assertEqual(await sync_to_async(notifications.unread_count)(self.user), 1)
+
+    async def test_broker_drops_subscribers_on_exit(self):
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe('a', 'b')
+        self.assertEqual(broker.subscriber_count(), 1)
+        await sync_to_async(broker.publish)('b', {'type': 'demande'})
+        self.assertEqual(await asyncio.wait_for(subscription.get(), timeout=1), {'type': 'demande'})
+        subscription.close()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fatima', email='fatima@example.com')
+        cls.ecran = Equipment.objects.create(
+            cab_number='CAB-1', designation='Moniteur 24', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=4,
+        )
+        cls.epuise = Equipment.objects.create(
+            cab_number='CAB-2', designation='Moniteur 27', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=0,
+        )
+
+    async def results(self, url_name, term):
+        response = await self.async_client.get(reverse(url_name), {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return [result['id'] for result in response.json()['results']]
+
+    async def test_endpoints_return_available_prefix_matches(self):
+        await sync_to_async(self.async_client.force_login)(self.gestionnaire)
+        self.assertEqual(await self.results('equipment_autocomplete', 'moni'), [self.ecran.pk])
+        self.assertEqual(await self.results('equipment_autocomplete', 'cab-1'), [self.ecran.pk])
+        self.assertEqual(await self.results('fonctionnaire_autocomplete', 'fat'), [self.fonctionnaire.pk])
+        self.assertEqual(await self.results('fonctionnaire_autocomplete', 'gest'), [])
+
+    async def test_fonctionnaire_list_is_reserved_to_gestionnaires(self):
+        response = await self.async_client.get(reverse('equipment_autocomplete'))
+        self.assertEqual(response.status_code, 403)
+        await sync_to_async(self.async_client.force_login)(self.fonctionnaire)
+        response = await self.async_client.get(reverse('fonctionnaire_autocomplete'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_form_renders_and_validates_only_submitted_choices(self):
+        self.client.force_login(self.gestionnaire)
+        response = self.client.post(reverse('affectation_create'), {
+            'equipement': self.epuise.pk, 'fonctionnaire': self.fonctionnaire.pk, 'service': 'DSI', 'quantity': 1,
+        })
+        self.assertIn('equipement', response.context['form'].errors)
+        self.assertContains(response, 'data-autocomplete-url="%s"' % reverse('equipment_autocomplete'))
+        self.assertContains(response, f'<option value="{self.fonctionnaire.pk}" selected>fatima</option>', html=True)
+        self.assertNotContains(response, 'Moniteur 24')
+        self.client.post(reverse('affectation_create'), {
+            'equipement': self.ecran.pk, 'fonctionnaire': self.fonctionnaire.pk, 'service': 'DSI', 'quantity': 1,
+        })
+        self.assertTrue(Affectation.objects.filter(equipement=self.ecran).exists())
+
+    def test_non_numeric_key_is_a_validation_error(self):
+        self.client.force_login(self.gestionnaire)
+        response = self.client.post(reverse('affectation_create'), {
+            'equipement': 'abc', 'fonctionnaire': self.fonctionnaire.pk, 'service': 'DSI', 'quantity': 1,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('equipement', response.context['form'].errors)
+        self.assertFalse(Affectation.objects.exists())
+
+
+class AffectationArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+        cls.equipment = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=3,
+        )
+        now = timezone.now()
+
+        def affectation(days, returned_days=None):
+            return Affectation.objects.create(
+                equipement=cls.equipment, fonctionnaire=cls.fonctionnaire, service='DSI',
+                date_affectation=now - timedelta(days=days),
+                date_retour=None if returned_days is None else now - timedelta(days=returned_days),
+            )
+        cls.old = [affectation(800, 700), affectation(600, 500)]
+        cls.recent = affectation(30, 10)
+        cls.open = affectation(900)
+        StockMovement.objects.create(equipement=cls.equipment, delta=1, motif='retour', affectation=cls.old[0])
+
+    def test_only_long_returned_affectations_move_and_keep_their_id(self):
+        self.assertEqual(archive.archive_affectations(days=365, batch_size=1), 2)
+        self.assertEqual(archive.archive_affectations(days=365), 0)
+        self.assertEqual(
+            sorted(Affectation.objects.values_list('pk', flat=True)), sorted([self.recent.pk, self.open.pk]),
+        )
+        self.assertEqual(
+            sorted(AffectationArchive.objects.values_list('pk', flat=True)), sorted(a.pk for a in self.old),
+        )
+        self.assertEqual(StockMovement.objects.get(motif='retour').affectation_id, self.old[0].pk)
+
+    def test_history_views_read_live_and_archived_rows(self):
+        archive.archive_affectations(days=365)
+        self.client.force_login(self.gestionnaire)
+        response = self.client.get(reverse('gestion_affectation'))
+        self.assertEqual([a.pk for a in response.context['affectations']], [self.recent.pk, self.open.pk])
+
+        response = self.client.get(reverse('gestion_affectation'), {'archives': '1'})
+        self.assertEqual(
+            [(a.pk, a.archived) for a in response.context['affectations']],
+            [(self.recent.pk, False), (self.old[1].pk, True), (self.old[0].pk, True), (self.open.pk, False)],
+        )
+        self.assertContains(response, 'Archivée', count=2)
+
+        self.async_client.force_login(self.gestionnaire)
+
+        async def export():
+            return await read_stream(await self.async_client.get(reverse('affectation_export')))
+        lines = async_to_sync(export)().decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_archiving_sends_no_delete_signal(self):
+        # Pins archive_affectations' use of the private QuerySet._raw_delete.
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+        post_delete.connect(receiver, sender=Affectation)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Affectation)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(archive.archive_affectations(days=365, batch_size=1), 2)
+        self.assertEqual(deleted, [])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_history_pages_merge_both_tables(self):
+        # Equal dates across the tables: only the id breaks the ties.
+        date = timezone.now() - timedelta(days=400)
+        for _ in range(3):
+            Affectation.objects.create(
+                equipement=self.equipment, fonctionnaire=self.fonctionnaire, service='DSI',
+                date_affectation=date, date_retour=date + timedelta(days=1),
+            )
+            Affectation.objects.create(
+                equipement=self.equipment, fonctionnaire=self.fonctionnaire, service='DSI', date_affectation=date,
+            )
+        archive.archive_affectations(days=365)
+        live = Affectation.objects.all()
+        archived = AffectationArchive.objects.all()
+        expected = sorted(
+            [(a.date_affectation, a.pk) for a in [*live, *archived]], reverse=True,
+        )
+
+        def page(after=None, before=None):
+            return archive.paginate_history(
+                *archive.seek_history(live, archived, after=after, before=before, page_size=3),
+                after=after, before=before, page_size=3,
+            )
+
+        pages, after = [], None
+        while True:
+            rows, has_next, has_previous = page(after=after)
+            self.assertEqual(has_previous, bool(pages))
+            pages.append([(row.date_affectation, row.pk) for row in rows])
+            if not has_next:
+                break
+            after = pages[-1][-1]
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(rows) for rows in pages], [3, 3, 3, 1])
+
+        backward, has_previous = [pages[-1]], True
+        while has_previous:
+            rows, has_next, has_previous = page(before=backward[0][0])
+            self.assertTrue(has_next)
+            backward.insert(0, [(row.date_affectation, row.pk) for row in rows])
+        self.assertEqual(backward, pages)
+
+    def test_history_view_links_pages_and_ignores_bad_cursors(self):
+        archive.archive_affectations(days=365)
+        date = timezone.now() - timedelta(days=1000)
+        AffectationArchive.objects.bulk_create([
+            AffectationArchive(id=10_000 + i, equipement=self.equipment, fonctionnaire=self.fonctionnaire,
+                               service='DSI', date_affectation=date, date_retour=date)
+            for i in range(archive.HISTORY_PAGE_SIZE)
+        ])
+        expected = [self.recent.pk, self.old[1].pk, self.old[0].pk, self.open.pk]
+        expected += sorted(range(10_000, 10_000 + archive.HISTORY_PAGE_SIZE), reverse=True)
+        self.client.force_login(self.gestionnaire)
+        response = self.client.get(reverse('gestion_affectation'), {'archives': '1'})
+        first = [a.pk for a in response.context['affectations']]
+        self.assertEqual(first, expected[:archive.HISTORY_PAGE_SIZE])
+        self.assertIsNone(response.context['previous_url'])
+
+        response = self.client.get(reverse('gestion_affectation') + response.context['next_url'])
+        self.assertEqual([a.pk for a in response.context['affectations']], expected[archive.HISTORY_PAGE_SIZE:])
+        self.assertIsNone(response.context['next_url'])
+        self.assertContains(response, 'Précédent')
+        response = self.client.get(reverse('gestion_affectation') + response.context['previous_url'])
+        self.assertEqual([a.pk for a in response.context['affectations']], first)
+
+        for value in ['abc', signing.dumps(['hier', 1], salt='affectations'),
+                      signing.dumps([timezone.now().isoformat(), 'x'], salt='affectations')]:
+            with self.subTest(value=value):
+                response = self.client.get(reverse('gestion_affectation'), {'archives': '1', 'apres': value})
+                self.assertEqual([a.pk for a in response.context['affectations']], first)
+
+
+class StreamingExportMemoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.equipment = Equipment.objects.create(
+            cab_number='CAB-EXPORT', designation='Portable', type='Informatique', sous_type='Ordinateur',
+            year=2022, emplacement='Rabat', quantity=1,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.gestionnaire)
+        self.async_client.force_login(self.gestionnaire)
+
+    def seed(self, count):
+        Affectation.objects.bulk_create([
+            Affectation(equipement=self.equipment, fonctionnaire=self.gestionnaire, service=f'Service {i}')
+            for i in range(count)
+        ])
+
+    async def peak_memory(self, url):
+        # Through the ASGI handler, which is how the export is served: it is
+        # where a sync iterator would be buffered whole.
+        lines = 0
+
+        async def send(message):
+            nonlocal lines
+            lines += message.get('body', b'').count(b'\n')
+
+        tracemalloc.start()
+        try:
+            await asgi_get(url, self.client.cookies, send)
+            return lines, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    @mock.patch('website.exports.CHUNK_SIZE', 100)
+    async def test_peak_memory_stays_flat_as_rows_grow(self):
+        url = reverse('affectation_export')
+        await sync_to_async(self.seed)(1_000)
+        small_lines, small_peak = await self.peak_memory(url)
+        await sync_to_async(self.seed)(9_000)
+        large_lines, large_peak = await self.peak_memory(url)
+        self.assertEqual((small_lines, large_lines), (1_001, 10_001))
+        # Ten times the rows must not mean ten times the memory.
+        self.assertLess(large_peak, small_peak * 1.5)
+
+    def peak_memory_wsgi(self, url):
+        # The test Client goes through the WSGI request path, as runserver
+        # and WSGI_APPLICATION do.
+        tracemalloc.start()
+        try:
+            response = self.client.get(url)
+            self.assertFalse(response.is_async)
+            lines = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+            return lines, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    @mock.patch('website.exports.CHUNK_SIZE', 100)
+    def test_peak_memory_stays_flat_as_rows_grow_under_wsgi(self):
+        url = reverse('affectation_export')
+        self.seed(1_000)
+        small_lines, small_peak = self.peak_memory_wsgi(url)
+        self.seed(9_000)
+        large_lines, large_peak = self.peak_memory_wsgi(url)
+        self.assertEqual((small_lines, large_lines), (1_001, 10_001))
+        self.assertLess(large_peak, small_peak * 1.5)
+
+    async def test_stock_export_honours_stock_filters(self):
+        await Equipment.objects.acreate(
+            cab_number='CAB-OTHER', designation='Chaise', type='Mobilier', sous_type='Chaise',
+            year=2019, emplacement='Fès', quantity=4,
+        )
+        response = await self.async_client.get(reverse('stock_export'), {'type': 'Mob'})
+        content = (await read_stream(response)).decode('utf-8-sig').splitlines()
+        self.assertEqual(content[1:], ['CAB-OTHER,Chaise,Mobilier,Chaise,2019,Fès,4,Non'])
+
+
+class EquipmentImportTests(TestCase):
+    def test_import_upserts_and_reports_row_errors(self):
+        Equipment.objects.create(
+            cab_number='CAB-1', designation='Ancien', type='Informatique', sous_type='Écran',
+            year=2015, emplacement='Rabat', quantity=1,
+        )
+        lines = io.StringIO(
+            'cab_number,designation,type,sous_type,year,emplacement,quantity\n'
+            'CAB-1,Écran 24,Informatique,Écran,2021,Fès,3\n'
+            'CAB-2,Chaise,Mobilier,Chaise,2020,Rabat,10\n'
+            'CAB-3,Bureau,Mobilier,Bureau,pas une année,Rabat,1\n'
+            'CAB-2,Chaise bis,Mobilier,Chaise,2020,Rabat,2\n'
+            'CAB-4,Switch,Réseau,Switch,2022,Tanger,1\n'
+        )
+        report = import_equipment(lines, chunk_size=2)
+
+        self.assertEqual((report.created, report.updated), (2, 1))
+        self.assertEqual([line for line, _ in report.errors], [4, 5])
+        updated = Equipment.objects.get(cab_number='CAB-1')
+        self.assertEqual((updated.designation, updated.emplacement, updated.quantity), ('Écran 24', 'Fès', 3))
+        self.assertEqual(Equipment.objects.get(cab_number='CAB-2').designation, 'Chaise')
+
+    def test_stock_export_can_be_imported_back(self):
+        lines = io.StringIO(
+            'Numéro CAB,Désignation,Type,Sous-type,Année,Emplacement,Quantité,Affecté\n'
+            'CAB-9,Casque,Téléphonie,Casque,2023,Oujda,5,Non\n'
+        )
+        report = import_equipment(lines, update_existing=False)
+        self.assertEqual((report.created, report.errors), (1, []))
+
+    def import_racing(self, update_existing):
+        Equipment.objects.create(
+            cab_number='CAB-2', designation='Concurrent', type='Mobilier', sous_type='Chaise',
+            year=2019, emplacement='Rabat', quantity=4,
+        )
+        looked_up = []
+
+        def stale_lookup(execute, sql, params, many, context):
+            # The first lookup misses CAB-2, as if another import had created
+            # it right after.
+            if not looked_up and '"cab_number" IN' in sql:
+                looked_up.append(sql)
+                params = [None if param == 'CAB-2' else param for param in params]
+            return execute(sql, params, many, context)
+
+        lines = io.StringIO(
+            'cab_number,designation,type,sous_type,year,emplacement,quantity\n'
+            'CAB-1,Écran 24,Informatique,Écran,2021,Fès,3\n'
+            'CAB-2,Chaise,Mobilier,Chaise,2020,Rabat,10\n'
+        )
+        with connection.execute_wrapper(stale_lookup):
+            return import_equipment(lines, update_existing=update_existing)
+
+    def test_row_created_concurrently_is_updated_not_fatal(self):
+        report = self.import_racing(update_existing=True)
+        self.assertEqual((report.created, report.updated, report.errors), (1, 1, []))
+        equipment = Equipment.objects.get(cab_number='CAB-2')
+        self.assertEqual((equipment.designation, equipment.quantity), ('Chaise', 10))
+        self.assertEqual(list(equipment.mouvements.order_by('pk').values_list('delta', flat=True)), [4, 6])
+
+    def test_row_created_concurrently_is_reported(self):
+        report = self.import_racing(update_existing=False)
+        self.assertEqual((report.created, report.updated), (1, 0))
+        self.assertEqual(report.errors, [(3, "cab_number: cet équipement existe déjà.")])
+        self.assertEqual(Equipment.objects.get(cab_number='CAB-2').designation, 'Concurrent')
+
+
+class StockSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.gestionnaire)
+
+    def make_equipment(self, cab_number, quantity, **fields):
+        values = {'type': 'Informatique', 'sous_type': 'Écran', 'emplacement': 'Rabat', **fields}
+        return Equipment.objects.create(cab_number=cab_number, designation='Écran', year=2021, quantity=quantity, **values)
+
+    def test_summary_follows_stock_movements_without_drift(self):
+        screen = self.make_equipment('CAB-1', 10)
+        chair = self.make_equipment('CAB-2', 4, type='Mobilier', sous_type='Chaise')
+        self.client.post(reverse('affectation_create'), {
+            'equipement': screen.pk, 'fonctionnaire': self.fonctionnaire.pk, 'service': 'DSI', 'quantity': 3,
+        })
+        demande = DemandeEquipement.objects.create(
+            objet='Chaises', quantity=2, motif='Arrivée', service='RH', demandeur=self.fonctionnaire,
+        )
+        demande.equipements.add(chair)
+        approve_demandes([demande.pk], auteur=self.gestionnaire)
+        self.client.post(reverse('affectation_return', args=[Affectation.objects.get(equipement=screen).pk]))
+        chair.refresh_from_db()
+        chair.emplacement = 'Fès'
+        chair.save()
+        import_equipment(io.StringIO(
+            'cab_number,designation,type,sous_type,year,emplacement,quantity\n'
+            'CAB-3,Écran,Informatique,Écran,2022,Rabat,5\n'
+        ))
+
+        rabat = StockSummary.objects.get(type='Informatique', sous_type='Écran', emplacement='Rabat')
+        self.assertEqual(
+            (rabat.equipment_count, rabat.available_quantity, rabat.assigned_quantity, rabat.open_affectations),
+            (2, 15, 0, 0),
+        )
+        fes = StockSummary.objects.get(emplacement='Fès')
+        self.assertEqual((fes.available_quantity, fes.assigned_quantity, fes.open_affectations), (2, 2, 1))
+        self.assertFalse(StockSummary.objects.filter(type='Mobilier', emplacement='Rabat').exists())
+        self.assertEqual(summary.rebuild(dry_run=True), {})
+
+    def test_rebuild_reports_and_fixes_drift(self):
+        self.make_equipment('CAB-1', 10)
+        StockSummary.objects.update(available_quantity=7)
+        self.assertEqual(summary.rebuild(), {('Informatique', 'Écran', 'Rabat'): {'available_quantity': (7, 10)}})
+        self.assertEqual(summary.rebuild(), {})
+
+
+@override_settings(JOBS_MODE='external')
+class BulkReturnTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+
+    def setUp(self):
+        cache.clear()
+
+    def make_affectations(self, cab_number, count, service='DSI'):
+        equipment = Equipment.objects.create(
+            cab_number=cab_number, designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=2 * count,
+        )
+        for _ in range(count):
+            ledger.withdraw(equipment, 2, 'affectation', affectation=Affectation.objects.create(
+                equipement=equipment, fonctionnaire=self.fonctionnaire, service=service, quantity=2,
+            ))
+        return equipment, list(Affectation.objects.filter(equipement=equipment).order_by('pk'))
+
+    def test_returns_by_id_and_cab_number_in_constant_statements(self):
+        counts = []
+        for size in (1, 10, 40):
+            Job.objects.all().delete()
+            by_id, affectations = self.make_affectations(f'ID-{size}', size)
+            scanned, _ = self.make_affectations(f'SCAN-{size}', size)
+            with CaptureQueriesContext(connection) as context:
+                report = return_affectations(
+                    [a.pk for a in affectations], [scanned.cab_number, 'INCONNU'], auteur=self.gestionnaire,
+                )
+            counts.append(len(context.captured_queries))
+            self.assertEqual((len(report.returned), report.quantity), (2 * size, 4 * size))
+            self.assertEqual(report.unknown_cab_numbers, ['INCONNU'])
+            self.assertEqual(Job.objects.count(), 1)
+            for equipment in (by_id, scanned):
+                equipment.refresh_from_db()
+                self.assertEqual((equipment.quantity, equipment.affecte), (2 * size, False))
+        # A single return also loads its labels for the detailed notification.
+        self.assertEqual(len(set(counts[1:])), 1, counts)
+        self.assertFalse(Affectation.objects.filter(date_retour__isnull=True).exists())
+        self.assertEqual(StockMovement.objects.filter(motif='retour').count(), 2 * (1 + 10 + 40))
+        self.assertEqual(summary.rebuild(dry_run=True), {})
+        self.assertEqual(return_affectations([affectations[0].pk]).not_open, [affectations[0].pk])
+
+    def test_form_and_json_api(self):
+        equipment, affectations = self.make_affectations('CAB-1', 2)
+        other, _ = self.make_affectations('CAB-2', 1, service='RH')
+        self.client.force_login(self.gestionnaire)
+        response = self.client.post(reverse('affectation_bulk_return'), {
+            'affectations': [affectations[0].pk], 'cab_numbers': 'CAB-2\nCAB-9', 'service': 'DSI',
+        })
+        report = response.context['report']
+        self.assertEqual((report.returned, report.not_assigned), ([affectations[0].pk], ['CAB-2']))
+        self.assertEqual(report.unknown_cab_numbers, ['CAB-9'])
+
+        response = self.client.post(
+            reverse('affectation_bulk_return'), {'cab_numbers': ['CAB-1', 'CAB-2']}, content_type='application/json',
+        )
+        self.assertEqual(response.json()['quantity'], 4)
+        self.assertEqual(
+            self.client.post(reverse('affectation_bulk_return'), 'x', content_type='application/json').status_code, 400,
+        )
+
+
+class ScannerLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+        cls.equipment = [
+            Equipment.objects.create(
+                cab_number=f'CAB-{n}', designation='Écran', type='Informatique', sous_type='Écran',
+                year=2021, emplacement='Rabat', quantity=5,
+            )
+            for n in range(3)
+        ]
+        for service in ('DSI', 'RH'):
+            Affectation.objects.create(
+                equipement=cls.equipment[0], fonctionnaire=cls.fonctionnaire, service=service, quantity=1,
+            )
+        Affectation.objects.create(
+            equipement=cls.equipment[1], fonctionnaire=cls.fonctionnaire, service='DSI', date_retour=timezone.now(),
+        )
+
+    def setUp(self):
+        lookup.clear()
+
+    def test_bulk_lookup_is_one_query_then_cached_until_a_change(self):
+        with self.assertNumQueries(1):
+            items = lookup.lookup_many(['CAB-1', ' CAB-0', 'INCONNU', 'CAB-1'])
+        self.assertEqual(list(items), ['CAB-1', 'CAB-0', 'INCONNU'])
+        self.assertIsNone(items['INCONNU'])
+        self.assertEqual(items['CAB-1']['affectations'], [])
+        self.assertEqual([a['service'] for a in items['CAB-0']['affectations']], ['DSI', 'RH'])
+        self.assertEqual(items['CAB-0']['affectations'][0]['fonctionnaire']['username'], 'fonctionnaire')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(lookup.lookup('CAB-0'), items['CAB-0'])
+        self.assertEqual(lookup.stats()['hits'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return_affectations(cab_numbers=['CAB-0'], auteur=self.gestionnaire)
+        with self.assertNumQueries(1):
+            self.assertEqual(lookup.lookup('CAB-0')['affectations'], [])
+
+    @override_settings(LOOKUP_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        lookup.lookup_many(['CAB-0', 'CAB-1', 'CAB-2'])
+        self.assertEqual(lookup.stats()['size'], 2)
+        with self.assertNumQueries(1):
+            lookup.lookup('CAB-0')
+
+    def test_api(self):
+        self.client.force_login(self.fonctionnaire)
+        self.assertEqual(self.client.get(reverse('equipment_scan', args=['CAB-0'])).status_code, 302)
+        self.client.force_login(self.gestionnaire)
+        response = self.client.get(reverse('equipment_scan', args=['CAB-0']))
+        self.assertEqual((response.json()['designation'], len(response.json()['affectations'])), ('Écran', 2))
+        self.assertEqual(self.client.get(reverse('equipment_scan', args=['INCONNU'])).status_code, 404)
+
+        response = self.client.post(
+            reverse('equipment_scan_bulk'), {'cab_numbers': ['CAB-2', 'CAB-1', 'X']}, content_type='application/json',
+        )
+        self.assertEqual([item['cab_number'] for item in response.json()['results']], ['CAB-2', 'CAB-1'])
+        self.assertEqual(response.json()['unknown'], ['X'])
+        self.assertEqual(
+            self.client.post(reverse('equipment_scan_bulk'), 'x', content_type='application/json').status_code, 400,
+        )
+        self.assertEqual(self.client.get(reverse('equipment_scan_bulk')).status_code, 405)
+
+
+class StockSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.now = timezone.now()
+        cls.ecran = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=5,
+        )
+        cls.chaise = Equipment.objects.create(
+            cab_number='CAB-2', designation='Chaise', type='Mobilier', sous_type='Chaise',
+            year=2020, emplacement='Fès', quantity=2,
+        )
+        StockMovement.objects.update(date=cls.days_ago(10))
+        for equipment, delta, days in ((cls.ecran, -2, 6), (cls.chaise, -2, 4), (cls.ecran, 1, 2)):
+            movement = ledger.move_stock(equipment, delta, 'affectation')
+            StockMovement.objects.filter(pk=movement.pk).update(date=cls.days_ago(days))
+
+    @classmethod
+    def days_ago(cls, days):
+        return cls.now - timedelta(days=days)
+
+    def setUp(self):
+        snapshots._columns.cache_clear()
+
+    def stock(self, days, emplacement=None):
+        return {pk: quantity for pk, (quantity, _) in snapshots.stock_as_of(self.days_ago(days), emplacement).stock.items()}
+
+    def test_stock_is_replayed_both_ways_from_the_nearest_snapshot(self):
+        self.assertEqual(
+            sorted(StockMovement.objects.filter(motif='ajustement').values_list('delta', flat=True)), [2, 5],
+        )
+        with self.assertRaises(snapshots.NoSnapshot):
+            snapshots.stock_as_of(self.now)
+        snapshot = snapshots.take_snapshot(self.days_ago(5))
+        self.assertEqual((snapshot.equipment_count, snapshot.total_quantity), (2, 5))
+
+        self.assertEqual(self.stock(11), {})
+        self.assertEqual(self.stock(8), {self.ecran.pk: 5, self.chaise.pk: 2})
+        self.assertEqual(self.stock(5, 'Fès'), {self.chaise.pk: 2})
+        self.assertEqual(self.stock(3), {self.ecran.pk: 3})
+        self.assertEqual(self.stock(0), {self.ecran.pk: 4})
+        self.assertEqual(self.stock(0, 'Fès'), {})
+
+    def test_view_lists_stock_of_one_emplacement(self):
+        snapshots.take_snapshot(self.days_ago(1))
+        self.client.force_login(self.gestionnaire)
+        date = timezone.localtime(self.days_ago(5)).strftime('%Y-%m-%dT%H:%M')
+        response = self.client.get(reverse('stock_as_of'), {'date': date, 'emplacement': 'Rabat'})
+        self.assertEqual(response.context['totals'], {'Rabat': 3})
+        self.assertEqual([(equipement.pk, quantity) for equipement, quantity in response.context['rows']],
+                         [(self.ecran.pk, 3)])
+
+
+class EquipmentSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.portable = Equipment.objects.create(
+            cab_number='CAB-100', designation='Ordinateur portable Dell', type='Informatique',
+            sous_type='Ordinateur portable', year=2022, emplacement='Rabat', quantity=3,
+        )
+        cls.chaise = Equipment.objects.create(
+            cab_number='CAB-200', designation='Chaise de bureau', type='Mobilier',
+            sous_type='Chaise', year=2020, emplacement='Marrakech', quantity=8,
+        )
+        cls.ecran = Equipment.objects.create(
+            cab_number='CAB-300', designation='Écran Dell', type='Informatique',
+            sous_type='Écran', year=2021, emplacement='Rabat', quantity=5,
+        )
+
+    def setUp(self):
+        search.reset()
+        self.addCleanup(search.reset)
+        self.client.force_login(self.gestionnaire)
+
+    def pks(self, query):
+        return [pk for pk, _ in search.search(query)]
+
+    def test_ranking_prefix_and_typos(self):
+        self.assertEqual(self.pks('dell'), [self.portable.pk, self.ecran.pk])
+        # Every token must match; accents and case are ignored.
+        self.assertEqual(self.pks('ECRAN rabat'), [self.ecran.pk])
+        self.assertEqual(self.pks('ordi'), [self.portable.pk])
+        self.assertEqual(self.pks('marakech'), [self.chaise.pk])
+        self.assertEqual(self.pks('cab200'), [self.chaise.pk])
+        self.assertEqual(self.pks('dell marrakech'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        search.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.chaise.designation = 'Fauteuil ergonomique'
+            self.chaise.save()
+            self.ecran.delete()
+        self.assertEqual(self.pks('fauteuil'), [self.chaise.pk])
+        self.assertEqual(self.pks('chaise'), [self.chaise.pk])
+        self.assertEqual(self.pks('ecran'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            import_equipment(io.StringIO(
+                'cab_number,designation,type,sous_type,year,emplacement,quantity\n'
+                'CAB-400,Fauteuil visiteur,Mobilier,Chaise,2023,Rabat,2\n'
+            ))
+        self.assertEqual(len(self.pks('fauteuil')), 2)
+
+    def test_rebuild_keeps_changes_committed_while_it_ran(self):
+        search.get_index()
+        build = search._build
+
+        def racing_build():
+            index = build()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.chaise.designation = 'Fauteuil ergonomique'
+                self.chaise.save()
+            return index
+
+        # Run the background rebuild inline, without closing the test's connection.
+        with override_settings(SEARCH_INDEX_MAX_AGE=0), mock.patch('website.search._build', racing_build), \
+                mock.patch.object(search.threading, 'Thread') as thread, mock.patch('website.search.connection'):
+            search.get_index()
+            thread.call_args.kwargs['target']()
+        self.assertEqual(self.pks('fauteuil'), [self.chaise.pk])
+        self.assertEqual(self.pks('chaise'), [self.chaise.pk])
+
+    def test_view_lists_matches_in_rank_order(self):
+        response = self.client.get(reverse('equipment_search'), {'q': 'dell'})
+        self.assertEqual(list(response.context['equipements']), [self.portable, self.ecran])
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'fragments': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'fragments-tests'},
+})
+class FragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='admin', email='a@example.com', is_staff=True, is_superuser=True)
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+        cls.ecran = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=4,
+        )
+
+    def setUp(self):
+        caching.get_cache().clear()
+        caching.reset_stats()
+
+    def get_stock(self, user):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('stock'), {'type': 'Info'})
+        return response, len(context.captured_queries)
+
+    def test_cached_fragments_skip_queries_until_a_model_changes(self):
+        _, cold = self.get_stock(self.gestionnaire)
+        response, warm = self.get_stock(self.gestionnaire)
+        self.assertLess(warm, cold)
+        self.assertEqual(caching.stats()['stock_table'], {'hits': 1, 'misses': 1})
+
+        # Roles never share an entry.
+        self.get_stock(self.admin)
+        self.assertEqual(caching.stats()['stock_table'], {'hits': 1, 'misses': 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Equipment.objects.create(
+                cab_number='CAB-2', designation='Clavier', type='Informatique', sous_type='Clavier',
+                year=2022, emplacement='Rabat', quantity=2,
+            )
+        self.assertContains(self.get_stock(self.gestionnaire)[0], 'CAB-2')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ledger.withdraw(self.ecran, 3, 'affectation')
+        response, _ = self.get_stock(self.gestionnaire)
+        self.assertEqual(
+            [row.quantity for row in response.context['page']['equipements'] if row.pk == self.ecran.pk], [1],
+        )
+
+    def test_dashboard_exposes_counters_to_admins(self):
+        self.get_stock(self.gestionnaire)
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['fragment_stats']['stock_table'], {'hits': 0, 'misses': 1})
+        self.client.force_login(self.gestionnaire)
+        self.assertIsNone(self.client.get(reverse('dashboard')).context['fragment_stats'])
+
+
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='admin', email='a@example.com', is_staff=True, is_superuser=True)
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(PROFILING_DIR=directory.name))
+        profiling.clear()
+
+    def test_records_latency_and_queries_per_view(self):
+        self.client.force_login(self.gestionnaire)
+        for _ in range(3):
+            self.client.get(reverse('stock'))
+        self.client.get(reverse('gestion_affectation'))
+        report = {row['view']: row for row in profiling.summarize(profiling.records())}
+        self.assertEqual(report['stock']['count'], 3)
+        self.assertGreater(report['stock']['queries'], 0)
+        self.assertLessEqual(report['stock']['p50'], report['stock']['p99'])
+        self.assertEqual(report['gestion_affectation']['count'], 1)
+
+    def test_repeated_and_duplicate_statements_are_counted(self):
+        recorder = profiling.QueryRecorder()
+        for pk in (1, 1, 2):
+            recorder(lambda *args: None, 'SELECT * FROM equipment WHERE id = %s', [pk], False, {})
+        recorder(lambda *args: None, 'SELECT 1', None, False, {})
+        summary = recorder.summary()
+        self.assertEqual((summary['queries'], summary['repeated'], summary['duplicates']), (4, 2, 1))
+
+    def test_report_page_merges_other_processes_and_is_admin_only(self):
+        other = profiling.RequestProfile(
+            view='notifications', method='GET', status=200, duration=0.25, queries=12, query_time=0.2,
+            repeated=10, duplicates=0, slowest=[[0.1, 'SELECT ...']], time=time.time(),
+        )
+        profiling.dump_path(pid=1).write_text(json.dumps([dataclasses.asdict(other)]))
+        self.client.force_login(self.gestionnaire)
+        self.assertEqual(self.client.get(reverse('profiling_report')).status_code, 302)
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('profiling_report'))
+        rows = {row['view']: row for row in response.context['report']}
+        self.assertEqual(rows['notifications']['repeated'], 10)
+        self.assertEqual(rows['notifications']['p50'], 250)
+        profiling.dump()
+        self.assertTrue(profiling.dump_path().exists())
+
+    def test_dumps_of_stopped_processes_are_pruned(self):
+        profiling.dump()
+        stopped, live = profiling.dump_path(pid=1), profiling.dump_path(pid=2)
+        interrupted = stopped.with_suffix('.tmp')
+        for path in (stopped, live, interrupted):
+            path.write_text('[]')
+        day_ago = time.time() - 24 * 3600 - 1
+        for path in (stopped, interrupted, profiling.dump_path()):
+            os.utime(path, (day_ago, day_ago))
+        self.assertEqual(profiling.prune(), 2)
+        self.assertEqual(sorted(path.name for path in stopped.parent.iterdir()),
+                         sorted([live.name, profiling.dump_path().name]))
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+        equipment = Equipment.objects.create(
+            cab_number='CAB-1', designation='Écran', type='Informatique', sous_type='Écran',
+            year=2021, emplacement='Rabat', quantity=3,
+        )
+        Affectation.objects.create(equipement=equipment, fonctionnaire=cls.fonctionnaire, service='DSI')
+        DemandeIntervention.objects.create(
+            demandeur=cls.fonctionnaire, service='DSI', poste='P1', description='Panne',
+        )
+        cls.notification = Notification.objects.create(personne=cls.gestionnaire, message='Bonjour')
+
+    def setUp(self):
+        cache.clear()
+        profiling.clear()
+
+    def test_roles_are_checked_before_any_query(self):
+        for name in ('stock', 'notifications', 'gestion_affectation'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 302)
+        self.client.force_login(self.fonctionnaire)
+        self.assertRedirects(
+            self.client.get(reverse('stock')), f"{reverse('login')}?next={reverse('stock')}",
+            fetch_redirect_response=False,
+        )
+        response = self.client.get(reverse('mes_equipements'))
+        self.assertEqual([a.equipement.cab_number for a in response.context['affectations']], ['CAB-1'])
+
+    def test_notifications_reads_its_lists_and_marks_read(self):
+        self.client.force_login(self.gestionnaire)
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual(len(response.context['intervention_demandes']), 1)
+        self.assertEqual(list(response.context['notifications']), [self.notification])
+        self.client.post(reverse('notifications'), {'notification_id': self.notification.pk})
+        self.notification.refresh_from_db()
+        self.assertTrue(self.notification.read)
+
+    async def test_async_client_is_profiled(self):
+        await sync_to_async(self.async_client.force_login)(self.gestionnaire)
+        response = await self.async_client.get(reverse('gestion_affectation'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['affectations']), 1)
+        self.assertEqual([row.view for row in profiling.records()], ['gestion_affectation'])
+
+
+class AsyncDatabasePoolTests(TransactionTestCase):
+    def test_calls_run_concurrently_on_their_own_connections(self):
+        def call(value):
+            time.sleep(0.2)
+            return value, threading.current_thread().name, id(connections['default'])
+
+        start = time.perf_counter()
+        results = asyncio.run(asyncdb.gather(*(lambda value=value: call(value) for value in range(3))))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual([value for value, _, _ in results], [0, 1, 2])
+        self.assertTrue(all(name.startswith('asyncdb') for _, name, _ in results))
+        self.assertEqual(len({connection_id for _, _, connection_id in results}), 3)
+
+
+class RoleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='admin', email='a@example.com', is_staff=True, is_superuser=True)
+        cls.gestionnaire = User.objects.create(username='gestionnaire', email='g@example.com', is_staff=True)
+        cls.fonctionnaire = User.objects.create(username='fonctionnaire', email='f@example.com')
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query['sql'] for query in queries if 'auth_user' in query['sql']]
+
+    def test_role_is_read_from_the_session_once_cached(self):
+        self.client.force_login(self.gestionnaire)
+        response, first = self.user_queries(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(self.client.session[roles.SESSION_KEY][1], roles.GESTIONNAIRE)
+        response, queries = self.user_queries(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertContains(response, reverse('gestion_affectation'))
+
+    def test_role_change_applies_on_the_next_request(self):
+        self.client.force_login(self.gestionnaire)
+        self.assertEqual(self.client.get(reverse('gestion_equipement')).status_code, 200)
+        admin = self.client_class()
+        admin.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.post(reverse('modify_user', args=[self.gestionnaire.pk]), {
+                'email': 'g@example.com', 'role': roles.FONCTIONNAIRE,
+            })
+        self.assertRedirects(response, reverse('user_list'))
+        response = self.client.get(reverse('gestion_equipement'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('gestion_equipement')}",
+                             fetch_redirect_response=False)
+        self.assertEqual(self.client.get(reverse('mes_equipements')).status_code, 200)
+
+    def test_role_required_sends_other_roles_to_login(self):
+        for user, name in ((None, 'gestion_equipement'), (self.fonctionnaire, 'stock'),
+                           (self.gestionnaire, 'mes_equipements'), (self.gestionnaire, 'user_list')):
+            with self.subTest(user=user, route=name):
+                self.client.logout()
+                if user:
+                    self.client.force_login(user)
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response.url.startswith(reverse('login')))
+
+
+@override_settings(LOGIN_THROTTLE_WINDOW=60, LOGIN_THROTTLE_LIMITS={'ip': 4, 'compte_ip': 2, 'compte': 6})
+class LoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('agent', 'agent@example.com', 'secret', is_staff=True)
+        User.objects.create_user('autre', 'autre@example.com', 'secret')
+
+    def setUp(self):
+        throttle.get_cache().clear()
+
+    def post(self, email, password='mauvais', ip='10.0.0.1'):
+        return self.client.post(reverse('login'), {'email': email, 'password': password}, REMOTE_ADDR=ip)
+
+    def test_logs_in_by_email_with_one_message_for_every_failure(self):
+        unknown, wrong = self.post('inconnu@example.com'), self.post('agent@example.com')
+        self.assertEqual(unknown.status_code, 200)
+        self.assertEqual(unknown.context['form'].errors, wrong.context['form'].errors)
+        self.assertContains(unknown, "Email ou mot de passe incorrect.")
+        self.assertRedirects(self.post('agent@example.com', 'secret'), reverse('dashboard'),
+                             fetch_redirect_response=False)
+
+    def test_unknown_email_still_hashes_the_password(self):
+        with mock.patch('django.contrib.auth.base_user.make_password', wraps=make_password) as hashed:
+            self.post('inconnu@example.com')
+        hashed.assert_called_once()
+
+    def test_throttled_per_account_and_address_then_per_address_without_hashing(self):
+        self.post('agent@example.com')
+        self.post('agent@example.com')
+        with mock.patch.object(User, 'check_password') as check:
+            response = self.post('agent@example.com', 'secret')
+        self.assertEqual(response.status_code, 429)
+        self.assertContains(response, "Trop de tentatives", status_code=429)
+        check.assert_not_called()
+        # Another account, same address: refused once the address used up its own budget.
+        self.post('autre@example.com')
+        self.assertEqual(self.post('autre@example.com', 'secret').status_code, 302)
+        self.assertEqual(self.post('nouveau@example.com').status_code, 200)
+        self.assertEqual(self.post('autre@example.com', 'secret').status_code, 429)
+
+    def test_attack_from_one_address_does_not_lock_the_account_out(self):
+        for _ in range(5):
+            self.post('agent@example.com')
+        self.assertEqual(self.post('agent@example.com', 'secret').status_code, 429)
+        self.assertRedirects(self.post('agent@example.com', 'secret', ip='10.0.0.9'), reverse('dashboard'),
+                             fetch_redirect_response=False)
+
+    def test_throttled_per_account_across_addresses(self):
+        for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            self.post('agent@example.com', ip=ip)
+            self.post('agent@example.com', ip=ip)
+        self.assertEqual(self.post('agent@example.com', 'secret', ip='10.0.0.9').status_code, 429)
+
+    def test_window_slides(self):
+        keys = [('compte_ip', 'throttle:test')]
+        throttle.record_failure(keys, now=1000)
+        throttle.record_failure(keys, now=1030)
+        self.assertEqual(throttle.retry_after(keys, now=1040), 20)
+        self.assertEqual(throttle.retry_after(keys, now=1061), 0)
+
+    def test_email_is_unique_unless_blank(self):
+        User.objects.create(username='sans-email-1')
+        User.objects.create(username='sans-email-2')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create(username='doublon', email='agent@example.com')
+
+
+class StaticAssetTests(TestCase):
+    def test_templates_include_bundle_sources_until_bundled(self):
+        with override_settings(ASSETS_BUNDLED=False):
+            self.assertContains(self.client.get(reverse('home')), 'href="/static/css/home.css"')
+
+    def test_collectstatic_builds_hashed_precompressed_bundles(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'website.assets.AssetStorage'}}
+        with override_settings(STATIC_ROOT=root.name, STORAGES=storages, ASSETS_BUNDLED=True, SERVE_STATIC=True):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            client = self.client_class()
+            page = client.get(reverse('home')).content.decode()
+            url = next(part.split('"')[0] for part in page.split('href="')[1:] if 'site.bundle.' in part)
+            self.assertRegex(url, r'^/static/css/site\.bundle\.[0-9a-f]{12}\.css$')
+
+            response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('immutable', response['Cache-Control'])
+            self.assertIn('Accept-Encoding', response['Vary'])
+            with open(settings.BASE_DIR / 'static' / 'css' / 'home.css', 'rb') as source:
+                self.assertEqual(gzip.decompress(response.content), source.read())
+            self.assertNotIn('Content-Encoding', client.get(url))
+
+            plain = client.get('/static/css/site.bundle.css')
+            self.assertEqual(plain['Cache-Control'], f'public, max-age={settings.STATIC_REVALIDATE_AGE}')
+            self.assertEqual(client.get('/static/../manage.py').status_code, 404)
+
+
+class RouteSmokeTests(TestCase):
+    """Every route replayed by bench_routes answers each role without error."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = seed_dataset(users=5, equipment=20, affectations=10, demandes=5, notifications=10)
+
+    def test_every_route_answers_every_role(self):
+        from .management.commands.bench_routes import ROLES, route_args, routes
+
+        for name, url in routes(route_args(self.users)):
+            for role in ROLES:
+                with self.subTest(route=name, role=role):
+                    self.client.logout()
+                    if role in self.users:
+                        self.client.force_login(self.users[role])
+                    self.assertLess(self.client.get(url).status_code, 500)
@@ -0,0 +1,72 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Failed logins are counted per client address, per account and address,
+# and per account over a sliding window: each key keeps the timestamps of its
+# recent failures, and a key with LOGIN_THROTTLE_LIMITS[scope] of them inside
+# the window is refused before any password is hashed. Guessing one account
+# from one address hits the tight per-account-and-address limit; the
+# per-account limit only caps guesses spread over many addresses, and is far
+# higher so that failures from an attacker's address alone cannot lock the
+# owner out of their account.
+CACHE_ALIAS = 'throttle'
+KEY = 'throttle:login:{}:{}'
+
+# get-modify-set on one key must not interleave between threads.
+_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS if CACHE_ALIAS in settings.CACHES else 'default']
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_keys(request, email):
+    # Hashed so neither addresses nor emails end up readable in the cache.
+    ip, email = client_ip(request), email.strip().lower()
+    keys = []
+    for scope, value in (('ip', ip), ('compte_ip', f'{email}|{ip}'), ('compte', email)):
+        keys.append((scope, KEY.format(scope, hashlib.sha256(value.encode()).hexdigest())))
+    return keys
+
+
+def _recent(cache, key, now):
+    start = now - settings.LOGIN_THROTTLE_WINDOW
+    return [stamp for stamp in cache.get(key, []) if stamp > start]
+
+
+def retry_after(keys, now=None):
+    """Seconds before the keys may try again; 0 when none of them is over its limit."""
+    now = now or time.time()
+    cache = get_cache()
+    wait = 0
+    for scope, key in keys:
+        stamps = _recent(cache, key, now)
+        limit = settings.LOGIN_THROTTLE_LIMITS[scope]
+        if len(stamps) >= limit:
+            # The window slides: the key is free again once enough of its
+            # oldest failures are out of it.
+            wait = max(wait, stamps[-limit] + settings.LOGIN_THROTTLE_WINDOW - now)
+    return wait
+
+
+def record_failure(keys, now=None):
+    now = now or time.time()
+    cache = get_cache()
+    with _lock:
+        for scope, key in keys:
+            # Only the last `limit` stamps can ever matter.
+            stamps = (_recent(cache, key, now) + [now])[-settings.LOGIN_THROTTLE_LIMITS[scope]:]
+            cache.set(key, stamps, settings.LOGIN_THROTTLE_WINDOW)
+
+
+def reset(keys):
+    """Clear the account after a successful login; the address keeps its failures."""
+    get_cache().delete_many([key for scope, key in keys if scope in ('compte', 'compte_ip')])
@@ -9,24 +9,41 @@ urlpatterns = [
     path('deconnexion/', views.logout_view, name='logout'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('users/', views.user_list, name='user_list'),
+    path('profilage/', views.profiling_report, name='profiling_report'),
+    path('users/autocomplete/', views.fonctionnaire_autocomplete, name='fonctionnaire_autocomplete'),
     path('users/nouveau/', views.user_create, name='user_create'),
     path('users/<int:pk>/modifier/', views.modify_user, name='modify_user'),
     path('users/<int:pk>/supprimer/', views.user_delete, name='user_delete'),
     path('stock/', views.stock, name='stock'),
+    path('stock/export/', views.stock_export, name='stock_export'),
+    path('stock/recherche/', views.equipment_search, name='equipment_search'),
+    path('stock/historique/', views.stock_as_of, name='stock_as_of'),
+    path('equipement/autocomplete/', views.equipment_autocomplete, name='equipment_autocomplete'),
     path('equipement/nouveau/', views.equipment_create, name='equipment_create'),
+    path('equipement/import/', views.equipment_import, name='equipment_import'),
     path('equipement/<int:pk>/modifier/', views.equipment_update, name='equipment_update'),
     path('equipement/<int:pk>/supprimer/', views.equipment_delete, name='equipment_delete'),
     path('affectation/', views.gestion_affectation, name='gestion_affectation'),
+    path('affectation/export/', views.affectation_export, name='affectation_export'),
+    path('affectation/retour/', views.affectation_bulk_return, name='affectation_bulk_return'),
     path('affectation/nouveau/', views.affectation_create, name='affectation_create'),
     path('affectation/<int:pk>/modifier/', views.affectation_update, name='affectation_update'),
     path('affectation/<int:pk>/retour/', views.affectation_return, name='affectation_return'),
     path('notifications/', views.notifications, name='notifications'),
+    path('notifications/flux/', views.notifications_stream, name='notifications_stream'),
+    path('demande_equipement/export/', views.demande_equipement_export, name='demande_equipement_export'),
     path('mes_equipements/', views.mes_equipements, name='mes_equipements'),
     path('demande_equipement/nouveau/', views.demande_equipement_create, name='demande_equipement_create'),
     path('demande_intervention/nouveau/', views.demande_intervention_create, name='demande_intervention_create'),
     path('equipement/', views.gestion_equipement, name='gestion_equipement'),
+    path('equipement/scan/', views.equipment_scan_bulk, name='equipment_scan_bulk'),
+    path('equipement/scan/<str:cab_number>/', views.equipment_scan, name='equipment_scan'),
     path('demande_equipement/<int:pk>/approuver/', views.demande_equipement_approve, name='demande_equipement_approve'),
-    path("__reload__/", include("django_browser_reload.urls")),
+    path('demande_equipement/approuver/', views.demande_equipement_bulk_approve, name='demande_equipement_bulk_approve'),
+    path('demande_equipement/file/', views.demande_queue, name='demande_queue'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
+if 'django_browser_reload' in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__reload__/", include("django_browser_reload.urls")))
+
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
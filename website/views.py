@@ -1,40 +1,54 @@
+import csv
+import dataclasses
+import io
+import json
+import math
+
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required, user_passes_test
-from .forms import CustomUserCreationForm, EquipmentForm, AffectationForm, DemandeEquipementForm, DemandeInterventionForm, LoginForm, UserUpdateForm
-from .models import Equipment, Affectation, DemandeEquipement, DemandeIntervention, Notification
+from .forms import available_equipment, fonctionnaires, BulkReturnForm, CustomUserCreationForm, EquipmentForm, EquipmentImportUploadForm, AffectationForm, DemandeEquipementForm, DemandeInterventionForm, LoginForm, UserUpdateForm
+from .models import Equipment, Affectation, AffectationArchive, DemandeEquipement, DemandeIntervention, Notification, StockSummary
 from django.contrib.auth.models import User
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Q
-
-def is_admin(user):
-    return user.is_superuser
-
-def is_gestionnaire(user):
-    return user.is_staff and not user.is_superuser
-
-def is_fonctionnaire(user):
-    return not user.is_staff and not user.is_superuser
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import SimpleLazyObject
+from django.db.models import Q, Sum
+from django.core import signing
+from django.db import transaction
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from . import archive, asyncdb, caching, demandes, events, exports, jobs, ledger, lookup, profiling, roles, search, snapshots, throttle
+from .approvals import approve_demandes
+from .returns import return_affectations
+from .roles import role_required
+from .imports import FIELDS as IMPORT_FIELDS, import_equipment
+from .notifications import mark_read, notify_gestionnaires
 
 def login_view(request):
+    status = 200
     if request.method == 'POST':
         form = LoginForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data['email']
-            password = form.cleaned_data['password']
-            try:
-                user = User.objects.get(email=email)
-                user = authenticate(request, username=user.username, password=password)
+            keys = throttle.login_keys(request, email)
+            wait = throttle.retry_after(keys)
+            if wait:
+                # Refused before hashing anything: a flood of guesses costs no CPU.
+                form.add_error(None, f"Trop de tentatives de connexion. Réessayez dans {math.ceil(wait / 60)} min.")
+                status = 429
+            else:
+                user = authenticate(request, email=email, password=form.cleaned_data['password'])
                 if user is not None:
+                    throttle.reset(keys)
                     login(request, user)
                     return redirect('dashboard')
-                else:
-                    form.add_error(None, "Mot de passe incorrect.")
-            except User.DoesNotExist:
-                form.add_error('email', "Aucun utilisateur trouvé avec cet email.")
+                throttle.record_failure(keys)
+                # Same message whether the account exists or not.
+                form.add_error(None, "Email ou mot de passe incorrect.")
     else:
         form = LoginForm()
-    return render(request, 'login.html', {'form': form})
+    return render(request, 'login.html', {'form': form}, status=status)
 
 def logout_view(request):
     logout(request)
@@ -43,8 +57,7 @@ def logout_view(request):
 def home(request):
     return render(request, 'home.html')
 
-@login_required
-@user_passes_test(is_admin)
+@role_required(roles.ADMIN)
 def user_create(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
@@ -52,19 +65,14 @@ def user_create(request):
             user = form.save(commit=False)
             role = form.cleaned_data['role']
             user.email = form.cleaned_data['email']
-            if role == 'admin':
-                user.is_superuser = True
-                user.is_staff = True
-            elif role == 'gestionnaire':
-                user.is_staff = True
+            roles.assign(user, role)
             user.save()
             return redirect('user_list')
     else:
         form = CustomUserCreationForm()
     return render(request, 'user_form.html', {'form': form})
 
-@login_required
-@user_passes_test(is_admin)
+@role_required(roles.ADMIN)
 def modify_user(request, pk):
     user = User.objects.get(pk=pk)
     if request.method == 'POST':
@@ -72,17 +80,15 @@ def modify_user(request, pk):
         if form.is_valid():
             user = form.save(commit=False)
             role = form.cleaned_data['role']
-            user.is_superuser = role == 'admin'
-            user.is_staff = role in ['admin', 'gestionnaire']
+            roles.assign(user, role)
             user.email = form.cleaned_data['email']
             user.save()
             return redirect('user_list')
     else:
-        form = UserUpdateForm(instance=user, initial={'role': 'admin' if user.is_superuser else 'gestionnaire' if user.is_staff else 'fonctionnaire'})
+        form = UserUpdateForm(instance=user, initial={'role': roles.role_of(user)})
     return render(request, 'modify_user.html', {'form': form, 'user': user})
 
-@login_required
-@user_passes_test(is_admin)
+@role_required(roles.ADMIN)
 def user_delete(request, pk):
     user = User.objects.get(pk=pk)
     if request.method == 'POST':
@@ -91,58 +97,241 @@ def user_delete(request, pk):
     return render(request, 'user_delete.html', {'user': user})
 
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(roles.ADMIN)
+def profiling_report(request):
+    try:
+        minutes = max(int(request.GET.get('minutes', 60)), 1)
+    except ValueError:
+        minutes = 60
+    report = profiling.summarize(profiling.collect(since=timezone.now().timestamp() - minutes * 60))
+    for row in report:
+        for key in ('p50', 'p95', 'p99', 'query_time'):
+            row[key] *= 1000
+        row['slowest'] = [(duration * 1000, sql) for duration, sql in row['slowest']]
+    return render(request, 'profiling.html', {'report': report, 'minutes': minutes})
+
+@role_required(*roles.STAFF)
 def gestion_equipement(request):
     equipements = Equipment.objects.all()
     return render(request, 'gestion_equipement.html', {'equipements': equipements})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
-def gestion_affectation(request):
-    affectations = Affectation.objects.all().order_by('-date_affectation')
-    return render(request, 'gestion_affectation.html', {'affectations': affectations})
+def _encode_history_cursor(affectation):
+    return signing.dumps([affectation.date_affectation.isoformat(), affectation.id], salt='affectations')
+
+def _decode_history_cursor(value):
+    if not value:
+        return None
+    try:
+        date, pk = signing.loads(value, salt='affectations')
+        date = parse_datetime(date)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    if date is None or not isinstance(pk, int):
+        return None
+    return date, pk
+
+def _history_cursors(params):
+    return _decode_history_cursor(params.get('apres')), _decode_history_cursor(params.get('avant'))
+
+def _affectation_history(params):
+    """The live affectations, or on ``?archives=1`` the querysets of one
+    history page in both tables (see archive.seek_history)."""
+    live = Affectation.objects.select_related('equipement', 'fonctionnaire').order_by(*archive.HISTORY_ORDER)
+    if params.get('archives') != '1':
+        return live, None
+    after, before = _history_cursors(params)
+    return archive.seek_history(
+        live, AffectationArchive.objects.select_related('equipement', 'fonctionnaire'), after=after, before=before,
+    )
+
+def _history_context(params, live, archived):
+    after, before = _history_cursors(params)
+    rows, has_next, has_previous = archive.paginate_history(live, archived, after=after, before=before)
+    return {
+        'affectations': rows,
+        'archives': True,
+        'next_url': _page_url(params, 'apres', _encode_history_cursor(rows[-1])) if rows and has_next else None,
+        'previous_url': _page_url(params, 'avant', _encode_history_cursor(rows[0])) if rows and has_previous else None,
+    }
+
+@role_required(*roles.STAFF)
+async def gestion_affectation(request):
+    live, archived = _affectation_history(request.GET)
+    if archived is not None:
+        # Both tables are read at the same time, then merged into the page.
+        context = _history_context(request.GET, *await asyncdb.gather(lambda: list(live), lambda: list(archived)))
+    else:
+        context = {'affectations': [affectation async for affectation in live], 'archives': False}
+    return await sync_to_async(render)(request, 'gestion_affectation.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required(roles.ADMIN)
 def user_list(request):
     users = User.objects.all()
     return render(request, 'user_list.html', {'users': users})
 
-@login_required
+@role_required(*roles.AUTHENTICATED)
 def dashboard(request):
-    if is_admin(request.user) or is_gestionnaire(request.user):
-        return redirect('stock')
-    return redirect('mes_equipements')
+    if request.role not in roles.STAFF:
+        return redirect('mes_equipements')
+    groups = StockSummary.objects.order_by('type', 'sous_type', 'emplacement')
+    totals = groups.aggregate(
+        equipment_count=Sum('equipment_count'),
+        available_quantity=Sum('available_quantity'),
+        assigned_quantity=Sum('assigned_quantity'),
+        open_affectations=Sum('open_affectations'),
+    )
+    return render(request, 'dashboard.html', {
+        'groups': groups,
+        'totals': totals,
+        'fragment_stats': caching.stats() if request.role == roles.ADMIN else None,
+        'job_metrics': jobs.metrics() if request.role == roles.ADMIN else None,
+    })
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
-def stock(request):
-    type_filter = request.GET.get('type', '')
-    sous_type_filter = request.GET.get('sous_type', '')
-    emplacement_filter = request.GET.get('emplacement', '')
-    affecte_filter = request.GET.get('affecte', '')
+STOCK_PAGE_SIZE = 50
+STOCK_ORDERING = ('type', 'sous_type', 'id')
+STOCK_FILTER_MODES = ('prefixe', 'exact')
+SEARCH_RESULTS = 50
+STOCK_AS_OF_ROWS = 500
+AUTOCOMPLETE_RESULTS = 20
+# Codes accepted by one bulk scanner lookup.
+LOOKUP_MAX_BATCH = 1000
+
+def _filter_stock(params):
+    mode = params.get('mode', 'prefixe')
+    if mode not in STOCK_FILTER_MODES:
+        mode = 'prefixe'
+    # Exact and prefix lookups stay sargable on the composite Equipment indexes,
+    # unlike icontains which always degrades to LIKE '%x%' and a full scan.
+    lookup = 'exact' if mode == 'exact' else 'startswith'
+    filters = {
+        'type': params.get('type', '').strip(),
+        'sous_type': params.get('sous_type', '').strip(),
+        'emplacement': params.get('emplacement', '').strip(),
+    }
+    affecte_filter = params.get('affecte', '')
 
     equipements = Equipment.objects.all()
-    if type_filter:
-        equipements = equipements.filter(type__icontains=type_filter)
-    if sous_type_filter:
-        equipements = equipements.filter(sous_type__icontains=sous_type_filter)
-    if emplacement_filter:
-        equipements = equipements.filter(emplacement__icontains=emplacement_filter)
+    for field, value in filters.items():
+        if value:
+            equipements = equipements.filter(**{f'{field}__{lookup}': value})
     if affecte_filter:
         equipements = equipements.filter(affecte=affecte_filter == 'True')
-
-    return render(request, 'stock.html', {
-        'equipements': equipements,
-        'type_filter': type_filter,
-        'sous_type_filter': sous_type_filter,
-        'emplacement_filter': emplacement_filter,
+    return equipements, mode, filters, affecte_filter
+
+def _encode_cursor(equipment):
+    return signing.dumps([equipment.type, equipment.sous_type, equipment.id], salt='stock')
+
+def _decode_cursor(value):
+    try:
+        type_, sous_type, pk = signing.loads(value, salt='stock')
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return type_, sous_type, pk
+
+def _seek(equipements, cursor, forward=True):
+    type_, sous_type, pk = cursor
+    op = 'gt' if forward else 'lt'
+    # The redundant leading range on ``type`` lets the planner seek into the
+    # (type, sous_type, id) index instead of evaluating the OR on every row.
+    return equipements.filter(**{f'type__{op}e': type_}).filter(
+        Q(**{f'type__{op}': type_})
+        | Q(**{f'sous_type__{op}': sous_type})
+        | Q(sous_type=sous_type, **{f'id__{op}': pk})
+    )
+
+def paginate_stock(equipements, after=None, before=None, page_size=STOCK_PAGE_SIZE):
+    if before is not None:
+        reverse = tuple(f'-{field}' for field in STOCK_ORDERING)
+        rows = list(_seek(equipements, before, forward=False).order_by(*reverse)[:page_size + 1])
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next = True
+    else:
+        if after is not None:
+            equipements = _seek(equipements, after)
+        rows = list(equipements.order_by(*STOCK_ORDERING)[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = after is not None
+    next_cursor = _encode_cursor(rows[-1]) if rows and has_next else None
+    previous_cursor = _encode_cursor(rows[0]) if rows and has_previous else None
+    return rows, next_cursor, previous_cursor
+
+def _page_url(params, key, cursor):
+    query = params.copy()
+    query.pop('apres', None)
+    query.pop('avant', None)
+    query[key] = cursor
+    return f'?{query.urlencode()}'
+
+def _stock_context(request):
+    equipements, mode, filters, affecte_filter = _filter_stock(request.GET)
+    after = _decode_cursor(request.GET['apres']) if request.GET.get('apres') else None
+    before = _decode_cursor(request.GET['avant']) if request.GET.get('avant') else None
+
+    def page():
+        rows, next_cursor, previous_cursor = paginate_stock(equipements, after=after, before=before)
+        return {
+            'equipements': rows,
+            'next_url': _page_url(request.GET, 'apres', next_cursor) if next_cursor else None,
+            'previous_url': _page_url(request.GET, 'avant', previous_cursor) if previous_cursor else None,
+        }
+
+    return {
+        # Only queried when the table fragment is not cached.
+        'page': SimpleLazyObject(page),
+        'mode_filter': mode,
+        'type_filter': filters['type'],
+        'sous_type_filter': filters['sous_type'],
+        'emplacement_filter': filters['emplacement'],
         'affecte_filter': affecte_filter,
-    })
-
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+    }
+
+@role_required(*roles.STAFF)
+async def stock(request):
+    # Rendered off the event loop, where the lazy page is queried.
+    return await sync_to_async(render)(request, 'stock.html', _stock_context(request))
+
+@role_required(*roles.STAFF)
+def equipment_search(request):
+    query = request.GET.get('q', '').strip()
+    results = search.search(query, limit=SEARCH_RESULTS) if query else []
+    equipements = Equipment.objects.in_bulk([pk for pk, _ in results])
+    # The index may briefly list an equipment deleted by another process.
+    rows = [equipements[pk] for pk, _ in results if pk in equipements]
+    return render(request, 'equipment_search.html', {'equipements': rows, 'query': query})
+
+@role_required(*roles.STAFF)
+def stock_as_of(request):
+    emplacement = request.GET.get('emplacement', '')
+    value = request.GET.get('date', '')
+    at = parse_datetime(value) if value else None
+    if at is not None and timezone.is_naive(at):
+        at = timezone.make_aware(at)
+    context = {
+        'date': value,
+        'emplacement': emplacement,
+        'emplacements': Equipment.objects.order_by('emplacement').values_list('emplacement', flat=True).distinct(),
+        'invalid_date': bool(value) and at is None,
+    }
+    if at is not None:
+        try:
+            state = snapshots.stock_as_of(at, emplacement or None)
+        except snapshots.NoSnapshot as error:
+            context['error'] = str(error)
+        else:
+            context['state'] = state
+            context['totals'] = state.totals_by_emplacement()
+            if emplacement:
+                pks = sorted(state.stock)[:STOCK_AS_OF_ROWS]
+                equipements = Equipment.objects.in_bulk(pks)
+                context['rows'] = [
+                    (equipements[pk], state.stock[pk][0]) for pk in pks if pk in equipements
+                ]
+                context['hidden_rows'] = len(state.stock) - len(pks)
+    return render(request, 'stock_as_of.html', context)
+
+@role_required(*roles.STAFF)
 def equipment_create(request):
     if request.method == 'POST':
         form = EquipmentForm(request.POST)
@@ -153,8 +342,22 @@ def equipment_create(request):
         form = EquipmentForm()
     return render(request, 'equipment_form.html', {'form': form})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
+def equipment_import(request):
+    report = None
+    if request.method == 'POST':
+        form = EquipmentImportUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data['fichier'].file, encoding='utf-8-sig', newline='')
+            try:
+                report = import_equipment(lines, update_existing=form.cleaned_data['mettre_a_jour'])
+            except (UnicodeDecodeError, csv.Error) as error:
+                form.add_error('fichier', f"Fichier illisible : {error}")
+    else:
+        form = EquipmentImportUploadForm()
+    return render(request, 'equipment_import.html', {'form': form, 'report': report, 'columns': IMPORT_FIELDS})
+
+@role_required(*roles.STAFF)
 def equipment_update(request, pk):
     equipment = Equipment.objects.get(pk=pk)
     if request.method == 'POST':
@@ -166,8 +369,7 @@ def equipment_update(request, pk):
         form = EquipmentForm(instance=equipment)
     return render(request, 'equipment_form.html', {'form': form})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
 def equipment_delete(request, pk):
     equipment = Equipment.objects.get(pk=pk)
     if request.method == 'POST':
@@ -175,186 +377,313 @@ def equipment_delete(request, pk):
         return redirect('stock')
     return render(request, 'equipment_delete.html', {'equipment': equipment})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
 def affectation_create(request):
     if request.method == 'POST':
         form = AffectationForm(request.POST)
         if form.is_valid():
             affectation = form.save(commit=False)
-            affectation.equipement.affecte = True
-            affectation.equipement.quantity -= affectation.quantity
-            affectation.equipement.save()
-            affectation.save()
-            Notification.objects.create(
-                message=f"Nouvelle affectation: {affectation.equipement} ({affectation.quantity}) à {affectation.fonctionnaire}",
-                personne=User.objects.filter(is_staff=True).first()
-            )
-            return redirect('gestion_affectation')
+            try:
+                with transaction.atomic():
+                    affectation.save()
+                    ledger.withdraw(affectation.equipement, affectation.quantity, 'affectation',
+                                    auteur=request.user, affectation=affectation)
+                    notify_gestionnaires(f"Nouvelle affectation: {affectation.equipement} ({affectation.quantity}) à {affectation.fonctionnaire}")
+            except ledger.InsufficientStock as error:
+                form.add_error('quantity', str(error))
+            else:
+                return redirect('gestion_affectation')
     else:
         form = AffectationForm()
     return render(request, 'affectation_form.html', {'form': form})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
 def affectation_update(request, pk):
     affectation = Affectation.objects.get(pk=pk)
     if request.method == 'POST':
+        # Captured before is_valid(), which writes the posted values onto the instance.
+        old_equipment = affectation.equipement
+        old_quantity = affectation.quantity
         form = AffectationForm(request.POST, instance=affectation)
         if form.is_valid():
-            old_equipment = affectation.equipement
-            old_quantity = affectation.quantity
             affectation = form.save(commit=False)
-            if old_equipment != affectation.equipement:
-                old_equipment.affecte = False
-                old_equipment.quantity += old_quantity
-                old_equipment.save()
-                affectation.equipement.affecte = True
-                affectation.equipement.quantity -= affectation.quantity
-                affectation.equipement.save()
+            try:
+                with transaction.atomic():
+                    if old_equipment != affectation.equipement:
+                        ledger.restock(old_equipment, old_quantity, 'modification',
+                                       auteur=request.user, affectation=affectation)
+                        ledger.withdraw(affectation.equipement, affectation.quantity, 'modification',
+                                        auteur=request.user, affectation=affectation)
+                    elif affectation.quantity != old_quantity:
+                        ledger.move_stock(affectation.equipement, old_quantity - affectation.quantity,
+                                          'modification', auteur=request.user, affectation=affectation)
+                    affectation.save()
+                    notify_gestionnaires(f"Affectation modifiée: {affectation.equipement} ({affectation.quantity}) à {affectation.fonctionnaire}")
+            except ledger.InsufficientStock as error:
+                form.add_error('quantity', str(error))
             else:
-                quantity_diff = affectation.quantity - old_quantity
-                affectation.equipement.quantity -= quantity_diff
-                affectation.equipement.save()
-            affectation.save()
-            Notification.objects.create(
-                message=f"Affectation modifiée: {affectation.equipement} ({affectation.quantity}) à {affectation.fonctionnaire}",
-                personne=User.objects.filter(is_staff=True).first()
-            )
-            return redirect('gestion_affectation')
+                return redirect('gestion_affectation')
     else:
         form = AffectationForm(instance=affectation)
     return render(request, 'affectation_form.html', {'form': form})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
 def affectation_return(request, pk):
-    affectation = Affectation.objects.get(pk=pk)
+    affectation = Affectation.objects.select_related('equipement', 'fonctionnaire').get(pk=pk)
     if request.method == 'POST':
-        affectation.date_retour = timezone.now()
-        affectation.equipement.affecte = False
-        affectation.equipement.quantity += affectation.quantity
-        affectation.equipement.save()
-        affectation.save()
-        Notification.objects.create(
-            message=f"Retour d'affectation: {affectation.equipement} ({affectation.quantity}) par {affectation.fonctionnaire}",
-            personne=User.objects.filter(is_staff=True).first()
-        )
+        # Only open affectations are closed, so a double submit cannot
+        # restock the same items twice.
+        return_affectations(ids=[pk], auteur=request.user)
         return redirect('gestion_affectation')
     return render(request, 'affectation_return.html', {'affectation': affectation})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
-def notifications(request):
-    equipement_demandes = DemandeEquipement.objects.all().order_by('-date_creation')
-    intervention_demandes = DemandeIntervention.objects.all().order_by('-date')
-    notifications = Notification.objects.filter(personne=request.user).order_by('-date')
+@role_required(*roles.STAFF)
+def affectation_bulk_return(request):
+    if request.method == 'POST' and request.content_type == 'application/json':
+        # API for scanning devices: {"ids": [...], "cab_numbers": [...], "service": "..."}
+        try:
+            data = json.loads(request.body)
+            ids = [int(pk) for pk in data.get('ids', [])]
+            cab_numbers = [str(value) for value in data.get('cab_numbers', [])]
+            service = str(data.get('service') or '')
+        except (ValueError, TypeError, AttributeError):
+            return JsonResponse({'error': 'Requête invalide.'}, status=400)
+        report = return_affectations(ids, cab_numbers, service, auteur=request.user)
+        return JsonResponse(dataclasses.asdict(report))
+    report = None
+    if request.method == 'POST':
+        form = BulkReturnForm(request.POST)
+        ids = [pk for pk in request.POST.getlist('affectations') if pk.isdigit()]
+        if form.is_valid():
+            report = return_affectations(
+                ids, form.cleaned_data['cab_numbers'], form.cleaned_data['service'], auteur=request.user,
+            )
+            form = BulkReturnForm()
+    else:
+        form = BulkReturnForm()
+    return render(request, 'affectation_bulk_return.html', {'form': form, 'report': report})
+
+@role_required(*roles.STAFF)
+def equipment_scan(request, cab_number):
+    # API for scanning devices: one equipment with its open affectations.
+    item = lookup.lookup(cab_number)
+    if item is None:
+        return JsonResponse({'error': 'Numéro CAB inconnu.', 'cab_number': cab_number}, status=404)
+    return JsonResponse(item)
+
+@role_required(*roles.STAFF)
+def equipment_scan_bulk(request):
+    # API for scanning devices: {"cab_numbers": [...]} resolved in one query.
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Méthode non autorisée.'}, status=405)
+    try:
+        cab_numbers = [str(value) for value in json.loads(request.body)['cab_numbers']]
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({'error': 'Requête invalide.'}, status=400)
+    if len(cab_numbers) > LOOKUP_MAX_BATCH:
+        return JsonResponse({'error': f'Au plus {LOOKUP_MAX_BATCH} numéros CAB par requête.'}, status=400)
+    items = lookup.lookup_many(cab_numbers)
+    return JsonResponse({
+        'results': [item for item in items.values() if item is not None],
+        'unknown': [code for code, item in items.items() if item is None],
+    })
 
-    # Filters for DemandeEquipement
-    etat_equipement = request.GET.get('etat_equipement', '')
-    demandeur_equipement = request.GET.get('demandeur_equipement', '')
-    date_equipement = request.GET.get('date_equipement', '')
+def _filter_equipement_demandes(equipement_demandes, params):
+    etat_equipement = params.get('etat_equipement', '')
+    demandeur_equipement = params.get('demandeur_equipement', '')
+    date_equipement = params.get('date_equipement', '')
 
+    if etat_equipement not in demandes.TRANSITIONS:
+        etat_equipement = ''
     if etat_equipement:
+        # Served by the (etat, date_creation) index.
         equipement_demandes = equipement_demandes.filter(etat=etat_equipement)
     if demandeur_equipement:
         equipement_demandes = equipement_demandes.filter(demandeur__email__icontains=demandeur_equipement)
     if date_equipement:
         equipement_demandes = equipement_demandes.filter(date_creation__date=date_equipement)
-
-    # Filters for DemandeIntervention
+    return equipement_demandes, etat_equipement, demandeur_equipement, date_equipement
+
+def _notifications_context(request):
+    """The querysets and filters of the notifications page, not yet evaluated."""
+    equipement_demandes, etat_equipement, demandeur_equipement, date_equipement = _filter_equipement_demandes(
+        DemandeEquipement.objects.select_related('demandeur', 'traite_par').prefetch_related('equipements')
+        .order_by('-date_creation'),
+        request.GET,
+    )
+    intervention_demandes = DemandeIntervention.objects.select_related('demandeur').order_by('-date')
     demandeur_intervention = request.GET.get('demandeur_intervention', '')
     date_intervention = request.GET.get('date_intervention', '')
-
     if demandeur_intervention:
         intervention_demandes = intervention_demandes.filter(demandeur__email__icontains=demandeur_intervention)
     if date_intervention:
         intervention_demandes = intervention_demandes.filter(date__date=date_intervention)
-
-    if request.method == 'POST':
-        notification_id = request.POST.get('notification_id')
-        if notification_id:
-            Notification.objects.filter(pk=notification_id, personne=request.user).update(read=True)
-        return redirect('notifications')
-
-    return render(request, 'notifications.html', {
+    return {
         'equipement_demandes': equipement_demandes,
         'intervention_demandes': intervention_demandes,
-        'notifications': notifications,
+        # Not shown by the template: stays lazy.
+        'notifications': Notification.objects.filter(personne_id=request.user_pk).order_by('-date'),
         'etat_equipement': etat_equipement,
         'demandeur_equipement': demandeur_equipement,
         'date_equipement': date_equipement,
         'demandeur_intervention': demandeur_intervention,
         'date_intervention': date_intervention,
-    })
+    }
 
-@login_required
-@user_passes_test(is_fonctionnaire)
-def mes_equipements(request):
-    affectations = Affectation.objects.filter(fonctionnaire=request.user, date_retour__isnull=True)
-    return render(request, 'mes_equipements.html', {'affectations': affectations})
+@role_required(*roles.STAFF)
+async def notifications(request):
+    if request.method == 'POST':
+        notification_id = request.POST.get('notification_id')
+        if notification_id:
+            await sync_to_async(mark_read)(request.user, notification_id)
+        return redirect('notifications')
 
-@login_required
-@user_passes_test(is_fonctionnaire)
+    context = _notifications_context(request)
+    # The two tables of the page are independent: they are read concurrently.
+    equipement_demandes, intervention_demandes = context['equipement_demandes'], context['intervention_demandes']
+    context['equipement_demandes'], context['intervention_demandes'] = await asyncdb.gather(
+        lambda: list(equipement_demandes), lambda: list(intervention_demandes),
+    )
+    return await sync_to_async(render)(request, 'notifications.html', context)
+
+def _mes_equipements(user_pk):
+    return Affectation.objects.filter(
+        fonctionnaire_id=user_pk, date_retour__isnull=True,
+    ).select_related('equipement')
+
+@role_required(roles.FONCTIONNAIRE)
+async def mes_equipements(request):
+    affectations = [affectation async for affectation in _mes_equipements(request.user_pk)]
+    return await sync_to_async(render)(request, 'mes_equipements.html', {'affectations': affectations})
+
+@role_required(roles.FONCTIONNAIRE)
 def demande_equipement_create(request):
     if request.method == 'POST':
         form = DemandeEquipementForm(request.POST)
         if form.is_valid():
             demande = form.save(commit=False)
             demande.demandeur = request.user
-            demande.save()
-            form.save_m2m()
-            Notification.objects.create(
-                message=f"Nouvelle demande d'équipement: {demande.objet} par {demande.demandeur}",
-                personne=User.objects.filter(is_staff=True).first()
-            )
+            with transaction.atomic():
+                demande.save()
+                form.save_m2m()
+                events.notify_demande(demande)
+                notify_gestionnaires(f"Nouvelle demande d'équipement: {demande.objet} par {demande.demandeur}")
             return redirect('mes_equipements')
     else:
         form = DemandeEquipementForm()
     return render(request, 'demande_equipement_form.html', {'form': form})
 
-@login_required
-@user_passes_test(is_fonctionnaire)
+@role_required(roles.FONCTIONNAIRE)
 def demande_intervention_create(request):
     if request.method == 'POST':
         form = DemandeInterventionForm(request.POST)
         if form.is_valid():
             demande = form.save(commit=False)
             demande.demandeur = request.user
-            demande.save()
-            Notification.objects.create(
-                message=f"Nouvelle demande d'intervention: {demande.description[:50]} par {demande.demandeur}",
-                personne=User.objects.filter(is_staff=True).first()
-            )
+            with transaction.atomic():
+                demande.save()
+                notify_gestionnaires(f"Nouvelle demande d'intervention: {demande.description[:50]} par {demande.demandeur}")
             return redirect('mes_equipements')
     else:
         form = DemandeInterventionForm()
     return render(request, 'demande_intervention_form.html', {'form': form})
 
-@login_required
-@user_passes_test(lambda u: is_admin(u) or is_gestionnaire(u))
+@role_required(*roles.STAFF)
 def demande_equipement_approve(request, pk):
-    demande = DemandeEquipement.objects.get(pk=pk)
+    demande = DemandeEquipement.objects.select_related('demandeur', 'traite_par').get(pk=pk)
+    error = None
     if request.method == 'POST':
         etat = request.POST.get('etat')
-        demande.etat = etat
-        if etat == 'Validée':
-            for equipement in demande.equipements.all():
-                if equipement.quantity >= demande.quantity:
-                    equipement.affecte = True
-                    equipement.quantity -= demande.quantity
-                    equipement.save()
-                    Affectation.objects.create(
-                        equipement=equipement,
-                        fonctionnaire=demande.demandeur,
-                        service=demande.service
-                    )
-        elif etat == 'Refusée':
-            demande.equipements.clear()
-        demande.save()
-        Notification.objects.create(
-            message=f"Demande d'équipement {demande.id} {etat} pour {demande.demandeur}",
-            personne=demande.demandeur
-        )
+        if etat == demandes.EN_ATTENTE:
+            # Left pending: back to the queue for another gestionnaire.
+            demandes.release(request.user, [demande.pk])
+            return redirect('demande_queue')
+        try:
+            demandes.decide(demande.pk, etat, request.user)
+        except demandes.InvalidTransition as exc:
+            error = str(exc)
+        else:
+            return redirect('demande_queue')
+    return render(request, 'demande_equipement_approve.html', {
+        'demande': demande,
+        'error': error,
+        'held_by_other': demandes.held_by_other(demande, request.user),
+        'decided': not demandes.TRANSITIONS[demande.etat],
+    }, status=400 if error else 200)
+
+@role_required(*roles.STAFF)
+def demande_queue(request):
+    if request.method == 'POST':
+        if request.POST.get('action') == 'liberer':
+            demandes.release(request.user)
+        else:
+            try:
+                limit = min(max(int(request.POST.get('nombre', demandes.CLAIM_BATCH)), 1), 100)
+            except ValueError:
+                limit = demandes.CLAIM_BATCH
+            demandes.claim_next(request.user, limit)
+        return redirect('demande_queue')
+    return render(request, 'demande_queue.html', {
+        'demandes': demandes.queue(request.user),
+        'pending': DemandeEquipement.objects.filter(etat=demandes.EN_ATTENTE).count(),
+        'claim_batch': demandes.CLAIM_BATCH,
+        'claim_minutes': settings.DEMANDE_CLAIM_TIMEOUT // 60,
+    })
+
+@role_required(*roles.STAFF)
+def demande_equipement_bulk_approve(request):
+    if request.method != 'POST':
         return redirect('notifications')
-    return render(request, 'demande_equipement_approve.html', {'demande': demande})
+    demande_ids = [pk for pk in request.POST.getlist('demandes') if pk.isdigit()]
+    report = approve_demandes(demande_ids, auteur=request.user)
+    return render(request, 'demande_equipement_bulk_report.html', {'report': report})
+
+@role_required(*roles.STAFF)
+def stock_export(request):
+    equipements = _filter_stock(request.GET)[0].order_by(*STOCK_ORDERING)
+    return exports.stream_csv(request, 'stock.csv', exports.EQUIPMENT_HEADER, exports.equipment_rows(equipements))
+
+@role_required(*roles.STAFF)
+def affectation_export(request):
+    return exports.stream_csv(request, 'affectations.csv', exports.AFFECTATION_HEADER, exports.affectation_rows(
+        Affectation.objects.order_by(*archive.HISTORY_ORDER),
+        AffectationArchive.objects.order_by(*archive.HISTORY_ORDER),
+    ))
+
+@role_required(*roles.STAFF)
+def demande_equipement_export(request):
+    selected = _filter_equipement_demandes(DemandeEquipement.objects.order_by('-date_creation'), request.GET)[0]
+    return exports.stream_csv(request, 'demandes_equipement.csv', exports.DEMANDE_HEADER, exports.demande_rows(selected))
+
+async def notifications_stream(request):
+    if request.role not in roles.STAFF:
+        return HttpResponseForbidden()
+    channels = [events.USER_CHANNEL.format(request.user_pk), events.GESTIONNAIRES_CHANNEL]
+    response = StreamingHttpResponse(events.event_stream(*channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def _autocomplete(queryset, term, lookups):
+    # Top matches for a typed prefix, as consumed by js/autocomplete.js.
+    if term:
+        condition = Q()
+        for field in lookups:
+            condition |= Q(**{f'{field}__istartswith': term})
+        queryset = queryset.filter(condition).order_by(*lookups, 'pk')
+    else:
+        queryset = queryset.order_by('pk')
+    results = [{'id': obj.pk, 'text': str(obj)} async for obj in queryset[:AUTOCOMPLETE_RESULTS]]
+    return JsonResponse({'results': results})
+
+async def equipment_autocomplete(request):
+    if request.role == roles.ANONYME:
+        return HttpResponseForbidden()
+    term = request.GET.get('q', '').strip()
+    return await _autocomplete(available_equipment(), term, ['designation', 'cab_number'])
+
+async def fonctionnaire_autocomplete(request):
+    if request.role not in roles.STAFF:
+        return HttpResponseForbidden()
+    term = request.GET.get('q', '').strip()
+    return await _autocomplete(fonctionnaires(), term, ['username', 'email'])